@@ -0,0 +1,116 @@
+# Measures Buffer throughput, comparing the old bytes backed Buffer to the bytearray/memoryview one.
+# Usage: python benchmarks/buffer.py [iterations]
+
+import struct
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pymine.types.buffer import Buffer
+
+
+class LegacyBuffer(Buffer):  # the old bytes backed Buffer
+    def __init__(self, buf: bytes = None) -> None:
+        self.buf = b"" if buf is None else buf
+        self.pos = 0
+
+    def write(self, data: bytes) -> None:
+        self.buf += data
+
+    def read(self, length: int = None) -> bytes:
+        try:
+            if length is None:
+                length = len(self.buf)
+                return self.buf[self.pos :]
+
+            return self.buf[self.pos : self.pos + length]
+        finally:
+            self.pos += length
+
+    def unpack(self, f: str) -> object:
+        unpacked = struct.unpack(">" + f, self.read(struct.calcsize(f)))
+
+        if len(unpacked) == 1:
+            return unpacked[0]
+
+        return unpacked
+
+    def unpack_string(self) -> str:
+        length = self.unpack_varint(max_bits=16)
+        return self.read(length).decode("utf-8")
+
+
+def build_chunks(cls) -> None:  # like PlayChunkData.encode() building its chunk_sections_buffer
+    buf = cls()
+    section = os.urandom(8192)
+
+    for _ in range(16):
+        buf.write(section)
+
+    buf.read()
+
+
+def encode_fields(cls) -> None:  # many small writes, like an entity metadata or player info packet
+    buf = cls()
+
+    if cls is LegacyBuffer:
+        for i in range(64):
+            buf.write(
+                Buffer.pack_varint(i * 300)
+                + Buffer.pack_string("player")
+                + Buffer.pack("dd", 1.5, i)
+            )
+    else:
+        for i in range(64):
+            buf.write_varint(i * 300)
+            buf.write_string("player")
+            buf.write_pack("dd", 1.5, i)
+
+    buf.read()
+
+
+def decode_fields(cls, data: bytes) -> None:
+    buf = cls(data)
+
+    for _ in range(64):
+        buf.unpack_varint()
+        buf.unpack_string()
+        buf.unpack("dd")
+
+
+def bench(func, *args, iterations: int) -> float:
+    start = time.perf_counter()
+
+    for _ in range(iterations):
+        func(*args)
+
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    fields = Buffer()
+
+    for i in range(64):
+        fields.write_varint(i * 300)
+        fields.write_string("player")
+        fields.write_pack("dd", 1.5, i)
+
+    fields = fields.read()
+
+    for name, func, args in (
+        ("build 128KB from 8KB writes", build_chunks, ()),
+        ("encode 64 varint + string + 2 doubles", encode_fields, ()),
+        ("decode 64 varint + string + 2 doubles", decode_fields, (fields,)),
+    ):
+        before = bench(func, LegacyBuffer, *args, iterations=iterations)
+        after = bench(func, Buffer, *args, iterations=iterations)
+
+        print(f"{name}: {before:,.0f} -> {after:,.0f} ops/sec ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# Measures chunk decode throughput from a region file: whole chunks per second through
+# ChunkIO.fetch_chunk() (reading, decompressing, parsing the nbt and decoding the sections), and
+# sections per second through ChunkSection.from_nbt() alone, compared to the old per-block decoder.
+# Pass the path of a region file from a 1.16+ world, else a synthetic one with similar palettes is
+# written.
+# Usage: python benchmarks/chunk_decode.py [path/to/r.x.z.mca] [seconds per run]
+
+import tempfile
+import struct
+import random
+import time
+import zlib
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy
+
+from pymine.types.block_palette import IndirectPalette
+from pymine.data.block_states import BLOCK_STATES
+from pymine.types.chunk import ChunkSection
+from pymine.logic.worldio import ChunkIO
+from pymine.types.buffer import Buffer
+import pymine.types.nbt as nbt
+
+
+def legacy_from_nbt(
+    tag: nbt.TAG,
+) -> ChunkSection:  # the old decoder, only the palette call was fixed
+    bits_per_block = len(tag["BlockStates"]) // 64
+    individual_value_mask = (1 << bits_per_block) - 1
+
+    section = ChunkSection(tag["Y"].data, IndirectPalette.from_nbt(tag["Palette"], bits_per_block))
+    section.block_states = numpy.ndarray((16, 16, 16), numpy.int32)
+
+    state_bytes = b"".join([struct.pack(">q", n) for n in tag["BlockStates"]])
+
+    for y in range(16):
+        for z in range(16):
+            for x in range(16):
+                block_num = (((y * 16) + z) * 16) + x
+                start_long = (block_num * bits_per_block) // 64
+                start_offset = (block_num * bits_per_block) % 64
+                end_long = ((block_num + 1) * bits_per_block - 1) // 64
+
+                if start_long == end_long:
+                    data = state_bytes[start_long] >> start_offset
+                else:
+                    data = state_bytes[start_long] >> start_offset | state_bytes[end_long] << (
+                        64 - start_offset
+                    )
+
+                section.block_states[y, z, x] = data & individual_value_mask
+
+    section.block_light = numpy.asarray(
+        [n for n in ((b & 0x0F, b >> 4 & 0x0F) for b in tag["BlockLight"])], numpy.int16
+    ).reshape(16, 16, 16)
+    section.sky_light = numpy.asarray(
+        [n for n in ((b & 0x0F, b >> 4 & 0x0F) for b in tag["SkyLight"])], numpy.int16
+    ).reshape(16, 16, 16)
+
+    return section
+
+
+def synthetic_section(rng: random.Random, y: int) -> nbt.TAG_Compound:
+    palette_size = rng.choice((2, 5, 9, 17, 33))  # mostly 4 bits, some 5 and 6 bits
+    bits = max(4, (palette_size - 1).bit_length())
+    per_long = 64 // bits
+
+    palette = [0] + rng.sample(range(1, len(BLOCK_STATES.data_reversed)), palette_size - 1)
+    longs = [0] * -(-4096 // per_long)
+
+    for i in range(4096):
+        longs[i // per_long] |= rng.randrange(palette_size) << (i % per_long * bits)
+
+    entries = []
+
+    for state in palette:
+        block = BLOCK_STATES.decode(state)
+        props = [nbt.TAG_String(k, v) for k, v in block["properties"].items()]
+        entries.append(
+            nbt.TAG_Compound(
+                None,
+                [nbt.TAG_String("Name", block["name"])]
+                + ([nbt.TAG_Compound("Properties", props)] if props else []),
+            )
+        )
+
+    return nbt.TAG_Compound(
+        None,
+        [
+            nbt.TAG_Byte("Y", y),
+            nbt.TAG_List("Palette", entries),
+            nbt.TAG_Long_Array(
+                "BlockStates", [l - (1 << 64) if l >= 1 << 63 else l for l in longs]
+            ),
+            nbt.TAG_Byte_Array("BlockLight", os.urandom(2048)),
+            nbt.TAG_Byte_Array("SkyLight", os.urandom(2048)),
+        ],
+    )
+
+
+def write_synthetic_region(path: str, size: int) -> None:
+    """Writes a region file of size x size chunks, each with 8 sections."""
+
+    rng = random.Random(0)
+    header = bytearray(8192)
+    sectors = bytearray()
+
+    for chunk_x in range(size):
+        for chunk_z in range(size):
+            tag = nbt.TAG_Compound(
+                "",
+                [
+                    nbt.TAG_Int("DataVersion", 2586),
+                    nbt.TAG_Compound(
+                        "Level",
+                        [
+                            nbt.TAG_Int("xPos", chunk_x),
+                            nbt.TAG_Int("zPos", chunk_z),
+                            nbt.TAG_List("Sections", [synthetic_section(rng, y) for y in range(8)]),
+                        ],
+                    ),
+                ],
+            )
+
+            data = zlib.compress(tag.pack())
+            data = struct.pack(">iB", len(data) + 1, 2) + data
+            data += bytes(-len(data) % 4096)
+
+            location = ChunkIO.calc_offset(chunk_x, chunk_z)
+            offset = 2 + len(sectors) // 4096
+            header[location : location + 4] = struct.pack(">i", offset << 8 | len(data) // 4096)
+
+            sectors += data
+
+    with open(path, "wb") as region_file:
+        region_file.write(header + sectors)
+
+
+def present_chunks(path: str) -> list:
+    """Returns the (chunk x, chunk z) of every chunk in the region file."""
+
+    rx, rz = map(int, os.path.basename(path).split(".")[1:3])
+
+    with open(path, "rb") as region_file:
+        locations = struct.unpack(">1024i", region_file.read(4096))
+
+    return [(rx * 32 + i % 32, rz * 32 + i // 32) for i, loc in enumerate(locations) if loc]
+
+
+def per_second(func, items: list, seconds: float) -> float:
+    count = 0
+    start = time.perf_counter()
+
+    while time.perf_counter() - start < seconds:
+        func(items[count % len(items)])
+        count += 1
+
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1] else None
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    if path is None:
+        tmp = tempfile.mkdtemp()
+        os.mkdir(os.path.join(tmp, "region"))
+        path = os.path.join(tmp, "region", "r.0.0.mca")
+        write_synthetic_region(path, 4)
+
+    world_path = os.path.dirname(os.path.dirname(os.path.abspath(path)))
+    chunks = present_chunks(path)
+
+    # the section tags, to time ChunkSection.from_nbt() on its own
+    sections = []
+
+    for chunk_x, chunk_z in chunks[:16]:
+        region_file = open(path, "rb")
+        region_file.seek(ChunkIO.calc_offset(chunk_x, chunk_z))
+        offset, length = ChunkIO.find_chunk(struct.unpack(">i", region_file.read(4))[0])
+        region_file.seek(offset + 5)
+        tag = nbt.TAG_Compound.unpack(Buffer(zlib.decompress(region_file.read(length - 5))))
+        region_file.close()
+
+        sections += [s for s in tag["Level"]["Sections"] if s.get("BlockStates") is not None]
+
+    print(f"{path}: {len(chunks)} chunks")
+
+    chunk_rate = per_second(lambda c: ChunkIO.fetch_chunk(world_path, *c), chunks, seconds)
+    print(f"  ChunkIO.fetch_chunk(): {chunk_rate:>8,.1f} chunks/s")
+
+    old = per_second(legacy_from_nbt, sections, seconds)
+    new = per_second(ChunkSection.from_nbt, sections, seconds)
+    print(f"  ChunkSection.from_nbt(): {old:>8,.0f} -> {new:>8,.0f} sections/s ({new / old:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# Measures what sending the same chunks to a batch of joining players costs with ChunkFrames, which
+# packs each chunk once for everyone, compared to encoding and compressing them again for every
+# player like send_world_info() used to, and what re-sending a chunk costs after a section changed.
+# Usage: python benchmarks/chunk_frames.py [players] [chunks] [compression threshold, -1 for none]
+
+import asyncio
+import types
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy
+
+from pymine.net.packets.play.chunk import PlayChunkData, PlayUpdateLight
+from pymine.types.block_palette import DirectPalette
+from pymine.types.chunk import Chunk, ChunkSection
+from pymine.logic.chunk_frames import ChunkFrames
+from pymine.types.send_queue import PendingFrame
+from pymine.types.buffer import Buffer
+
+
+def test_chunks(count: int) -> list:
+    """Chunks with 8 sections of terrain-like blocks (few states, so they compress) and light."""
+
+    rng = numpy.random.default_rng(0)
+    chunks = []
+
+    for i in range(count):
+        chunk = Chunk.new(i, 0, 0)
+
+        for y in range(-1, 9):
+            chunk[y] = ChunkSection.new(y, DirectPalette)
+            chunk[y].block_states[:] = rng.choice([0, 1, 9, 10, 33], (16, 16, 16))
+            chunk[y].sky_light[:] = rng.integers(0, 16, (16, 16, 16))
+
+        chunks.append(chunk)
+
+    return chunks
+
+
+def stub_server() -> types.SimpleNamespace:
+    server = types.SimpleNamespace(sent=0)
+
+    async def pack_frame(data, comp_thresh, comp_level=-1):
+        return Buffer.pack_frame(data, comp_thresh, comp_level)
+
+    async def send_raw(conn, frame, lane):
+        server.sent += len(frame)
+
+    server.pack_frame = pack_frame
+    server.send_raw = send_raw
+
+    return server
+
+
+class StubQueue:  # what ChunkFrames.send() queues in, counts the bytes like send_raw() does
+    pressured = False
+
+    def __init__(self, server) -> None:
+        self.server = server
+
+    def reserve(self, lane: int) -> PendingFrame:
+        return PendingFrame(lane)
+
+    def fill(self, pending: PendingFrame, frame: bytes) -> None:
+        self.server.sent += len(frame)
+
+
+async def send_uncached(server, conn, chunk: Chunk) -> None:  # the old send_world_info() loop
+    for packet in (PlayUpdateLight(chunk), PlayChunkData(chunk, True)):
+        data = Buffer.pack_varint(packet.id) + packet.encode()
+        await server.send_raw(conn, await server.pack_frame(data, conn.comp_thresh), packet.lane)
+
+
+async def join_cached_one(chunk_frames: ChunkFrames, conn, chunks: list) -> None:
+    for chunk in chunks:
+        await chunk_frames.send(conn, chunk)
+
+
+def drop_caches(chunks: list) -> None:
+    for chunk in chunks:
+        chunk.invalidate()
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    asyncio.run(func())
+    return time.perf_counter() - start
+
+
+def main():
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    comp_thresh = int(sys.argv[3]) if len(sys.argv) > 3 else 256
+
+    chunks = test_chunks(count)
+    server = stub_server()
+    conns = [
+        types.SimpleNamespace(comp_thresh=comp_thresh, send_queue=StubQueue(server))
+        for _ in range(players)
+    ]
+    chunk_frames = ChunkFrames(server)
+
+    async def join_uncached():
+        for conn in conns:
+            for chunk in chunks:
+                await send_uncached(server, conn, chunk)
+
+    async def join_cached():
+        for conn in conns:
+            for chunk in chunks:
+                await chunk_frames.send(conn, chunk)
+
+    async def resend_all():
+        drop_caches(chunks)
+        await join_cached_one(chunk_frames, conns[0], chunks)
+
+    async def resend_cached():
+        for chunk in chunks:
+            chunk[4].block_states[8, 8, 8] = 1
+            chunk.invalidate(4)
+            await chunk_frames.send(conns[0], chunk)
+
+    drop_caches(chunks)  # the uncached encoder fills them too, but never reads frames from them
+    old = timed(join_uncached)
+    drop_caches(chunks)
+    new = timed(join_cached)
+
+    print(f"{players} players joining, {count} chunks each (compression threshold {comp_thresh}):")
+    print(f"  uncached: {old * 1000:>8,.1f}ms")
+    print(f"  cached:   {new * 1000:>8,.1f}ms ({old / new:.1f}x) {chunk_frames.stats()}")
+
+    full = timed(resend_all)
+    partial = timed(resend_cached)
+
+    print(f"re-sending {count} chunks after a change to 1 section:")
+    print(f"  all sections packed: {full * 1000:>8,.1f}ms")
+    print(f"  1 section packed:    {partial * 1000:>8,.1f}ms ({full / partial:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# Measures how long encoding a PlayUpdateLight packet takes per chunk, comparing the old encoder (a
+# struct.pack and bytes += per byte, minus its debug prints and with its masks fixed so section -1
+# doesn't crash it) to the NumPy nibble packer, and what that adds up to for the view distance.
+# Usage: python benchmarks/chunk_light.py [seconds per run] [view distance]
+
+import struct
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy
+
+from pymine.net.packets.play.chunk import PlayUpdateLight
+from pymine.types.block_palette import DirectPalette
+from pymine.types.chunk import Chunk, ChunkSection
+from pymine.types.buffer import Buffer
+
+
+def legacy_pack_chunk_light(chunk: Chunk) -> bytes:  # the old encoder, minus the prints and a crash
+    sky_light_mask = 0
+    block_light_mask = 0
+
+    sky_light_arrays = []
+    block_light_arrays = []
+
+    for section_y in range(-1, 17, 1):
+        section = chunk.get(section_y)
+
+        if section is None:
+            continue
+
+        if section.sky_light is not None and len(section.sky_light.nonzero()) > 0:
+            sky_light_mask |= 1 << (section_y + 1)
+            sky_light_array = b""
+
+            for y in range(16):
+                for z in range(16):
+                    for x in range(0, 16, 2):
+                        sky_light_array += struct.pack(
+                            ">B",
+                            (section.sky_light[y][z][x] << 4) | (section.sky_light[y][z][x + 1]),
+                        )
+
+            sky_light_arrays.append(Buffer.pack_varint(len(sky_light_array)) + sky_light_array)
+
+        if section.block_light is not None and len(section.block_light.nonzero()) > 0:
+            block_light_mask |= 1 << (section_y + 1)
+            block_light_array = b""
+
+            for y in range(16):
+                for z in range(16):
+                    for x in range(0, 16, 2):
+                        block_light_array += struct.pack(
+                            ">B",
+                            (section.block_light[y][z][x] << 4)
+                            | (section.block_light[y][z][x + 1]),
+                        )
+
+            block_light_arrays.append(
+                Buffer.pack_varint(len(block_light_array)) + block_light_array
+            )
+
+    return b"".join(sky_light_arrays) + b"".join(block_light_arrays)
+
+
+def test_chunk() -> Chunk:
+    """A chunk with terrain up to section 7, lit by the sky above it and a few lights below."""
+
+    rng = numpy.random.default_rng(0)
+    chunk = Chunk.new(0, 0, 0)
+
+    for y in range(-1, 17):
+        section = ChunkSection.new(y, DirectPalette)
+
+        if y < 8:
+            section.sky_light = rng.integers(0, 16, (16, 16, 16), numpy.int16)
+            section.block_light[rng.integers(0, 16, (3, 8))] = 14
+        else:
+            section.sky_light[:] = 15
+
+        chunk[y] = section
+
+    return chunk
+
+
+def per_second(func, seconds: float) -> float:
+    count = 0
+    start = time.perf_counter()
+
+    while time.perf_counter() - start < seconds:
+        func()
+        count += 1
+
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    view_distance = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    chunk = test_chunk()
+    chunks = (2 * (view_distance + 1)) ** 2  # what send_world_info() sends
+
+    old = per_second(lambda: legacy_pack_chunk_light(chunk), seconds)
+    new = per_second(lambda: PlayUpdateLight(chunk).encode(), seconds)
+
+    print(f"per chunk: {1e6 / old:>9,.0f}us -> {1e6 / new:>6,.0f}us ({new / old:.0f}x)")
+    print(
+        f"{chunks} chunks (view distance {view_distance}): "
+        f"{chunks / old:.2f}s -> {chunks / new:.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
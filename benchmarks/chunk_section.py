@@ -0,0 +1,93 @@
+# Measures how many chunk sections per second Buffer.pack_chunk_section_blocks() can pack, comparing
+# the old per-block Python loop (one struct.pack per long) to the NumPy long array packer. Packing
+# sections is most of the work of every PlayChunkData.encode().
+# Usage: python benchmarks/chunk_section.py [seconds per run]
+
+import struct
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy
+
+from pymine.types.block_palette import DirectPalette, IndirectPalette
+from pymine.types.chunk import ChunkSection
+from pymine.types.registry import Registry
+from pymine.types.buffer import Buffer
+
+
+def legacy_pack_chunk_section_blocks(
+    section: ChunkSection,
+) -> bytes:  # the old packer, bugs included, but returning the header it used to drop
+    palette = section.palette
+    bits_per_block = palette.get_bits_per_block()
+
+    out = struct.pack(">b", bits_per_block) + Buffer.pack_block_palette(palette)
+
+    data = [0] * int((16 * 16 * 16) * bits_per_block / 64)
+    individual_value_mask = (1 << bits_per_block) - 1
+
+    for y in range(16):
+        for z in range(16):
+            for x in range(16):
+                block_num = (((y * 16) + z) * 16) + x
+                start_long = (block_num * bits_per_block) // 64
+                start_offset = (block_num * bits_per_block) % 64
+                end_long = ((block_num + 1) * bits_per_block - 1) // 64
+
+                value = int(section.block_states[y][z][x]) & individual_value_mask
+
+                data[start_long] |= value << start_offset
+
+                if start_long != end_long:
+                    data[end_long] = value >> (64 - start_offset)
+
+    return (
+        out
+        + Buffer.pack_varint(len(data))
+        + b"".join([struct.pack(">Q", q & 0xFFFFFFFFFFFFFFFF) for q in data])
+    )
+
+
+def sections_per_second(pack, section: ChunkSection, seconds: float) -> float:
+    count = 0
+    start = time.perf_counter()
+
+    while time.perf_counter() - start < seconds:
+        pack(section)
+        count += 1
+
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+
+    names = ["minecraft:air", "minecraft:stone", "minecraft:dirt", "minecraft:grass_block"]
+    indirect = IndirectPalette(
+        Registry(
+            {name: {"states": [{"id": i}]} for i, name in enumerate(names)},
+            {i: {"name": name} for i, name in enumerate(names)},
+        ),
+        4,
+    )
+
+    rng = numpy.random.default_rng(0)
+
+    for name, palette, states in (
+        ("indirect, 4 bits", indirect, rng.integers(0, len(names), (16, 16, 16), numpy.int32)),
+        ("direct, 15 bits", DirectPalette, rng.integers(0, 20000, (16, 16, 16), numpy.int32)),
+    ):
+        section = ChunkSection(0, palette)
+        section.block_states = states
+
+        old = sections_per_second(legacy_pack_chunk_section_blocks, section, seconds)
+        new = sections_per_second(Buffer.pack_chunk_section_blocks, section, seconds)
+
+        print(f"{name}: {old:>8,.0f} -> {new:>8,.0f} sections/s ({new / old:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# Measures how much event loop time is spent compressing chunk packets during a simultaneous
+# join of many players, comparing compressing on the event loop to Server.pack_frame(), which
+# compresses big packets in the thread executor.
+# Usage: python benchmarks/compression.py [players] [chunks per player]
+
+import concurrent.futures
+import asyncio
+import numpy
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pymine.types.buffer import Buffer
+
+COMP_THRESH = 256
+OFFLOAD_SIZE = 8192  # default of comp_offload_size in server.yml
+
+
+def chunk_payload(rng: numpy.random.Generator) -> bytes:
+    """Returns data about as big and as compressible as an encoded PlayChunkData packet."""
+
+    sections = []
+
+    for y in range(16):
+        blocks = numpy.full(4096, y % 4, dtype=numpy.uint8)
+        blocks[rng.random(4096) < 0.15] = rng.integers(0, 16)  # ores, caves, etc
+        packed = (blocks[0::2] << 4) | blocks[1::2]  # 4 bits per block
+
+        sections.append(Buffer.pack("h", 4096) + b"\x04" + bytes(range(17)) + packed.tobytes())
+
+    biomes = b"".join(Buffer.pack_varint(1) for _ in range(1024))
+
+    return b"\x20" + b"".join(sections) + biomes + rng.bytes(600)  # + heightmaps
+
+
+async def join(chunks: list, offload: bool, executor) -> None:
+    loop = asyncio.get_event_loop()
+
+    for data in chunks:
+        if offload and len(data) >= OFFLOAD_SIZE:
+            await loop.run_in_executor(executor, Buffer.pack_frame, data, COMP_THRESH)
+        else:
+            Buffer.pack_frame(data, COMP_THRESH)
+
+        await asyncio.sleep(0)  # other connections get a turn, like when writing to a stream
+
+
+async def bench(players: int, chunks: list, offload: bool) -> tuple:
+    executor = concurrent.futures.ThreadPoolExecutor()
+    loop = asyncio.get_event_loop()
+
+    max_lag = 0
+    running = True
+
+    async def ticker():  # a task which should run every millisecond, like the rest of the server
+        nonlocal max_lag
+
+        while running:
+            start = loop.time()
+            await asyncio.sleep(0.001)
+            max_lag = max(max_lag, loop.time() - start - 0.001)
+
+    tick_task = asyncio.create_task(ticker())
+
+    start, start_cpu = time.perf_counter(), time.thread_time()
+    await asyncio.gather(*[join(chunks, offload, executor) for _ in range(players)])
+    elapsed, loop_cpu = time.perf_counter() - start, time.thread_time() - start_cpu
+
+    running = False
+    await tick_task
+    executor.shutdown()
+
+    return elapsed, loop_cpu, max_lag
+
+
+def main():
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 121  # view distance of 5
+
+    rng = numpy.random.default_rng(0)
+    chunks = [chunk_payload(rng) for _ in range(count)]
+
+    print(f"{players} players, {count} chunks each, {len(chunks[0]):,} bytes per chunk")
+
+    for name, offload in (("before", False), ("after", True)):
+        elapsed, loop_cpu, max_lag = asyncio.run(bench(players, chunks, offload))
+
+        print(
+            f"{name:>6}: {elapsed:.2f}s total, {loop_cpu:.2f}s of event loop cpu time, "
+            f"{max_lag * 1000:.1f}ms max event loop lag"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# Measures how long Console.debug() blocks the calling thread (the event loop) per message,
+# comparing formatting + writing on the caller (the old logging.StreamHandler on the root logger) to
+# queueing the record for the listener's thread.
+# Usage: python benchmarks/console.py [messages] > /dev/null (results are printed to stderr)
+
+import logging
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pymine.api.console import Console
+
+
+def bench(console: Console, messages: int) -> tuple:  # returns (mean, max) in microseconds
+    timings = []
+
+    for i in range(messages):
+        start = time.perf_counter()
+        console.debug("IN : state: 3 | id:0x12 | packet:PlayPlayerPosition", i)
+        timings.append(time.perf_counter() - start)
+
+    return sum(timings) / messages * 1e6, max(timings) * 1e6
+
+
+def main() -> None:
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    console = Console(False)
+    console.set_limits(messages, 0)  # nothing is dropped
+    console.set_debug(True)
+
+    root = logging.getLogger()
+
+    root.removeHandler(console.queue_handler)  # the old setup
+    root.addHandler(console.log_handler)
+    sync = bench(console, messages)
+
+    root.removeHandler(console.log_handler)
+    root.addHandler(console.queue_handler)
+    queued = bench(console, messages)
+
+    start = time.perf_counter()
+    console.stop()
+    drained = time.perf_counter() - start
+
+    out = sys.stderr  # stdout is where the log messages go
+
+    print(f"{messages} debug messages, time spent on the calling thread per message", file=out)
+    print(f"  StreamHandler:     {sync[0]:>8.2f} us, worst {sync[1]:>8.0f} us", file=out)
+    print(f"  LogQueueHandler:   {queued[0]:>8.2f} us, worst {queued[1]:>8.0f} us", file=out)
+    print(
+        f"  (the listener needed another {drained:.2f}s to write out the queued messages)", file=out
+    )
+
+
+if __name__ == "__main__":
+    main()
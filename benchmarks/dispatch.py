@@ -0,0 +1,131 @@
+# Measures how many packets per second Server.handle_packet() can dispatch to a handler, with debug
+# logging on and off, comparing the old dispatch (nested dict lookups, debug messages always built,
+# a logger looked up through inspect for every message) to the dispatch table.
+# Usage: python benchmarks/dispatch.py [packets]
+
+import asyncio
+import logging
+import inspect
+import types
+import time
+import sys
+import os
+
+os.chdir(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)  # packets load from pymine/
+sys.path.append(os.getcwd())
+
+from pymine.net.packets.play.player import PlayPlayerPosition
+from pymine.net.packet_map import PACKET_MAP
+from pymine.api.register import Register
+from pymine.api.console import Console
+from pymine.types.packet import LazyPacket
+from pymine.types.buffer import Buffer
+from pymine.server import Server
+
+
+class LegacyConsole(Console):  # the old get_logger() and debug()
+    def get_logger(self):
+        curframe = inspect.currentframe().f_back.f_back
+        return logging.getLogger(inspect.getmodule(curframe).__name__)
+
+    def debug(self, *message):
+        self.get_logger().debug(self.build_msg(message))
+
+
+async def legacy_handle_packet(self, conn):  # the old dispatch part of Server.handle_packet()
+    state = conn.state
+    buf = Buffer(await conn.stream.read_frame())
+
+    packet_class = buf.unpack_packet_class(state, PACKET_MAP, conn.comp_thresh, conn.inflater)
+
+    self.console.debug(
+        f"IN : state: {state} | id:0x{packet_class.id:02X} | packet:{packet_class.__name__}"
+    )
+
+    handlers = self.api.register._on_packet[state].get(packet_class.id)
+
+    if handlers is None:
+        return
+
+    if packet_class.lazy:
+        packet = LazyPacket(packet_class, buf)
+    else:
+        packet = packet_class.decode(buf)
+
+    for handler in handlers.values():
+        await handler(conn, packet)
+
+
+def fake_server(console: Console) -> types.SimpleNamespace:
+    register = Register()
+
+    @register.on_packet("play", PlayPlayerPosition.id)
+    async def handler(conn, packet):
+        pass
+
+    return types.SimpleNamespace(
+        console=console,
+        api=types.SimpleNamespace(register=register),
+        dispatch=register._dispatch,
+        unhandled_packets=set(),
+    )
+
+
+def fake_conn(frame: bytes) -> types.SimpleNamespace:
+    async def read_frame():
+        return frame
+
+    return types.SimpleNamespace(
+        stream=types.SimpleNamespace(read_frame=read_frame),
+        state=3,
+        comp_thresh=-1,
+        inflater=None,
+        send_queue=None,
+    )
+
+
+def bench(handle_packet, server, conn, packets: int) -> float:
+    async def run():
+        start = time.perf_counter()
+
+        for _ in range(packets):
+            await handle_packet(server, conn)
+
+        return packets / (time.perf_counter() - start)
+
+    return asyncio.run(run())
+
+
+def main() -> None:
+    packets = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    data = PlayPlayerPosition(12.5, 64.0, -30.5, True).encode()
+    conn = fake_conn(Buffer.pack_varint(PlayPlayerPosition.id) + data)
+
+    print(f"{packets} PlayPlayerPosition packets, dispatched to a single handler")
+
+    console, legacy_console = Console(False), LegacyConsole(False)
+
+    # both consoles log through the root logger, so one handler is enough
+    legacy_console.stop()
+    console.log_handler.setStream(open(os.devnull, "w"))  # only formatting is measured
+    console.set_limits(packets * 2, 0)  # nothing is dropped
+
+    for debug in (False, True):
+        console.set_debug(debug)
+        legacy_console.set_debug(debug)
+
+        legacy = bench(legacy_handle_packet, fake_server(legacy_console), conn, packets)
+        table = bench(Server.handle_packet, fake_server(console), conn, packets)
+
+        print(f"debug {'on ' if debug else 'off'}")
+        print(f"  old dispatch:      {legacy:>10,.0f} packets/s")
+        print(f"  dispatch table:    {table:>10,.0f} packets/s ({table / legacy:.2f}x)")
+
+    console.stop()
+
+
+if __name__ == "__main__":
+    main()
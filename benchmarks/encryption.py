@@ -0,0 +1,107 @@
+# Measures the cipher path of EncryptedStream, comparing the old update() calls (a new bytes
+# object per received chunk and per write) to update_into() with a per-stream buffer and in place
+# encryption.
+# Usage: python benchmarks/encryption.py [frame count] [payload size]
+
+import asyncio
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pymine.types.stream import EncryptedStream, Stream
+from pymine.util.encryption import gen_aes_cipher
+from pymine.types.buffer import Buffer
+
+KEY = os.urandom(16)
+
+
+class LegacyEncryptedStream(EncryptedStream):  # the old update() based decryption and encryption
+    def _buffer(self, data: bytes) -> None:
+        self.read_buf += self.decryptor.update(data)
+
+    def writelines(self, data: list) -> None:
+        return Stream.write(self, self.encryptor.update(b"".join(data)))
+
+
+async def bench_read(stream_class, count: int, payload: bytes) -> float:
+    done = asyncio.get_event_loop().create_future()
+
+    async def handle(reader, writer):
+        stream = stream_class(Stream(reader, writer), gen_aes_cipher(KEY))
+        start = time.perf_counter()
+
+        for _ in range(count):
+            await stream.read_frame()
+
+        done.set_result(time.perf_counter() - start)
+
+    server = await asyncio.start_server(handle, host="127.0.0.1", port=0)
+    _, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+
+    encryptor = gen_aes_cipher(KEY).encryptor()
+    frame = Buffer.pack_varint(len(payload)) + payload
+
+    for _ in range(count // 1000):
+        writer.write(encryptor.update(frame * 1000))
+        await writer.drain()
+
+    elapsed = await done
+
+    writer.close()
+    server.close()
+
+    return count / elapsed
+
+
+async def bench_write(stream_class, count: int, payload: bytes) -> float:
+    accepted = asyncio.get_event_loop().create_future()
+
+    server = await asyncio.start_server(
+        lambda r, w: accepted.set_result(stream_class(Stream(r, w), gen_aes_cipher(KEY))),
+        host="127.0.0.1",
+        port=0,
+    )
+    reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+    stream = await accepted
+
+    frames = [Buffer.pack_varint(len(payload)) + payload] * 100  # a single SendQueue flush
+    size = sum(map(len, frames))
+
+    async def drain():
+        for _ in range(count // 100):
+            await reader.readexactly(size)
+
+    drainer = asyncio.create_task(drain())
+    elapsed = 0
+
+    for _ in range(count // 100):
+        start = time.perf_counter()
+        stream.writelines(frames)
+        elapsed += time.perf_counter() - start
+
+        await stream.drain()
+
+    await drainer
+
+    writer.close()
+    server.close()
+
+    return count / elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 48  # about the size of a movement packet
+    payload = b"\x12" + os.urandom(size - 1)
+
+    for name, bench in (("read", bench_read), ("write", bench_write)):
+        before = asyncio.run(bench(LegacyEncryptedStream, count, payload))
+        after = asyncio.run(bench(EncryptedStream, count, payload))
+
+        print(f"{name:>5}: {before:>12,.0f} -> {after:>12,.0f} frames/sec ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
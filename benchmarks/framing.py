@@ -0,0 +1,75 @@
+# Measures how many frames per second a single connection can read, comparing the old
+# byte-at-a-time varint reads (one asyncio.wait_for() per byte) to Stream.read_frame().
+# Usage: python benchmarks/framing.py [frame count] [payload size]
+
+import asyncio
+import struct
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pymine.types.stream import Stream
+from pymine.types.buffer import Buffer
+
+
+async def read_frame_legacy(stream: Stream) -> bytes:  # the old Server.handle_packet() framing
+    packet_length = 0
+
+    for i in range(3):
+        read = await asyncio.wait_for(stream.read(1), 30)
+
+        b = struct.unpack(">B", read)[0]
+        packet_length |= (b & 0x7F) << 7 * i
+
+        if not b & 0x80:
+            break
+
+    return await stream.read(packet_length)
+
+
+async def read_frame_buffered(stream: Stream) -> bytes:
+    return await stream.read_frame()
+
+
+async def bench(reader_func, count: int, payload: bytes) -> float:
+    done = asyncio.get_event_loop().create_future()
+
+    async def handle(reader, writer):
+        stream = Stream(reader, writer)
+        start = time.perf_counter()
+
+        for _ in range(count):
+            await reader_func(stream)
+
+        done.set_result(time.perf_counter() - start)
+
+    server = await asyncio.start_server(handle, host="127.0.0.1", port=0)
+    _, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+
+    frame = Buffer.pack_varint(len(payload)) + payload
+
+    for _ in range(count // 1000):
+        writer.write(frame * 1000)
+        await writer.drain()
+
+    elapsed = await done
+
+    writer.close()
+    server.close()
+
+    return count / elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 48  # about the size of a movement packet
+    payload = b"\x12" + os.urandom(size - 1)
+
+    for name, func in (("before", read_frame_legacy), ("after", read_frame_buffered)):
+        print(f"{name:>6}: {asyncio.run(bench(func, count, payload)):,.0f} frames/sec")
+
+
+if __name__ == "__main__":
+    main()
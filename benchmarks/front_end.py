@@ -0,0 +1,207 @@
+# Load test for the multi-process front end (pymine/logic/front_end.py), measures how many status
+# pings and online mode logins per second the front end workers complete for different worker
+# counts. Logins are authenticated against a local stub session server and handed off to a stub
+# main process, which closes them right away.
+# Usage: python benchmarks/front_end.py [worker counts, like 1,2,4] [seconds per run] [clients]
+
+import multiprocessing
+import asyncio
+import types
+import time
+import sys
+import os
+
+# packets are loaded relative to the working directory
+os.chdir(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.getcwd())
+
+from cryptography.hazmat.primitives.asymmetric.padding import PKCS1v15
+from cryptography.hazmat.primitives.serialization import load_der_public_key
+from aiohttp import web
+
+from pymine.net.packets.handshaking.handshake import HandshakeHandshake
+from pymine.net.packets.status.status import StatusStatusPingPong, StatusStatusResponse
+from pymine.logic.front_end import FrontEndHub
+from pymine.types.stream import EncryptedStream, Stream
+from pymine.util.encryption import gen_aes_cipher
+from pymine.types.buffer import Buffer
+
+PORT = 25599
+CONCURRENCY = 32  # connections per client process
+
+
+async def ping(stream: Stream) -> None:
+    stream.write(Buffer.pack_frame(b"\x00"))
+    await stream.read_frame()
+
+    stream.write(Buffer.pack_packet(StatusStatusPingPong(1)))
+    await stream.read_frame()
+
+
+async def login(stream: Stream, i: int) -> None:
+    stream.write(Buffer.pack_frame(b"\x00" + Buffer.pack_string(f"player{i}")))
+
+    request = Buffer(await stream.read_frame())
+    request.unpack_varint()
+    request.unpack_string()
+    public_key = load_der_public_key(request.read(request.unpack_varint()))
+    verify_token = request.read(request.unpack_varint())
+
+    shared_key = os.urandom(16)
+    encrypted = [public_key.encrypt(data, PKCS1v15()) for data in (shared_key, verify_token)]
+    stream.write(
+        Buffer.pack_frame(b"\x01" + b"".join(Buffer.pack_varint(len(e)) + e for e in encrypted))
+    )
+
+    stream = EncryptedStream(stream, gen_aes_cipher(shared_key))
+    await stream.read_frame()  # LoginSetCompression
+    await stream.read_frame()  # LoginSuccess
+
+
+async def client(mode: str, seconds: float) -> int:
+    done = 0
+    deadline = time.monotonic() + seconds
+
+    async def loop(n: int):
+        nonlocal done
+
+        while time.monotonic() < deadline:
+            reader, writer = await asyncio.open_connection("127.0.0.1", PORT)
+            stream = Stream(reader, writer)
+            stream.write(
+                Buffer.pack_packet(
+                    HandshakeHandshake(754, "localhost", PORT, 1 if mode == "ping" else 2)
+                )
+            )
+
+            try:
+                if mode == "ping":
+                    await ping(stream)
+                else:
+                    await login(stream, n)
+
+                done += 1
+            except (asyncio.IncompleteReadError, ConnectionError):
+                pass
+
+            stream.close()
+
+    await asyncio.gather(*[loop(n) for n in range(CONCURRENCY)])
+
+    return done
+
+
+def run_client(mode: str, seconds: float, results) -> None:
+    results.put(asyncio.run(client(mode, seconds)))
+
+
+async def stub_session_server() -> web.AppRunner:
+    async def has_joined(request):
+        return web.json_response(
+            {"id": "0" * 32, "name": request.query["username"], "properties": []}
+        )
+
+    app = web.Application()
+    app.router.add_get("/session/minecraft/hasJoined", has_joined)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+
+async def bench(workers: int, seconds: float, clients: int) -> dict:
+    runner, session_server = await stub_session_server()
+
+    async def adopt_connection(handoff, fd):
+        os.close(fd)
+
+    conf = {
+        "debug": False,
+        "server_ip": "127.0.0.1",
+        "server_port": PORT,
+        "online_mode": True,
+        "comp_thresh": 256,
+        "session_server": session_server,
+        "session_max_concurrent": 64,
+        "session_timeout": 5,
+        "session_retries": 0,
+        "session_cache_ttl": 30,
+        "connection_timeout": 30,
+        "keep_alive_interval": 15,
+        "latency_update_interval": 5,
+    }
+
+    status = Buffer.pack_packet(
+        StatusStatusResponse(
+            {
+                "version": {"name": "1.16.5", "protocol": 754},
+                "players": {"max": 20, "online": 0, "sample": []},
+                "description": {"text": "A Minecraft Server"},
+            }
+        )
+    )
+
+    server = types.SimpleNamespace(
+        conf=conf,
+        console=types.SimpleNamespace(error=print),
+        adopt_connection=adopt_connection,
+        status_cache=types.SimpleNamespace(frame=lambda: status),
+    )
+
+    hub = FrontEndHub(server, workers)
+    await hub.start()
+
+    while len(hub.workers) < workers:
+        await asyncio.sleep(0.05)
+
+    await asyncio.sleep(1)  # give the hub time to send the status frame
+
+    results = {}
+    ctx = multiprocessing.get_context("spawn")
+
+    for mode in ("ping", "login"):
+        queue = ctx.Queue()
+        client_processes = [
+            ctx.Process(target=run_client, args=(mode, seconds, queue)) for _ in range(clients)
+        ]
+
+        for process in client_processes:
+            process.start()
+
+        # the stub session server and hub run on this loop, so it has to keep running meanwhile
+        total = 0
+
+        for _ in client_processes:
+            while queue.empty():
+                await asyncio.sleep(0.05)
+
+            total += queue.get()
+
+        results[mode] = total / seconds
+
+    hub.stop()
+    await runner.cleanup()
+
+    return results
+
+
+def main():
+    worker_counts = [int(n) for n in (sys.argv[1] if len(sys.argv) > 1 else "1,2,4").split(",")]
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    clients = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+
+    print(f"{os.cpu_count()} cores, {clients} client processes x {CONCURRENCY} connections")
+
+    for workers in worker_counts:
+        results = asyncio.run(bench(workers, seconds, clients))
+        print(
+            f"{workers} workers: {results['ping']:>9,.0f} pings/s, "
+            f"{results['login']:>7,.0f} logins/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# Simulates a login storm against a local stub session server, comparing the old server_auth() (RSA
+# decryption on the event loop, one unbounded session server request per login) to SessionAuth.
+# Reports how long the storm took and the worst event loop stall seen by a 1ms ticker while it ran.
+# Usage: python benchmarks/login.py [logins] [session server latency in ms]
+
+import concurrent.futures
+import asyncio
+import types
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cryptography.hazmat.primitives.asymmetric.padding import PKCS1v15
+from aiohttp import web
+import aiohttp
+
+from pymine.logic.session_auth import SessionAuth, HAS_JOINED_PATH
+from pymine.util.encryption import gen_rsa_keys
+
+
+async def start_stub(latency: float) -> tuple:
+    async def has_joined(request):
+        await asyncio.sleep(latency)
+        return web.json_response(
+            {"id": "0" * 32, "name": request.query["username"], "properties": []}
+        )
+
+    app = web.Application()
+    app.router.add_get(HAS_JOINED_PATH, has_joined)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+
+async def legacy_auth(server, base_url: str, verify_token: bytes, shared_key: bytes, name: str):
+    # the old server_auth()
+    server.secrets.rsa_private.decrypt(verify_token, PKCS1v15())
+    server.secrets.rsa_private.decrypt(shared_key, PKCS1v15())
+
+    resp = await server.aiohttp.get(
+        base_url + HAS_JOINED_PATH, params={"username": name, "serverId": name}
+    )
+
+    return await resp.json()
+
+
+async def new_auth(server, base_url: str, verify_token: bytes, shared_key: bytes, name: str):
+    await server.session_auth.decrypt(verify_token, shared_key)
+    return await server.session_auth.has_joined(name, name)
+
+
+async def bench(auth_func, logins: int, latency: float) -> tuple:
+    runner, base_url = await start_stub(latency)
+
+    private_key, public_key = gen_rsa_keys()
+
+    server = types.SimpleNamespace(
+        conf={
+            "session_server": base_url,
+            "session_max_concurrent": 16,
+            "session_timeout": 5,
+            "session_retries": 2,
+            "session_cache_ttl": 30,
+        },
+        console=types.SimpleNamespace(debug=lambda *a: None, warn=print),
+        secrets=types.SimpleNamespace(rsa_private=private_key),
+        thread_executor=concurrent.futures.ThreadPoolExecutor(),
+        aiohttp=aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)),
+    )
+    server.session_auth = SessionAuth(server)
+
+    verify_token = public_key.encrypt(os.urandom(4), PKCS1v15())
+    shared_key = public_key.encrypt(os.urandom(16), PKCS1v15())
+
+    worst = 0
+    done = False
+
+    async def ticker():
+        nonlocal worst
+
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            worst = max(worst, time.perf_counter() - start - 0.001)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[
+            auth_func(server, base_url, verify_token, shared_key, f"player{i}")
+            for i in range(logins)
+        ]
+    )
+    elapsed = time.perf_counter() - start
+
+    done = True
+    await ticker_task
+
+    await server.aiohttp.close()
+    await runner.cleanup()
+    server.thread_executor.shutdown()
+
+    return elapsed, worst
+
+
+def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = (int(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+
+    print(f"{logins} simultaneous logins, session server latency {latency * 1000:.0f}ms")
+
+    for name, func in (("before", legacy_auth), ("after", new_auth)):
+        elapsed, worst = asyncio.run(bench(func, logins, latency))
+        print(f"{name:>6}: {elapsed * 1000:>8.1f}ms total, worst loop stall {worst * 1000:>6.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
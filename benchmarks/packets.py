@@ -0,0 +1,171 @@
+# Measures packet encoding for every packet in PACKET_MAP_CLIENTBOUND. Packets which declare a
+# schema compare the old hand-written style (one Buffer.pack*() call and one bytes concatenation
+# per field) to the encode() generated from the schema, the others are built from sample
+# constructor arguments and measured as they are. Packets which can't be built that way are skipped.
+# Usage: python benchmarks/packets.py [iterations]
+
+import inspect
+import uuid
+import time
+import sys
+import os
+
+os.chdir(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)  # packets load from pymine/
+sys.path.append(os.getcwd())
+
+from pymine.net.packet_map import PACKET_MAP_CLIENTBOUND
+from pymine.types.schema import FIXED_WIDTH
+from pymine.types.block_palette import DirectPalette
+from pymine.types.chunk import Chunk, ChunkSection
+from pymine.types.buffer import Buffer
+import pymine.types.nbt as nbt
+
+SAMPLES = {
+    "varint": 300,
+    "varlong": 1 << 40,
+    "string": "minecraft:overworld",
+    "json": {"text": "A Minecraft Server"},
+    "chat": "Hello world!",
+    "nbt": nbt.TAG_Compound("", [nbt.TAG_Int("a", 1), nbt.TAG_String("b", "c")]),
+    "uuid": uuid.UUID(int=12345),
+    "?": True,
+    "b": -3,
+    "B": 200,
+    "h": -300,
+    "H": 60000,
+    "i": -70000,
+    "I": 70000,
+    "q": 1 << 40,
+    "Q": 1 << 40,
+    "f": 1.5,
+    "d": -2.25,
+}
+
+
+def sample_chunk() -> Chunk:
+    chunk = Chunk.new(0, 0, 0)
+    chunk[0] = ChunkSection.new(0, DirectPalette)
+    chunk[0].block_states[:] = 1
+
+    return chunk
+
+
+ARG_SAMPLES = {  # {annotation: constructor argument}, for packets without a schema
+    "int": 1,
+    "bool": True,
+    "float": 1.5,
+    "str": "minecraft:overworld",
+    "bytes": b"\x01\x02",
+    "list": [],
+    "dict": {},
+    "uuid.UUID": uuid.UUID(int=12345),
+    "nbt.TAG | bytes": SAMPLES["nbt"],
+    "Chunk": sample_chunk(),
+}
+
+
+def sample_args(packet_class) -> list:  # raises KeyError if an argument has no sample
+    params = list(inspect.signature(packet_class.__init__).parameters.values())[1:]
+
+    return [
+        ARG_SAMPLES[p.annotation]
+        for p in params
+        if p.default is p.empty and p.kind is p.POSITIONAL_OR_KEYWORD
+    ]
+
+
+def sample_packet(packet_class) -> object:  # fills in the attributes directly, constructors vary
+    packet = object.__new__(packet_class)
+
+    for attrs, type_ in packet_class.schema:
+        if type_ == "position":
+            packet.x, packet.y, packet.z = 12, 64, -30
+        else:
+            setattr(packet, attrs, SAMPLES[type_])
+
+    return packet
+
+
+def legacy_encoder(packet_class):  # generates the same code a hand-written encode() would be
+    fields = []
+
+    for attrs, type_ in packet_class.schema:
+        if type_ in FIXED_WIDTH:
+            fields.append(f'Buffer.pack("{type_}", self.{attrs})')
+        elif type_ == "position":
+            fields.append(f"Buffer.pack_position({', '.join(f'self.{a}' for a in attrs)})")
+        else:
+            fields.append(f"Buffer.pack_{type_}(self.{attrs})")
+
+    namespace = {"Buffer": Buffer}
+    exec(f"def encode(self):\n    return {' + '.join(fields)}", namespace)
+
+    return namespace["encode"]
+
+
+def bench(func, *args, iterations: int) -> float:
+    start = time.perf_counter()
+
+    for _ in range(iterations):
+        func(*args)
+
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    packet_classes = {p for state in PACKET_MAP_CLIENTBOUND.values() for p in state.values()}
+    with_schema = 0
+    skipped = []
+
+    total_before = total_after = 0
+
+    for packet_class in sorted(packet_classes, key=(lambda p: p.__name__)):
+        if packet_class.schema:
+            packet = sample_packet(packet_class)
+            legacy = legacy_encoder(packet_class)
+
+            assert legacy(packet) == packet.encode()
+
+            before = bench(legacy, packet, iterations=iterations)
+            after = bench(packet_class.encode, packet, iterations=iterations)
+            with_schema += 1
+        else:  # still hand-written, so before and after are the same
+            try:
+                packet = packet_class(*sample_args(packet_class))
+                packet.encode()
+            except Exception:
+                skipped.append(packet_class.__name__)
+                continue
+
+            before = after = bench(packet_class.encode, packet, iterations=iterations)
+
+        total_before += iterations / before
+        total_after += iterations / after
+
+        if packet_class.schema:
+            print(
+                f"{packet_class.__name__}: {before:,.0f} -> {after:,.0f} ops/sec "
+                f"({after / before:.2f}x)"
+            )
+        else:
+            print(f"{packet_class.__name__}: {after:,.0f} ops/sec (no schema)")
+
+    measured = len(packet_classes) - len(skipped)
+
+    print(
+        f"\n{with_schema} of {len(packet_classes)} clientbound packets have a schema, "
+        f"encoding each of the {measured} measured packets once: "
+        f"{total_before / iterations * 1e6:.1f}us -> {total_after / iterations * 1e6:.1f}us "
+        f"({total_before / total_after:.2f}x)"
+    )
+
+    if skipped:
+        print(f"skipped, can't be built from sample arguments: {', '.join(skipped)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# Measures how many server list pings per second a single core can answer, comparing building the
+# status response for every ping (the old send_status()) to StatusCache.
+# Usage: python benchmarks/status.py [pings] [players online]
+
+import asyncio
+import types
+import uuid
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pymine.net.packets.status.status import StatusStatusResponse
+from pymine.logic.status_cache import StatusCache
+from pymine.types.send_queue import SendQueue
+from pymine.types.stream import Stream
+from pymine.types.buffer import Buffer
+from pymine.types.chat import Chat
+
+
+def fake_server(players: int) -> types.SimpleNamespace:
+    server = types.SimpleNamespace(
+        meta=types.SimpleNamespace(version="1.16.5", protocol=754),
+        conf={"max_players": 100, "motd": "A Minecraft Server"},
+        favicon="data:image/png;base64," + "A" * 8192,  # about the size of a typical server icon
+        playerio=types.SimpleNamespace(cache={}),
+    )
+
+    for i in range(players):
+        uuid_ = uuid.uuid4()
+        server.playerio.cache[int(uuid_)] = types.SimpleNamespace(username=f"player{i}", uuid=uuid_)
+
+    return server
+
+
+def build_status(server) -> bytes:  # the old send_status()
+    data = {
+        "version": {"name": server.meta.version, "protocol": server.meta.protocol},
+        "players": {
+            "max": server.conf["max_players"],
+            "online": len(server.playerio.cache),
+            "sample": [
+                {"name": p.username, "id": str(p.uuid)} for p in server.playerio.cache.values()
+            ],
+        },
+        "description": Chat(server.conf["motd"]).msg,
+    }
+
+    if server.favicon:
+        data["favicon"] = server.favicon
+
+    return Buffer.pack_packet(StatusStatusResponse(data), -1)
+
+
+async def bench(get_frame, count: int) -> float:
+    done = asyncio.get_event_loop().create_future()
+
+    async def handle(reader, writer):
+        stream = Stream(reader, writer)
+        queue = SendQueue(stream, 0.001, 262144, 65536, 2 ** 30)
+
+        for _ in range(count):
+            await stream.read_frame()
+            queue.push(get_frame())
+
+            if queue.pressured:
+                await queue.drain()
+
+        await queue.close()
+
+    server = await asyncio.start_server(handle, host="127.0.0.1", port=0)
+    reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+    client = Stream(reader, writer)
+
+    start = time.perf_counter()
+
+    async def read_responses():
+        for _ in range(count):
+            await client.read_frame()
+
+        done.set_result(time.perf_counter() - start)
+
+    reading = asyncio.create_task(read_responses())
+
+    request = Buffer.pack_varint(1) + b"\x00"  # status request frames, pipelined
+
+    for _ in range(count // 100):
+        writer.write(request * 100)
+        await writer.drain()
+
+    elapsed = await done
+    await reading
+
+    writer.close()
+    server.close()
+
+    return count / elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    players = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    server = fake_server(players)
+    cache = StatusCache(server)
+
+    for name, func in (("before", lambda: build_status(server)), ("after", cache.frame)):
+        print(f"{name:>6}: {asyncio.run(bench(func, count)):,.0f} pings/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# Measures the cost of tracking idle deadlines for many connections, comparing a call_later timer
+# per connection (the old Stream.set_idle_timeout()) to a single TimerWheel. Every connection keeps
+# receiving data, so each deadline is checked once per timeout and pushed back.
+# Usage: python benchmarks/timers.py [connections] [simulated seconds]
+
+import asyncio
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pymine.types.timer_wheel import TimerWheel
+
+TIMEOUT = 30
+
+
+class FakeStream:
+    __slots__ = ("last_read", "handle")
+
+    def __init__(self, now: float) -> None:
+        self.last_read = now
+        self.handle = None
+
+
+def bench_call_later(count: int, seconds: int) -> float:
+    loop = asyncio.new_event_loop()
+    fake_time = [0.0]
+    loop.time = lambda: fake_time[0]
+
+    def check_idle(stream):
+        idle = fake_time[0] - stream.last_read
+        stream.handle = loop.call_later(TIMEOUT - idle, check_idle, stream)
+
+    streams = [FakeStream(0) for _ in range(count)]
+
+    start = time.perf_counter()
+
+    for stream in streams:
+        stream.handle = loop.call_later(TIMEOUT, check_idle, stream)
+
+    for second in range(1, seconds + 1):
+        fake_time[0] = second
+
+        for i in range(second % TIMEOUT, count, TIMEOUT):  # every connection reads once a timeout
+            streams[i].last_read = second
+
+        loop.call_soon(loop.stop)
+        loop.run_forever()  # runs whatever timers are due
+
+    elapsed = time.perf_counter() - start
+    loop.close()
+
+    return elapsed
+
+
+def bench_wheel(count: int, seconds: int) -> float:
+    fake_time = [0.0]
+
+    def expire(stream):
+        return TIMEOUT - (fake_time[0] - stream.last_read)
+
+    wheel = TimerWheel(expire)
+    wheel.advance(0)
+
+    streams = [FakeStream(0) for _ in range(count)]
+
+    start = time.perf_counter()
+
+    for stream in streams:
+        wheel.schedule(stream, TIMEOUT)
+
+    for second in range(1, seconds + 1):
+        fake_time[0] = second
+
+        for i in range(second % TIMEOUT, count, TIMEOUT):
+            streams[i].last_read = second
+
+        wheel.advance(second)
+
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    seconds = int(sys.argv[2]) if len(sys.argv) > 2 else 120
+
+    old = bench_call_later(count, seconds)
+    new = bench_wheel(count, seconds)
+
+    print(f"{count:,} connections over {seconds} simulated seconds:")
+    print(f"  call_later per connection: {old * 1000:8.1f}ms")
+    print(f"  timer wheel:               {new * 1000:8.1f}ms ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
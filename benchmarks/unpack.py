@@ -0,0 +1,110 @@
+# Measures fixed-width decoding, comparing the old Buffer.unpack() (which sliced out a copy and
+# recompiled the format on every call) to the precompiled structs and dedicated readers.
+# Usage: python benchmarks/unpack.py [iterations]
+
+import struct
+import time
+import gzip
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pymine.net.packets.play.player import PlayPlayerPositionAndRotationServerBound
+from pymine.net.packets.play.keep_alive import PlayKeepAliveServerBound
+from pymine.types.buffer import Buffer
+import pymine.types.nbt as nbt
+
+
+class LegacyBuffer(Buffer):  # the old Buffer.unpack(), the dedicated readers just call it
+    def unpack(self, f: str) -> object:
+        unpacked = struct.unpack(">" + f, self.read(struct.calcsize(f)))
+
+        if len(unpacked) == 1:
+            return unpacked[0]
+
+        return unpacked
+
+    def unpack_array(self, f: str, length: int) -> tuple:
+        return tuple([self.unpack(f) for _ in range(length)])
+
+    def unpack_bool(self) -> bool:
+        return self.unpack("?")
+
+    def unpack_short(self) -> int:
+        return self.unpack("h")
+
+    def unpack_ushort(self) -> int:
+        return self.unpack("H")
+
+    def unpack_int(self) -> int:
+        return self.unpack("i")
+
+    def unpack_long(self) -> int:
+        return self.unpack("q")
+
+    def unpack_float(self) -> float:
+        return self.unpack("f")
+
+    def unpack_double(self) -> float:
+        return self.unpack("d")
+
+
+def decode_nbt(cls, data: bytes) -> None:
+    nbt.unpack(cls(data))
+
+
+def decode_movement(cls, data: bytes) -> None:  # 64 movement packets + a keep alive
+    buf = cls(data)
+
+    for _ in range(64):
+        PlayPlayerPositionAndRotationServerBound.decode(buf)
+
+    PlayKeepAliveServerBound.decode(buf)
+
+
+def bench(func, *args, iterations: int) -> float:
+    start = time.perf_counter()
+
+    for _ in range(iterations):
+        func(*args)
+
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    bigtest = os.path.join(os.path.dirname(__file__), "..", "tests", "sample_data", "bigtest.nbt")
+
+    with open(bigtest, "rb") as nbt_file:
+        bigtest = gzip.decompress(nbt_file.read())  # so only the decoding is measured
+
+    # bigtest.nbt is mostly one byte array, so also decode a tag made of many small values
+    values = nbt.TAG_Compound(
+        "",
+        [
+            nbt.TAG_List("pos", [nbt.TAG_Double(None, i / 3) for i in range(64)]),
+            nbt.TAG_List("ints", [nbt.TAG_Int(None, i) for i in range(64)]),
+            nbt.TAG_Int_Array("int_array", list(range(1024))),
+            nbt.TAG_Long_Array("long_array", list(range(256))),
+        ],
+    ).pack()
+
+    movement = Buffer.pack("dddff?", 1.5, 64, -2.5, 90, 45, True) * 64 + Buffer.pack(
+        "q", 1234567890456
+    )
+
+    for name, func, args in (
+        ("decode bigtest.nbt", decode_nbt, (bigtest,)),
+        ("decode doubles, ints and int/long arrays", decode_nbt, (values,)),
+        ("decode 64 movement packets + keep alive", decode_movement, (movement,)),
+    ):
+        before = bench(func, LegacyBuffer, *args, iterations=iterations)
+        after = bench(func, Buffer, *args, iterations=iterations)
+
+        print(f"{name}: {before:,.0f} -> {after:,.0f} ops/sec ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
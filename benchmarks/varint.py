@@ -0,0 +1,113 @@
+# Measures varint throughput, comparing the old Buffer.pack_varint()/unpack_varint() (one
+# struct call per byte) to pymine.util.varint.
+# Usage: python benchmarks/varint.py [iterations]
+
+import random
+import struct
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pymine.types.buffer import Buffer
+
+
+class LegacyBuffer(Buffer):  # the old varint methods
+    @classmethod
+    def pack_varint(cls, num: int, max_bits: int = 32) -> bytes:
+        num_max = (1 << (max_bits - 1)) - 1
+        num_min = -1 << (max_bits - 1)
+
+        if not (num_min <= num <= num_max):
+            raise ValueError(f"num doesn't fit in given range: {num_min} <= {num} < {num_max}")
+
+        if num < 0:
+            num += 1 << 32
+
+        out = b""
+
+        for i in range(10):
+            b = num & 0x7F
+            num >>= 7
+
+            out += struct.pack(">B", (b | (0x80 if num > 0 else 0)))
+
+            if num == 0:
+                break
+
+        return out
+
+    @classmethod
+    def pack_varints(cls, nums: list, max_bits: int = 32) -> bytes:
+        return b"".join([cls.pack_varint(num, max_bits) for num in nums])
+
+    def unpack_varint(self, max_bits: int = 32) -> int:
+        num = 0
+
+        for i in range(10):
+            b = self.unpack("B")
+            num |= (b & 0x7F) << 7 * i
+
+            if not b & 0x80:
+                break
+
+        if num & (1 << 31):
+            num -= 1 << 32
+
+        num_max = (1 << (max_bits - 1)) - 1
+        num_min = -1 << (max_bits - 1)
+
+        if not (num_min <= num <= num_max):
+            raise ValueError(f"num doesn't fit in given range: {num_min} <= {num} < {num_max}")
+
+        return num
+
+
+def pack_mixed(cls, nums: list) -> None:  # packet ids, lengths, entity ids, etc...
+    for num in nums:
+        cls.pack_varint(num)
+
+
+def pack_biomes(cls, biomes: list) -> None:  # like PlayChunkData.encode()
+    cls.pack_varints(biomes)
+
+
+def unpack_mixed(cls, data: bytes, count: int) -> None:
+    buf = cls(data)
+
+    for _ in range(count):
+        buf.unpack_varint()
+
+
+def bench(func, *args, iterations: int) -> float:
+    start = time.perf_counter()
+
+    for _ in range(iterations):
+        func(*args)
+
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    rand = random.Random(0)
+
+    mixed = [rand.choice((rand.randrange(128), rand.randrange(1 << 20), -1)) for _ in range(256)]
+    biomes = [rand.randrange(80) for _ in range(1024)]
+    packed = Buffer.pack_varints(mixed)
+
+    for name, func, args in (
+        ("pack 256 mixed varints", pack_mixed, (mixed,)),
+        ("pack 1024 biomes", pack_biomes, (biomes,)),
+        ("unpack 256 mixed varints", unpack_mixed, (packed, len(mixed))),
+    ):
+        before = bench(func, LegacyBuffer, *args, iterations=iterations)
+        after = bench(func, Buffer, *args, iterations=iterations)
+
+        print(f"{name}: {before:,.0f} -> {after:,.0f} ops/sec ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
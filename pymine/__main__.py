@@ -83,6 +83,8 @@ async def main():
     process_executor.shutdown(wait=False)
     thread_executor.shutdown(wait=False)
 
+    console.stop()  # flushes logs which are still queued
+
     if (
         os.name == "posix"
     ):  # for some reason prompt_toolkit causes issues after exiting PyMine sometimes, this fixes those.
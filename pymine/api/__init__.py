@@ -57,6 +57,15 @@ class PyMineAPI:
     ):  # used to run a blocking function in a process pool
         await asyncio.get_event_loop().run_in_executor(self.executor, func, *args, **kwargs)
 
+    def update_join_data(self) -> None:
+        """Call after changing tags, registries, or anything else sent to every joining player.
+
+        The packets built from them are encoded once for all players (see JoinFrames), this makes
+        sure they're encoded again before the next player joins.
+        """
+
+        self.server.join_frames.invalidate()
+
     def eid(self):  # used to generate entity ids
         self.eid_current += 1
         return self.eid_current
@@ -224,20 +233,16 @@ class PyMineAPI:
         self.console.debug("add_plugin() called for " + plugin_quali_name)
 
         self.plugins[plugin_quali_name] = plugin
+        self.update_join_data()  # the plugin may have changed what joining players are sent
 
         for attr in dir(plugin):
             thing = getattr(plugin, attr)
 
             if isinstance(thing, AbstractEvent):
                 if isinstance(thing, PacketEvent):
-                    try:
-                        self.register._on_packet[thing.state_id][thing.packet_id][
-                            plugin_quali_name
-                        ] = thing
-                    except KeyError:
-                        self.register._on_packet[thing.state_id][thing.packet_id] = {
-                            plugin_quali_name: thing
-                        }
+                    self.register.add_packet_handler(
+                        thing.state_id, thing.packet_id, plugin_quali_name, thing
+                    )
                 elif isinstance(thing, ServerStartEvent):
                     self.register._on_server_start[plugin_quali_name] = thing
                 elif isinstance(thing, ServerStopEvent):
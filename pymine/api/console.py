@@ -22,9 +22,9 @@ from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.output import create_output
 from prompt_toolkit.history import FileHistory
 from prompt_toolkit.enums import EditingMode
+import logging.handlers
 import traceback
 import logging
-import inspect
 import asyncio
 import time
 import sys
@@ -32,6 +32,7 @@ import os
 import io
 
 import pymine.api.console_log_formatter
+from pymine.api.console_log_handler import LogQueueHandler, LogQueueListener
 
 if os.name == "nt":
     import colorama
@@ -44,6 +45,7 @@ class Console:
 
     def __init__(self, debug: bool = True) -> None:
         self.debug_ = debug
+        self.loggers = {}  # {module name: logging.Logger}
         self.prompt = "> "
         self.bindings = KeyBindings()
 
@@ -54,22 +56,25 @@ class Console:
         self.alt_out.flush = self.out.flush
         self.log_handler = logging.StreamHandler(self.alt_out)
 
-        log_format = "[{asctime} {levelname}:'{name}']: {message}"
-        time_format = "%Y-%m-%d %H:%M:%S"
+        self.log_format = "[{asctime} {levelname}:'{name}']: {message}"
+        self.time_format = "%Y-%m-%d %H:%M:%S"
 
         self.log_formatter = pymine.api.console_log_formatter.CustomFormatter(
-            fmt=log_format,
-            datefmt=time_format,
+            fmt=self.log_format,
+            datefmt=self.time_format,
         )
 
         self.log_handler.setFormatter(self.log_formatter)
+
+        # records are only queued on the event loop, the listener's thread formats + writes them
+        self.queue_handler = LogQueueHandler()
+        self.log_listener = LogQueueListener(self.queue_handler, self.log_handler)
+        self.log_listener.start()
+
         self.logger = logging.getLogger()
-        self.logger.addHandler(self.log_handler)
+        self.logger.addHandler(self.queue_handler)
 
-        if self.debug_:
-            self.logger.setLevel(logging.DEBUG)
-        else:
-            self.logger.setLevel(logging.INFO)
+        self.set_debug(debug)
         self.debug("Started Logger")
 
         self.ses = PromptSession(
@@ -91,16 +96,61 @@ class Console:
         self.out.write_raw(text)
         self.out.flush()
 
+    def set_limits(self, max_queued: int, rate_limit: int) -> None:
+        """Sets the maximum amount of queued log records and records per second per logger.
+
+        A rate_limit of 0 means no limit.
+        """
+
+        self.queue_handler.set_limits(max_queued, rate_limit)
+
+    def add_file_sink(self, path: str, max_bytes: int, backups: int) -> None:
+        """Also writes logs to a file, rotated once it's max_bytes big, keeping backups old ones."""
+
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backups, encoding="utf8", delay=True
+        )
+        handler.setFormatter(
+            logging.Formatter(fmt=self.log_format, datefmt=self.time_format, style="{")
+        )
+
+        self.log_listener.add_handler(handler)
+
+    def stop(self) -> None:
+        """Writes out any queued log records and stops the listener's thread."""
+
+        self.logger.removeHandler(self.queue_handler)
+        self.log_listener.stop()
+
+        for handler in self.log_listener.handlers:
+            handler.close()
+
+    def set_debug(self, debug: bool) -> None:
+        """Enables or disables debug messages.
+
+        Callers should check debug_ before formatting a debug message, it's wasted work otherwise.
+        """
+
+        self.debug_ = debug
+        self.logger.setLevel(logging.DEBUG if debug else logging.INFO)
+
     def get_logger(self):
-        curframe = inspect.currentframe().f_back.f_back
-        logger = logging.getLogger(inspect.getmodule(curframe).__name__)
-        return logger
+        # the logger of the module which called debug(), info(), etc...
+        # cached since they're per module
+        name = sys._getframe(2).f_globals.get("__name__")
+
+        try:
+            return self.loggers[name]
+        except KeyError:
+            logger = self.loggers[name] = logging.getLogger(name)
+            return logger
 
     def build_msg(self, message):
         return " ".join([str(m) for m in message])
 
     def debug(self, *message):
-        self.get_logger().debug(self.build_msg(message))
+        if self.debug_:
+            self.get_logger().debug(self.build_msg(message))
 
     def info(self, *message):
         self.get_logger().info(self.build_msg(message))
@@ -135,3 +185,5 @@ if __name__ == "__main__":  # Used to test colors
     console.warn("This is a", "warning message")
     console.error("This is an", "error message")
     console.critical("This is a", "critical error message")
+
+    console.stop()
@@ -28,6 +28,9 @@ class CustomFormatter(logging.Formatter):
         super().__init__(fmt=fmt, datefmt=datefmt, style=style, validate=validate)
 
     def format(self, record: logging.LogRecord) -> str:
+        # the record is shared by every handler (like the file sink), so the styles go on a copy
+        record = logging.makeLogRecord(record.__dict__)
+
         if record.levelno in self.log_levels:
             level = self.log_levels[record.levelno]
         else:
@@ -0,0 +1,130 @@
+# A flexible and fast Minecraft server software written completely in Python.
+# Copyright (C) 2021 PyMine
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging.handlers
+import logging
+import queue
+import time
+
+__all__ = ("LogQueueHandler", "LogQueueListener")
+
+
+class LogQueueHandler(logging.handlers.QueueHandler):
+    """Puts log records in a bounded queue, so they can be formatted and written on another thread.
+
+    When the queue is full records are dropped instead of blocking the caller, and each logger may
+    only log rate_limit records per second below ERROR, anything past that is dropped too. The
+    amount of dropped records is logged once records can be queued again.
+
+    :param int max_size: The maximum amount of queued records.
+    :param int rate_limit: The maximum amount of records per second per logger, 0 for no limit.
+    :ivar queue.Queue queue: The queue of log records, consumed by a LogQueueListener.
+    :ivar int dropped: The amount of records dropped as the queue was full, since the last report.
+    :ivar dict rate_limited: The amount of records dropped per logger due to the rate limit,
+        like {name: dropped}.
+    """
+
+    def __init__(self, max_size: int = 10000, rate_limit: int = 0) -> None:
+        super().__init__(queue.Queue(max_size))
+
+        self.rate_limit = rate_limit
+
+        self.dropped = 0
+        self.rate_limited = {}  # {logger name: records dropped}
+        self._buckets = {}  # {logger name: [tokens, last refill time]}
+
+    def set_limits(self, max_size: int, rate_limit: int) -> None:
+        self.queue.maxsize = max_size
+        self.rate_limit = rate_limit
+
+    def _allow(self, name: str) -> bool:
+        """Token bucket per logger, refilled with rate_limit tokens per second, up to rate_limit."""
+
+        now = time.monotonic()
+        bucket = self._buckets.get(name)
+
+        if bucket is None:
+            bucket = self._buckets[name] = [self.rate_limit, now]
+        else:
+            bucket[0] = min(self.rate_limit, bucket[0] + (now - bucket[1]) * self.rate_limit)
+            bucket[1] = now
+
+        if bucket[0] < 1:
+            return False
+
+        bucket[0] -= 1
+        return True
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Console's messages are already built strings, so the record is passed as is and formatting
+        # is left to the listener's handlers, only records with args or exc_info are merged here
+        if record.args or record.exc_info:
+            return super().prepare(record)
+
+        return record
+
+    def _report(self, name: str, dropped: int, reason: str) -> None:
+        self.enqueue(
+            logging.makeLogRecord(
+                {
+                    "name": name,
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "msg": f"{dropped} log messages were dropped ({reason}).",
+                }
+            )
+        )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # called with the handler's lock held, so the counters are safe to change here
+        if self.rate_limit > 0 and record.levelno < logging.ERROR:
+            if not self._allow(record.name):
+                self.rate_limited[record.name] = self.rate_limited.get(record.name, 0) + 1
+                return
+
+        try:
+            if self.dropped:
+                self._report("pymine.api.console", self.dropped, "log queue was full")
+                self.dropped = 0
+
+            rate_limited = self.rate_limited.get(record.name)
+
+            if rate_limited:
+                self._report(record.name, rate_limited, "rate limited")
+                del self.rate_limited[record.name]
+
+            self.enqueue(self.prepare(record))
+        except queue.Full:
+            self.dropped += 1
+        except Exception:
+            self.handleError(record)
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.queue.put_nowait(record)
+
+
+class LogQueueListener(logging.handlers.QueueListener):
+    """Formats and writes the records queued by a LogQueueHandler on a background thread."""
+
+    def __init__(self, handler: LogQueueHandler, *handlers: logging.Handler) -> None:
+        super().__init__(handler.queue, *handlers, respect_handler_level=True)
+
+    def add_handler(self, handler: logging.Handler) -> None:
+        self.handlers = (*self.handlers, handler)
+
+    def enqueue_sentinel(self) -> None:
+        # the queue may be full, this waits for the listener to make room
+        self.queue.put(self._sentinel)
@@ -20,6 +20,8 @@ from pymine.api.events import ServerStartEvent, ServerStopEvent, PacketEvent
 from pymine.types.abc import AbstractWorldGenerator, AbstractPlugin
 from pymine.data.states import STATES
 
+PACKET_IDS = 256  # slots per state in the dispatch table, every packet id fits in a byte
+
 
 class Register:
     def __init__(self) -> None:
@@ -30,6 +32,10 @@ class Register:
         # {packet_id: {plugin_quali_name: event_object}}
         self._on_packet = ({}, {}, {}, {})
 
+        # the handlers of every packet as a tuple, or None if there are no handlers for it
+        # flat so it's indexed by state << 8 | packet_id, kept up to date by add_packet_handler()
+        self._dispatch = [None] * (len(self._on_packet) * PACKET_IDS)
+
         # other/generic events, {plugin_quali_name: event_object}
         self._on_server_start = {}
         self._on_server_stop = {}
@@ -56,19 +62,34 @@ class Register:
                 return PacketEvent(func, state_id, packet_id)
 
             # If we're here, this is probably a packet handler under logic/handle, so we need to account for that
-            try:
-                self._on_packet[state_id][packet_id][
-                    f"{func.__module__}.{func.__qualname__}"
-                ] = func
-            except KeyError:
-                self._on_packet[state_id][packet_id] = {
-                    f"{func.__module__}.{func.__qualname__}": func
-                }
+            self.add_packet_handler(
+                state_id, packet_id, f"{func.__module__}.{func.__qualname__}", func
+            )
 
             return func
 
         return deco
 
+    def add_packet_handler(self, state_id: int, packet_id: int, name: str, handler) -> None:
+        """Registers a packet handler and updates its slot in the dispatch table."""
+
+        if not 0 <= packet_id < PACKET_IDS:
+            raise ValueError(f"Invalid packet id: {packet_id}")
+
+        try:
+            self._on_packet[state_id][packet_id][name] = handler
+        except KeyError:
+            self._on_packet[state_id][packet_id] = {name: handler}
+
+        self._dispatch[state_id << 8 | packet_id] = tuple(
+            self._on_packet[state_id][packet_id].values()
+        )
+
+    def get_packet_handlers(self, state_id: int, packet_id: int) -> tuple:
+        """Returns the handlers for a packet, or None if it has none."""
+
+        return self._dispatch[state_id << 8 | packet_id]
+
     def on_server_start(self, func):
         if not asyncio.iscoroutinefunction(func):
             raise ValueError("Decorated object must be a coroutine function.")
@@ -0,0 +1,141 @@
+# A flexible and fast Minecraft server software written completely in Python.
+# Copyright (C) 2021 PyMine
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+
+from pymine.net.packets.play.chunk import PlayChunkData, PlayUpdateLight
+from pymine.types.send_queue import LANE_BULK
+from pymine.types.buffer import Buffer
+from pymine.types.chunk import Chunk
+
+__all__ = ("ChunkFrames",)
+
+
+class ChunkFrames:
+    """Packs the PlayUpdateLight and PlayChunkData frames of a chunk once, for all its receivers.
+
+    The frames are cached on the chunk itself (see Chunk.frames) per compression threshold, and the
+    packed sections they're built from per section (see Chunk.packed_sections/packed_light). After
+    changing blocks or light call chunk.invalidate(section_y), then only that section is packed
+    again. When several players need a chunk while it's being packed, it's still only packed once.
+    A frame the chunk changed under while it was being packed is packed again.
+
+    :param Server server: The server instance.
+    :ivar int hits: How many frames were taken from the cache (or a packing in progress).
+    :ivar int misses: How many frames had to be packed.
+    """
+
+    def __init__(self, server) -> None:
+        self.server = server
+
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        """Returns the hits and misses of the cache, and the ratio of hits."""
+
+        total = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / total if total else 0.0),
+        }
+
+    async def frames(self, chunk: Chunk, comp_thresh: int) -> tuple:
+        """Returns the packed (light frame, chunk data frame) of a chunk for a comp_thresh."""
+
+        return (
+            await self._frame(chunk, "light", PlayUpdateLight(chunk), comp_thresh),
+            await self._frame(chunk, "data", PlayChunkData(chunk, True), comp_thresh),
+        )
+
+    async def send(self, conn, chunk: Chunk) -> None:
+        """Sends the light and then the data of a chunk to a client.
+
+        Their places in the bulk lane are reserved before they're packed, so chunks sent to the
+        client meanwhile can't overtake them.
+        """
+
+        queue = conn.send_queue
+        light, data = queue.reserve(LANE_BULK), queue.reserve(LANE_BULK)
+        frames = (b"", b"")
+
+        try:
+            frames = await self.frames(chunk, conn.comp_thresh)
+        finally:  # left empty if packing failed, else they'd hold up the lane
+            queue.fill(light, frames[0])
+            queue.fill(data, frames[1])
+
+        if queue.pressured:
+            await queue.drain()
+
+    async def _frame(self, chunk: Chunk, kind: str, packet, comp_thresh: int) -> bytes:
+        key = (kind, comp_thresh)
+        frame = chunk.frames.get(key)
+
+        if frame is not None:
+            self.hits += 1
+
+            if isinstance(frame, asyncio.Future):  # being packed for someone else, wait for that
+                return await asyncio.shield(frame)
+
+            return frame
+
+        self.misses += 1
+
+        future = chunk.frames[key] = asyncio.get_event_loop().create_future()
+
+        try:
+            while True:
+                frame = await self.server.pack_frame(
+                    Buffer.pack_varint(packet.id) + packet.encode(), comp_thresh, packet.comp_level
+                )
+
+                current = chunk.frames.get(key)
+
+                if current is future:
+                    chunk.frames[key] = frame
+                    break
+
+                # the chunk changed while the frame was compressed, so the frame is outdated
+                if current is None:  # pack it again, anyone who needs it meanwhile waits for that
+                    self.misses += 1
+                    chunk.frames[key] = future
+                    continue
+
+                # someone who needed it after the change packed it again already, or is doing so
+                if isinstance(current, asyncio.Future):
+                    frame = await asyncio.shield(current)
+                else:
+                    frame = current
+
+                break
+        except BaseException as e:
+            if chunk.frames.get(key) is future:
+                del chunk.frames[key]
+
+            if isinstance(e, asyncio.CancelledError):  # can't be set as the exception of a future
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # mark it as retrieved, else it's logged if nobody waited on it
+
+            raise
+
+        future.set_result(frame)
+
+        return frame
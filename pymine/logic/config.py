@@ -22,6 +22,11 @@ from pymine.util.misc import java_string_hash, gen_seed
 
 DEFAULT_CONFIG = {
     "debug": True,
+    "log_file": None,
+    "log_file_max_bytes": 10485760,
+    "log_file_backups": 5,
+    "log_max_queued": 10000,
+    "log_rate_limit": 1000,
     "server_ip": None,
     "server_port": 25565,
     "level_name": "world",
@@ -31,12 +36,28 @@ DEFAULT_CONFIG = {
     "hardcore": False,
     "max_players": 20,
     "online_mode": True,
+    "session_server": "https://sessionserver.mojang.com",
+    "session_max_concurrent": 16,
+    "session_timeout": 5,
+    "session_retries": 2,
+    "session_cache_ttl": 30,
     "white_list": True,
     "motd": "A Minecraft Server",
     "view_distance": 10,
     "spawn_protection": 16,
     "pvp": True,
     "comp_thresh": 256,
+    "comp_offload_size": 8192,
+    "front_end_workers": 0,
+    "connection_timeout": 30,
+    "keep_alive_interval": 15,
+    "latency_update_interval": 5,
+    "outbound_flush_interval": 0.01,
+    "outbound_high_water": 262144,
+    "outbound_low_water": 65536,
+    "outbound_max_buffered": 8388608,
+    "outbound_player_budget": 65536,
+    "outbound_egress_cap": 0,
     "spawn_npcs": True,
     "spawn_animals": True,
     "spawn_monsters": True,
@@ -0,0 +1,597 @@
+# A flexible and fast Minecraft server software written completely in Python.
+# Copyright (C) 2021 PyMine
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Optional multi-process front end, enabled by setting front_end_workers in server.yml.
+
+Worker processes share the server's port via SO_REUSEPORT, answer server list pings (legacy ones
+too) and complete the login (encryption, session server authentication and compression) themselves.
+Once a client is logged in, its socket is passed to the main process (SCM_RIGHTS) together with
+everything needed to continue the connection, including the state of both AES/CFB8 ciphers.
+
+The main process starts the workers, and each of them gets one end of a socketpair() the other
+end of which the main process keeps, so no other process can hand connections to the main process.
+Messages over these are single SOCK_SEQPACKET packets: a one byte type followed by the body. The
+main process sends MSG_STATUS (the packed status response frame) whenever it changes, workers send
+MSG_HANDOFF (a JSON description of the connection) with the socket attached.
+"""
+
+from cryptography.hazmat.primitives import serialization
+import concurrent.futures
+import multiprocessing
+import logging
+import array
+import asyncio
+import aiohttp
+import socket
+import json
+import uuid
+import os
+
+from pymine.api.errors import InvalidPacketData, InvalidPacketID, StopHandling
+from pymine.net.packets.login.set_comp import LoginSetCompression
+from pymine.net.packets.status.status import StatusStatusPingPong
+from pymine.net.packets.handshaking.handshake import HandshakeHandshake
+import pymine.net.packets.login.login as login_packets
+from pymine.logic.session_auth import SessionAuth
+from pymine.logic.keep_alive import KeepAlive
+from pymine.types.connection import Connection
+from pymine.types.stream import Stream
+import pymine.util.encryption as encryption
+from pymine.net.packet_map import PACKET_MAP
+from pymine.types.packet import Packet
+from pymine.types.buffer import Buffer
+from pymine.types.chat import Chat
+
+__all__ = ("FrontEndHub", "FrontEndWorker", "pack_legacy_status")
+
+MSG_STATUS = b"S"
+MSG_HANDOFF = b"H"
+MAX_MESSAGE = 1 << 20  # the status frame includes the favicon, so this has to be fairly big
+FD_SIZE = array.array("i").itemsize
+MIN_UPTIME = 10  # seconds a worker has to run for before exiting, else it counts as a failed start
+MAX_FAILED_STARTS = 3  # failed starts in a row after which the hub gives up on restarting a worker
+LEGACY_PING_WAIT = 0.1  # seconds to wait for the rest of a legacy ping, old clients only send 0xFE
+
+# the main process has threads, so it can't be forked safely
+SPAWN = multiprocessing.get_context("spawn")
+
+
+async def send_message(sock: socket.socket, data: bytes, fds: list = ()) -> None:
+    """Sends a message over a non-blocking SOCK_SEQPACKET socket, optionally passing fds along."""
+
+    loop = asyncio.get_event_loop()
+
+    while True:
+        try:
+            if fds:
+                sock.sendmsg(
+                    [data], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array("i", fds))]
+                )
+            else:
+                sock.send(data)
+
+            return
+        except BlockingIOError:
+            writable = loop.create_future()
+            loop.add_writer(sock, writable.set_result, None)
+
+            try:
+                await writable
+            finally:
+                loop.remove_writer(sock)
+
+
+async def recv_message(sock: socket.socket) -> tuple:
+    """Receives a message from a non-blocking SOCK_SEQPACKET socket, like (data, fds).
+
+    :raises ConnectionResetError: If the other side closed the socket.
+    """
+
+    loop = asyncio.get_event_loop()
+
+    while True:
+        try:
+            data, ancdata, _, _ = sock.recvmsg(MAX_MESSAGE, socket.CMSG_SPACE(FD_SIZE))
+        except BlockingIOError:
+            readable = loop.create_future()
+            loop.add_reader(sock, readable.set_result, None)
+
+            try:
+                await readable
+            finally:
+                loop.remove_reader(sock)
+
+            continue
+
+        if not data:
+            raise ConnectionResetError
+
+        fds = array.array("i")
+
+        for level, type_, fd_data in ancdata:
+            if level == socket.SOL_SOCKET and type_ == socket.SCM_RIGHTS:
+                fds.frombytes(fd_data[: len(fd_data) - (len(fd_data) % FD_SIZE)])
+
+        return data, list(fds)
+
+
+class FrontEndHub:
+    """Runs in the main process, starts the front end workers and receives logged in connections.
+
+    Workers which exit are started again. When a worker exits within MIN_UPTIME seconds of being
+    started more than MAX_FAILED_STARTS times in a row the hub stops, which stops the server, as
+    nothing would listen on the server's port anymore.
+
+    :param Server server: The server instance, connections are passed to Server.adopt_connection().
+    :param int count: The amount of worker processes to start.
+    :ivar dict conf: The config passed to the workers, with server_ip resolved like Server.addr.
+    :ivar list workers: The sockets of the connected workers.
+    :ivar dict processes: The worker processes, {index: multiprocessing.Process}.
+    :ivar int handoffs: How many connections were received from workers.
+    :ivar int restarts: How many times a worker was started again after exiting.
+    """
+
+    def __init__(self, server, count: int) -> None:
+        self.server = server
+        self.count = count
+
+        # resolved once here, so every worker binds the same address the server itself would
+        self.conf = dict(server.conf)
+
+        if self.conf["server_ip"] is None:
+            self.conf["server_ip"] = socket.gethostbyname(socket.gethostname())
+
+        self.workers = []
+        self.processes = {}
+        self.handoffs = 0
+        self.restarts = 0
+
+        self._status = None
+        self._tasks = []
+        self._stopped = None
+        self._started = {}  # {index: loop time the worker was started at}
+        self._failed_starts = {}  # {index: amount of failed starts in a row}
+
+    async def start(self) -> None:
+        self._stopped = asyncio.get_event_loop().create_future()
+
+        for index in range(self.count):
+            self._spawn(index)
+
+        self._tasks.append(asyncio.create_task(self._push_status()))
+
+    async def serve_forever(self) -> None:
+        await self._stopped
+
+    def stop(self) -> None:
+        loop = asyncio.get_event_loop()
+
+        for task in self._tasks:
+            task.cancel()
+
+        for sock in self.workers:
+            sock.close()
+
+        for process in self.processes.values():
+            loop.remove_reader(process.sentinel)
+            process.terminate()
+
+        for process in self.processes.values():
+            process.join(1)
+
+        self.processes.clear()
+
+        if self._stopped is not None and not self._stopped.done():
+            self._stopped.set_result(None)
+
+    def add_worker(self, sock: socket.socket) -> None:
+        """Starts handling messages from a worker, sock is the hub's end of its socketpair()."""
+
+        sock.setblocking(False)
+
+        self.workers.append(sock)
+        self._tasks.append(asyncio.create_task(self._handle_worker(sock)))
+
+    def _spawn(self, index: int) -> None:
+        loop = asyncio.get_event_loop()
+        hub_sock, worker_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+
+        # the socket is passed to the new process as it's started, this process doesn't need it
+        process = SPAWN.Process(
+            target=run_worker, args=(index, self.conf, worker_sock), daemon=True
+        )
+        process.start()
+        worker_sock.close()
+
+        self.processes[index] = process
+        self._started[index] = loop.time()
+        self.add_worker(hub_sock)
+
+        # the sentinel becomes readable once the process exits
+        loop.add_reader(process.sentinel, self._worker_exited, index)
+
+    def _worker_exited(self, index: int) -> None:
+        loop = asyncio.get_event_loop()
+        process = self.processes[index]
+
+        loop.remove_reader(process.sentinel)
+        process.join()
+
+        if loop.time() - self._started[index] < MIN_UPTIME:
+            self._failed_starts[index] = self._failed_starts.get(index, 0) + 1
+        else:
+            self._failed_starts[index] = 0
+
+        if self._failed_starts[index] > MAX_FAILED_STARTS:
+            self.server.console.error(
+                f"Front end worker {index} keeps exiting (exit code {process.exitcode}), "
+                "stopping..."
+            )
+            self.stop()
+            return
+
+        self.server.console.error(
+            f"Front end worker {index} exited with exit code {process.exitcode}, restarting it..."
+        )
+
+        self.restarts += 1
+        self._spawn(index)
+
+    async def _push_status(self) -> None:
+        """Sends the status frame to the workers whenever the status cache built a new one."""
+
+        while True:
+            frame = self.server.status_cache.frame()
+
+            if frame is not self._status:
+                self._status = frame
+
+                await asyncio.gather(
+                    *[send_message(sock, MSG_STATUS + frame) for sock in self.workers],
+                    return_exceptions=True,
+                )
+
+            await asyncio.sleep(1)
+
+    async def _handle_worker(self, sock: socket.socket) -> None:
+        if self._status is not None:
+            await send_message(sock, MSG_STATUS + self._status)
+
+        try:
+            while True:
+                data, fds = await recv_message(sock)
+
+                if data[:1] != MSG_HANDOFF or len(fds) != 1:
+                    for fd in fds:
+                        os.close(fd)
+
+                    continue
+
+                self.handoffs += 1
+                asyncio.create_task(self.server.adopt_connection(json.loads(data[1:]), fds[0]))
+        except (ConnectionResetError, OSError):
+            pass
+        finally:
+            self.workers.remove(sock)
+            sock.close()
+
+
+def pack_legacy_status(status: dict, beta: bool = False) -> bytes:
+    """Packs the kick packet legacy server list pings (pre 1.7 clients) are answered with.
+
+    :param dict status: The data of a StatusStatusResponse.
+    :param bool beta: Whether the format of clients from before 1.4 should be used.
+    """
+
+    motd = Chat(status["description"]).to_string("plain")
+    players = status["players"]
+
+    if beta:  # those can't show formatting or a version, and § is the separator
+        text = f"{motd.replace('§', '')}§{players['online']}§{players['max']}"
+    else:
+        fields = (
+            status["version"]["protocol"],
+            status["version"]["name"],
+            motd,
+            players["online"],
+            players["max"],
+        )
+        text = "§1\x00" + "\x00".join(map(str, fields))
+
+    data = text.encode("utf-16-be")
+
+    return b"\xFF" + Buffer.pack("H", len(data) // 2) + data
+
+
+class FrontEndWorker:
+    """Runs in a worker process, answers server list pings and handles logins until they're done.
+
+    Only what's needed for that is set up here, which is also what SessionAuth needs from the
+    server.
+
+    :param int index: The index of the worker, used for logging.
+    :param dict conf: The contents of server.yml.
+    :param socket.socket hub: The worker's end of the socketpair() to the main process.
+    :ivar int pings: How many status pings were answered, legacy ones included.
+    :ivar int logins: How many logged in connections were passed to the main process.
+    """
+
+    def __init__(self, index: int, conf: dict, hub: socket.socket) -> None:
+        self.conf = conf
+
+        self.console = WorkerConsole(index)
+        self.secrets = type("Secrets", (), {})()
+        self.secrets.rsa_private, self.secrets.rsa_public = encryption.gen_rsa_keys()
+        self.public_key = self.secrets.rsa_public.public_bytes(
+            encoding=serialization.Encoding.DER,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+
+        self.thread_executor = concurrent.futures.ThreadPoolExecutor()
+        self.aiohttp = None
+        self.session_auth = SessionAuth(self)
+        # only times out connections, none of them reach the play state
+        self.keep_alive = KeepAlive(self)
+
+        self.pings = 0
+        self.logins = 0
+
+        self.server = None  # the asyncio server listening on the shared port
+
+        self._status = None
+        self._legacy_status = None  # the status data, for legacy pings
+        self._hub = hub
+
+    async def start(self) -> None:
+        self.aiohttp = aiohttp.ClientSession()
+        self._hub.setblocking(False)
+        self.keep_alive.start()
+
+        self.server = await asyncio.start_server(
+            self.handle_connection,
+            host=self.conf["server_ip"],
+            port=self.conf["server_port"],
+            reuse_port=True,
+        )
+
+        try:
+            await self._recv_status()  # returns once the main process is gone
+        finally:
+            self.server.close()
+            self.keep_alive.stop()
+            await self.aiohttp.close()
+
+    async def _recv_status(self) -> None:
+        try:
+            while True:
+                data, fds = await recv_message(self._hub)
+
+                for fd in fds:
+                    os.close(fd)
+
+                if data[:1] == MSG_STATUS:
+                    self._status = data[1:]
+                    self._legacy_status = self._unpack_status(self._status)
+        except ConnectionResetError:
+            pass
+
+    def _unpack_status(self, frame: bytes) -> dict:
+        try:
+            buf = Buffer(frame)
+            buf.unpack_varint()  # the frame's length
+            buf.unpack_varint()  # the packet id
+
+            return buf.unpack_json()
+        except BaseException as e:
+            self.console.error(f"Couldn't read the status for legacy pings: {e!r}")
+
+    async def handle_connection(self, reader, writer) -> None:
+        conn = Connection(Stream(reader, writer))
+        self.keep_alive.track(conn)
+
+        stream = conn.stream
+
+        try:
+            # legacy server list pings can only be the first thing sent by a client
+            if await stream.peek(1) == b"\xFE":
+                await self.handle_legacy_status(stream)
+                raise StopHandling
+
+            handshake = await self.read_packet(stream, 0)
+
+            if not isinstance(handshake, HandshakeHandshake):
+                raise StopHandling
+
+            if handshake.next_state == 1:
+                await self.handle_status(stream)
+            elif handshake.next_state == 2:
+                logged_in = await self.handle_login(conn)
+
+                if logged_in is not None:
+                    await self.handoff(*logged_in)
+                    return
+        except (StopHandling, InvalidPacketData, InvalidPacketID, asyncio.IncompleteReadError):
+            pass
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        except BaseException as e:
+            self.console.error(f"Error while handling a connection: {e!r}")
+
+        conn.stream.close()
+
+    async def read_packet(self, stream: Stream, state: int, comp_thresh: int = -1) -> Packet:
+        return Buffer(await stream.read_frame()).unpack_packet(state, PACKET_MAP, comp_thresh)
+
+    async def handle_status(self, stream: Stream) -> None:
+        await self.read_packet(stream, 1)  # StatusStatusRequest
+
+        if self._status is None:  # main process hasn't sent the status yet
+            raise StopHandling
+
+        stream.write(self._status)
+
+        ping = await self.read_packet(stream, 1)
+
+        if isinstance(ping, StatusStatusPingPong):
+            stream.write(Buffer.pack_packet(ping))
+            await stream.drain()
+
+        self.pings += 1
+
+    async def handle_legacy_status(self, stream: Stream) -> None:
+        """Answers a server list ping of a pre 1.7 client, which is closed afterwards."""
+
+        if self._legacy_status is None:  # main process hasn't sent the status yet
+            return
+
+        # 1.4+ clients follow the 0xFE with a 0x01, older ones only send the 0xFE
+        try:
+            await asyncio.wait_for(stream.peek(2), LEGACY_PING_WAIT)
+        except asyncio.TimeoutError:
+            pass
+
+        stream.write(pack_legacy_status(self._legacy_status, stream.read_buf[1:2] != b"\x01"))
+        await stream.drain()
+
+        self.pings += 1
+
+    async def handle_login(self, conn: Connection) -> tuple:
+        """Logs the client in, returns (stream, handoff message) or None if the login failed."""
+
+        stream = conn.stream
+        login_start = await self.read_packet(stream, 2)
+        shared_key = None
+
+        if self.conf["online_mode"]:
+            request = login_packets.LoginEncryptionRequest(self.public_key)
+            stream.write(Buffer.pack_packet(request))
+
+            response = await self.read_packet(stream, 2)
+            verify_token, shared_key = await self.session_auth.decrypt(
+                response.verify_token, response.shared_key
+            )
+
+            profile = None
+
+            if verify_token == request.verify_token:
+                profile = await self.session_auth.has_joined(
+                    login_start.username, encryption.gen_verify_hash(shared_key, self.public_key)
+                )
+
+            if profile is None:
+                stream.write(
+                    Buffer.pack_packet(
+                        login_packets.LoginDisconnect("Failed to authenticate your connection.")
+                    )
+                )
+                await stream.drain()
+                return None
+
+            conn.enable_encryption(encryption.gen_aes_cipher(shared_key))
+            stream = conn.stream
+            uuid_, username, props = (
+                uuid.UUID(profile["id"]),
+                profile["name"],
+                profile["properties"],
+            )
+        else:
+            # This should be only generated if the player name isn't found in the world data,
+            # but no way to do that rn
+            uuid_, username, props = uuid.uuid4(), login_start.username, []
+
+        comp_thresh = -1
+
+        if self.conf["comp_thresh"] > 0:
+            stream.write(Buffer.pack_packet(LoginSetCompression(self.conf["comp_thresh"])))
+            comp_thresh = self.conf["comp_thresh"]
+
+        # the socket is about to be passed on, so the LoginSuccess packet has to be sent completely,
+        # and anything sent by the client from here on has to be left for the main process to read
+        stream.transport.set_write_buffer_limits(0)
+        stream.write(Buffer.pack_packet(login_packets.LoginSuccess(uuid_, username), comp_thresh))
+        stream.transport.pause_reading()
+        await stream.drain()
+
+        # data the StreamReader already received, but nothing read yet
+        stream._buffer(bytes(stream._reader._buffer))
+        stream._reader._buffer.clear()
+
+        message = {
+            "uuid": str(uuid_),
+            "username": username,
+            "props": props,
+            "comp_thresh": comp_thresh,
+            "read_buf": stream.read_buf.hex(),
+            "shared_key": None,
+        }
+
+        if shared_key is not None:
+            encrypt_iv, decrypt_iv = stream.cipher_state()
+
+            message["shared_key"] = shared_key.hex()
+            message["encrypt_iv"] = encrypt_iv.hex()
+            message["decrypt_iv"] = decrypt_iv.hex()
+
+        return stream, message
+
+    async def handoff(self, stream: Stream, message: dict) -> None:
+        """Passes the socket and state of a logged in connection to the main process."""
+
+        fd = stream.transport.get_extra_info("socket").fileno()
+
+        try:
+            await send_message(self._hub, MSG_HANDOFF + json.dumps(message).encode("utf8"), [fd])
+        finally:
+            # the main process has its own copy of the socket, closing this one doesn't end the
+            # connection
+            stream.close()
+
+        self.logins += 1
+
+
+class WorkerConsole:
+    """The subset of Console used in worker processes, which don't have a terminal of their own."""
+
+    def __init__(self, index: int) -> None:
+        self.logger = logging.getLogger(f"pymine.logic.front_end.worker{index}")
+
+    def debug(self, *message) -> None:
+        self.logger.debug(" ".join(map(str, message)))
+
+    def info(self, *message) -> None:
+        self.logger.info(" ".join(map(str, message)))
+
+    def warn(self, *message) -> None:
+        self.logger.warning(" ".join(map(str, message)))
+
+    def error(self, *message) -> None:
+        self.logger.error(" ".join(map(str, message)))
+
+
+def run_worker(index: int, conf: dict, hub: socket.socket) -> None:
+    """The entry point of a worker process."""
+
+    logging.basicConfig(
+        format="[{asctime} {levelname}:'{name}']: {message}",
+        datefmt="%Y-%m-%d %H:%M:%S",
+        style="{",
+        level=logging.DEBUG if conf["debug"] else logging.INFO,
+    )
+
+    try:
+        asyncio.run(FrontEndWorker(index, conf, hub).start())
+    except KeyboardInterrupt:
+        pass
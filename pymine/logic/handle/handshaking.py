@@ -14,11 +14,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from pymine.types.stream import Stream
+from pymine.types.connection import Connection
 from pymine.types.packet import Packet
 from pymine.server import server
 
 
 @server.api.register.on_packet("handshaking", 0x00)
-async def handshake(stream: Stream, packet: Packet) -> None:
-    server.cache.states[stream.remote] = packet.next_state
+async def handshake(conn: Connection, packet: Packet) -> None:
+    conn.state = packet.next_state
@@ -14,14 +14,13 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from cryptography.hazmat.primitives.asymmetric.padding import PKCS1v15
 from cryptography.hazmat.primitives.asymmetric import rsa
 from cryptography.hazmat.primitives import serialization
 import aiohttp
 import uuid
 
 from pymine.net.packets.login.set_comp import LoginSetCompression
-from pymine.types.stream import EncryptedStream, Stream
+from pymine.types.connection import Connection
 import pymine.net.packets.login.login as login_packets
 from pymine.api.errors import StopHandling
 import pymine.util.encryption as encryption
@@ -32,9 +31,9 @@ from pymine.server import server
 
 
 @server.api.register.on_packet("login", 0x00)
-async def login_start(stream: Stream, packet: Packet) -> None:
+async def login_start(conn: Connection, packet: Packet) -> None:
     if server.conf["online_mode"]:  # Online mode is enabled, so we request encryption
-        lc = server.cache.login[stream.remote] = {"username": packet.username, "verify": None}
+        conn.username = packet.username
 
         packet = login_packets.LoginEncryptionRequest(
             server.secrets.rsa_public.public_bytes(
@@ -43,33 +42,32 @@ async def login_start(stream: Stream, packet: Packet) -> None:
             )
         )
 
-        lc["verify"] = packet.verify_token
+        conn.verify_token = packet.verify_token
 
-        await server.send_packet(stream, packet, -1)
+        await server.send_packet(conn, packet, -1)
     else:  # No need for encryption since online mode is off, just send login success
         if server.comp_thresh > 0:  # Send set compression packet if needed
-            await server.send_packet(stream, LoginSetCompression(server.comp_thresh), -1)
+            await server.send_packet(conn, LoginSetCompression(server.comp_thresh), -1)
+            conn.enable_compression(server.comp_thresh)
 
         # This should be only generated if the player name isn't found in the world data, but no way to do that rn
         uuid_ = uuid.uuid4()
 
-        await server.send_packet(stream, login_packets.LoginSuccess(uuid_, packet.username))
+        await server.send_packet(conn, login_packets.LoginSuccess(uuid_, packet.username))
 
-        server.cache.states[stream.remote] = 3  # Update state to play
-        await join(stream, uuid_, packet.username, [])
+        conn.state = 3  # Update state to play
+        await join(conn, uuid_, packet.username, [])
 
 
 @server.api.register.on_packet("login", 0x01)
-async def encrypted_login(stream: Stream, packet: Packet) -> Stream:
-    shared_key, auth, props = await server_auth(
-        packet, stream.remote, server.cache.login[stream.remote]
-    )
+async def encrypted_login(conn: Connection, packet: Packet) -> None:
+    shared_key, auth, props = await server_auth(packet, conn)
 
-    del server.cache.login[stream.remote]  # No longer needed
+    conn.login_done()  # No longer needed
 
     if not auth:  # If authentication failed, disconnect client
         await server.send_packet(
-            stream, login_packets.LoginDisconnect("Failed to authenticate your connection.")
+            conn, login_packets.LoginDisconnect("Failed to authenticate your connection.")
         )
         raise StopHandling
 
@@ -77,44 +75,38 @@ async def encrypted_login(stream: Stream, packet: Packet) -> Stream:
     cipher = encryption.gen_aes_cipher(shared_key)
 
     # Replace stream with one which auto decrypts + encrypts data when reading/writing
-    stream = EncryptedStream(stream, cipher)
+    conn.enable_encryption(cipher)
 
     if server.comp_thresh > 0:  # Send set compression packet if needed
-        await server.send_packet(stream, LoginSetCompression(server.comp_thresh), -1)
+        await server.send_packet(conn, LoginSetCompression(server.comp_thresh), -1)
+        conn.enable_compression(server.comp_thresh)
 
     # Send LoginSuccess packet, tells client they've logged in succesfully
-    await server.send_packet(stream, login_packets.LoginSuccess(*auth))
-
-    server.cache.states[stream.remote] = 3  # Update state to play
-    await join(stream, *auth, props)
+    await server.send_packet(conn, login_packets.LoginSuccess(*auth))
 
-    return stream
+    conn.state = 3  # Update state to play
+    await join(conn, *auth, props)
 
 
 # Verifies that the shared key and token are the same, and does other authentication methods
 # Returns the decrypted shared key and the client's username and uuid
-async def server_auth(
-    packet: login_packets.LoginEncryptionResponse, remote: tuple, cache: dict
-) -> tuple:
-    if server.secrets.rsa_private.decrypt(packet.verify_token, PKCS1v15()) == cache["verify"]:
-        decrypted_shared_key = server.secrets.rsa_private.decrypt(packet.shared_key, PKCS1v15())
-
-        resp = await server.aiohttp.get(
-            "https://sessionserver.mojang.com/session/minecraft/hasJoined",
-            params={
-                "username": cache["username"],
-                "serverId": encryption.gen_verify_hash(
-                    decrypted_shared_key,
-                    server.secrets.rsa_public.public_bytes(
-                        encoding=serialization.Encoding.DER,
-                        format=serialization.PublicFormat.SubjectPublicKeyInfo,
-                    ),
+async def server_auth(packet: login_packets.LoginEncryptionResponse, conn: Connection) -> tuple:
+    verify_token, decrypted_shared_key = await server.session_auth.decrypt(
+        packet.verify_token, packet.shared_key
+    )
+
+    if verify_token == conn.verify_token:
+        jj = await server.session_auth.has_joined(
+            conn.username,
+            encryption.gen_verify_hash(
+                decrypted_shared_key,
+                server.secrets.rsa_public.public_bytes(
+                    encoding=serialization.Encoding.DER,
+                    format=serialization.PublicFormat.SubjectPublicKeyInfo,
                 ),
-            },
+            ),
         )
 
-        jj = await resp.json()
-
         if jj is not None:
             return decrypted_shared_key, (uuid.UUID(jj["id"]), jj["name"]), jj["properties"]
 
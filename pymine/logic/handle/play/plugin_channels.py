@@ -14,12 +14,12 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from pymine.types.stream import Stream
+from pymine.types.connection import Connection
 from pymine.types.packet import Packet
 from pymine.server import server
 
 
 @server.api.register.on_packet("play", 0x0B)
-async def plugin_message_recv(stream: Stream, packet: Packet) -> None:
+async def plugin_message_recv(conn: Connection, packet: Packet) -> None:
     if packet.channel == "minecraft:brand":
-        server.cache.uuid[stream.remote].brand = packet.data.unpack_string()
+        conn.player.brand = packet.data.unpack_string()
@@ -14,15 +14,15 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from pymine.types.stream import Stream
+from pymine.types.connection import Connection
 from pymine.types.packet import Packet
 from pymine.logic.join import join_2
 from pymine.server import server
 
 
 @server.api.register.on_packet("play", 0x05)
-async def client_settings_recv(stream: Stream, packet: Packet) -> None:
-    player = await server.playerio.fetch_player(server.cache.uuid[stream.remote])
+async def client_settings_recv(conn: Connection, packet: Packet) -> None:
+    player = conn.player
 
     player.locale = packet.locale
     player.view_distance = packet.view_distance
@@ -31,4 +31,4 @@ async def client_settings_recv(stream: Stream, packet: Packet) -> None:
     player.displayed_skin_parts = packet.displayed_skin_parts
     player.main_hand = packet.main_hand
 
-    # await join_2(stream, player)
+    # await join_2(conn, player)
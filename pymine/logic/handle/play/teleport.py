@@ -15,18 +15,21 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from pymine.net.packets.play.player import PlayDisconnect
-from pymine.types.stream import Stream
+from pymine.types.connection import Connection
 from pymine.types.packet import Packet
 from pymine.server import server
 
 
 @server.api.register.on_packet("play", 0x00)
-async def on_teleport_confirm(stream: Stream, packet: Packet) -> None:
-    player = await server.playerio.fetch_player(server.cache.uuid[stream.remote])
+async def on_teleport_confirm(conn: Connection, packet: Packet) -> None:
+    player = conn.player
 
     if player.teleport_id != packet.teleport_id:
         # await server.send_packet(
-        #     stream, PlayDisconnect(f"Invalid teleport ID ({repr(player.teleport_id)} != {repr(packet.teleport_id)}).")
+        #     conn,
+        #     PlayDisconnect(
+        #         f"Invalid teleport ID ({repr(player.teleport_id)} != {repr(packet.teleport_id)})."
+        #     ),
         # )
 
         server.console.debug(
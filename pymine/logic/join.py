@@ -14,116 +14,114 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import asyncio
 import random
 import uuid
 import time
 
-from pymine.data.default_nbt.dimension_codec import get_dimension_data, new_dim_codec_nbt
 from pymine.types.bitfield import BitField
 from pymine.data.recipes import RECIPES
 from pymine.util.misc import seed_hash
-from pymine.types.stream import Stream
+from pymine.types.connection import Connection
 from pymine.types.player import Player
 from pymine.types.packet import Packet
-from pymine.types.buffer import Buffer
 from pymine.util.spiral import spiral
 from pymine.types.world import World
 from pymine.types.chat import Chat
 import pymine.net.packets as packets
-from pymine.data.tags import TAGS
 from pymine.server import server
 import pymine.types.nbt as nbt
 
 
 # Used to finish the process of allowing a client to actually enter the server
-async def join(stream: Stream, uuid_: uuid.UUID, username: str, props: list) -> None:
-    server.cache.uuid[stream.remote] = int(uuid_)  # update uuid cache
-
+async def join(conn: Connection, uuid_: uuid.UUID, username: str, props: list) -> None:
     player = await server.playerio.fetch_player(uuid_)  # fetch player data from disk
     player.props = props
-    player.stream = stream
+    player.conn = conn
     player.username = username
 
+    conn.player = player
+    conn.login_done()
+
+    # player sample + online count changed
+    server.status_cache.invalidate()
+
+    if server.query_server is not None:
+        server.query_server.invalidate()
+
     world = server.worlds[player["Dimension"].data]  # the world player *should* be spawning into
 
-    await send_join_game_packet(stream, world, player)
+    await send_join_game_packet(conn, world, player)
 
     # send server brand via plugin channels
-    await server.send_packet(
-        stream,
-        packets.play.plugin_msg.PlayPluginMessageClientBound(
-            "minecraft:brand", Buffer.pack_string(server.meta.pymine)
-        ),
-    )
+    await server.send_raw(conn, server.join_frames.frames(conn.comp_thresh)["brand"])
 
     # sends info about the server difficulty
     await server.send_packet(
-        stream,
+        conn,
         packets.play.difficulty.PlayServerDifficulty(
             world["Difficulty"].data, world["DifficultyLocked"].data
         ),
     )
 
-    await send_player_abilities(stream, player)
+    await send_player_abilities(conn, player)
 
-    await join_2(stream, player)
+    await join_2(conn, player)
 
 
-async def join_2(stream: Stream, player: Player) -> None:
+async def join_2(conn: Connection, player: Player) -> None:
     world = server.worlds[player["Dimension"].data]  # the world player *should* be spawning into
 
     # change held item to saved last held item
     await server.send_packet(
-        stream, packets.play.item.PlayHeldItemChangeClientBound(player["SelectedItemSlot"].data)
+        conn, packets.play.item.PlayHeldItemChangeClientBound(player["SelectedItemSlot"].data)
     )
 
     # send/declare recipes
-    # await server.send_packet(stream, packets.play.crafting.PlayDeclareRecipes(RECIPES))
+    # await server.send_packet(conn, packets.play.crafting.PlayDeclareRecipes(RECIPES))
 
     # send tags (data about the different blocks and items)
-    await server.send_packet(stream, packets.play.tags.PlayTags(TAGS))
+    await server.send_raw(conn, server.join_frames.frames(conn.comp_thresh)["tags"])
 
     # send entity status packet, apparently this is required, for now it'll just set player to op lvl 4 (value 28)
-    await server.send_packet(stream, packets.play.entity.PlayEntityStatus(player.entity_id, 28))
+    await server.send_packet(conn, packets.play.entity.PlayEntityStatus(player.entity_id, 28))
 
     # tell the client the commands, just send empty list for now
-    await send_command_nodes(stream)
+    await send_command_nodes(conn)
 
     # send unlocked recipes to the client
-    await send_unlocked_recipes(stream, player)
+    await send_unlocked_recipes(conn, player)
 
     # send player position and look
-    await send_positional_data(stream, world, player, only_ppos=True)
+    await send_positional_data(conn, world, player, only_ppos=True)
 
     # update tab list, maybe sent to all clients?
     await broadcast_player_info(player)
 
     # see here: https://wiki.vg/Protocol#Update_View_Position
     await server.send_packet(
-        stream, packets.play.player.PlayUpdateViewPosition(player.x // 32, player.z // 32)
+        conn, packets.play.player.PlayUpdateViewPosition(player.x // 32, player.z // 32)
     )
 
-    await send_world_info(stream, world, player)
+    await send_world_info(conn, world, player)
 
-    await send_positional_data(stream, world, player)
+    await send_positional_data(conn, world, player)
 
 
 # crucial info pertaining to the world and player status
-async def send_join_game_packet(stream: Stream, world: World, player: Player) -> None:
+async def send_join_game_packet(conn: Connection, world: World, player: Player) -> None:
     level_name = server.conf["level_name"]  # level name, i.e. Xenon
 
     await server.send_packet(
-        stream,
+        conn,
         packets.play.player.PlayJoinGame(
             player.entity_id,
             server.conf["hardcore"],  # whether world is hardcore or not
             player["playerGameType"].data,  # gamemode
             player["previousPlayerGameType"].data,  # previous gamemode
             [level_name, f"{level_name}_nether", f"{level_name}_the_end"],  # world names
-            new_dim_codec_nbt(),  # Shouldn't change unless CUSTOM DIMENSIONS are added fml
+            server.join_frames.dim_codec,  # Shouldn't change unless CUSTOM DIMENSIONS are added fml
             # This is like the the dimension data for the dim the player is currently spawning into
-            get_dimension_data(
+            server.join_frames.dimension(
                 player["Dimension"].data
             ),  # player['Dimension'] should be like minecraft:overworld
             server.conf["level_name"],  # level name of the world the player is spawning into
@@ -141,7 +139,7 @@ async def send_join_game_packet(stream: Stream, world: World, player: Player) ->
 
 
 # send what the player can/can't do
-async def send_player_abilities(stream: Stream, player: Player) -> None:
+async def send_player_abilities(conn: Connection, player: Player) -> None:
     abilities = player["abilities"]
     flags = BitField.new(4)
 
@@ -151,33 +149,21 @@ async def send_player_abilities(stream: Stream, player: Player) -> None:
     flags.set(0x08, abilities["instabuild"].data)
 
     await server.send_packet(  # yes the last arg is supposed to be fov, but the values are actually the same
-        stream,
+        conn,
         packets.play.player.PlayPlayerAbilitiesClientBound(
             flags.field, abilities["flySpeed"].data, abilities["walkSpeed"].data
         ),
     )
 
 
-async def send_command_nodes(stream: Stream) -> None:
-    flags = BitField.new(4)
-
-    flags.set(0x00, True)
-    flags.set(0x01, False)
-    flags.set(0x02, False)
-    flags.set(0x03, False)
-    flags.set(0x04, False)
-    flags.set(0x08, False)
-    flags.set(0x10, False)
-
-    await server.send_packet(
-        stream, packets.play.command.PlayDeclareCommands([{"flags": flags.field, "children": []}])
-    )
+async def send_command_nodes(conn: Connection) -> None:
+    await server.send_raw(conn, server.join_frames.frames(conn.comp_thresh)["commands"])
 
 
 # sends the previously unlocked + unviewed unlocked recipies to the client
-async def send_unlocked_recipes(stream: Stream, player: Player) -> None:
+async def send_unlocked_recipes(conn: Connection, player: Player) -> None:
     await server.send_packet(
-        stream,
+        conn,
         packets.play.crafting.PlayUnlockRecipes(
             0,  # init
             player["recipeBook"]["isGuiOpen"].data,  # refers to the regular crafting bench/table
@@ -215,7 +201,7 @@ async def broadcast_player_info(player: Player) -> None:
                     "name": player.username,
                     "properties": player.props,
                     "gamemode": player["playerGameType"].data,
-                    "ping": 0,
+                    "ping": player.conn.latency,
                     "display_name": Chat(display_name),
                 }
             ],
@@ -226,23 +212,23 @@ async def broadcast_player_info(player: Player) -> None:
     await server.broadcast_packet(
         packets.play.player.PlayPlayerInfo(
             2,  # the action, update latency
-            [{"uuid": player.uuid, "ping": 0}],
+            [{"uuid": player.uuid, "ping": player.conn.latency}],
         )
     )
 
 
 # updates client view distance, unsure if needed, see here: https://wiki.vg/Protocol#Update_View_Distance
-async def send_update_view_distance(stream: Stream, player: Player) -> None:
+async def send_update_view_distance(conn: Connection, player: Player) -> None:
     view_distance = player.view_distance
 
     if view_distance > server.conf["view_distance"]:
         view_distance = server.conf["view_distance"]
 
-    await server.send_packet(stream, packets.play.player.PlayUpdateViewDistance(view_distance))
+    await server.send_packet(conn, packets.play.player.PlayUpdateViewDistance(view_distance))
 
 
 # sends information about the world to the client, like chunk data and other stuff
-async def send_world_info(stream: Stream, world: World, player: Player) -> None:
+async def send_world_info(conn: Connection, world: World, player: Player) -> None:
     view_distance = server.conf["view_distance"] + 1
     chunks = (
         {}
@@ -252,24 +238,16 @@ async def send_world_info(stream: Stream, world: World, player: Player) -> None:
         for z in range(-view_distance, view_distance):
             chunks[x, z] = await world.fetch_chunk(x, z)
 
-    # for chunk in chunks.values():  # send update light packet for each chunk in the player's view distance
-    #     await server.send_packet(stream, packets.play.chunk.PlayUpdateLight(chunk))
-
-    loop = asyncio.get_event_loop()
-
-    for (
-        chunk
-    ) in chunks.values():  # send chunk data packet for every chunk in server render distance
-        packet = await loop.run_in_executor(
-            server.thread_executor, packets.play.chunk.PlayChunkData, chunk, True
-        )
-        asyncio.create_task(server.send_packet(stream, packet))
+    # send the light and then the data of every chunk in server render distance, each chunk is
+    # only packed once for all players (see ChunkFrames) until its blocks or light change
+    for chunk in chunks.values():
+        await server.chunk_frames.send(conn, chunk)
 
     del chunks  # no longer needed so free the memoryyyy
 
     # send the world border data to the client
     await server.send_packet(
-        stream,
+        conn,
         packets.play.world.PlayWorldBorder(
             3,
             {
@@ -288,11 +266,11 @@ async def send_world_info(stream: Stream, world: World, player: Player) -> None:
 
 # update the player's position and rotation, as well as the world spawn
 async def send_positional_data(
-    stream: Stream, world: World, player: Player, only_ppos: bool = False
+    conn: Connection, world: World, player: Player, only_ppos: bool = False
 ) -> None:
     if not only_ppos:
         await server.send_packet(
-            stream,
+            conn,
             packets.play.spawn.PlaySpawnPosition(
                 world["SpawnX"].data, world["SpawnY"].data, world["SpawnZ"].data
             ),
@@ -305,7 +283,7 @@ async def send_positional_data(
     player.teleport_id = random.randint(0, 999999)
 
     await server.send_packet(
-        stream,
+        conn,
         packets.play.player.PlayPlayerPositionAndLookClientBound(
             player, flags.field, player.teleport_id  # the tp id, should be verified later
         ),
@@ -0,0 +1,123 @@
+# A flexible and fast Minecraft server software written completely in Python.
+# Copyright (C) 2021 PyMine
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from pymine.data.default_nbt.dimension_codec import DEFAULT_DIM_CODEC_NBT, get_dimension_data
+from pymine.net.packets.play.plugin_msg import PlayPluginMessageClientBound
+from pymine.net.packets.play.command import PlayDeclareCommands
+from pymine.net.packets.play.tags import PlayTags
+from pymine.types.bitfield import BitField
+from pymine.types.buffer import Buffer
+import pymine.data.tags as tags_data
+
+__all__ = ("JoinFrames",)
+
+
+class JoinFrames:
+    """Packets and NBT sent to every joining player which are the same for everyone, encoded once.
+
+    Everything is built again the next time it's used after invalidate() was called, which
+    PyMineAPI.update_join_data() does, or after the server brand was changed. The server rebuilds
+    everything once the plugins are loaded, as they may have changed what these are built from.
+
+    :param Server server: The server instance.
+    :ivar bytes dim_codec: The packed dimension codec NBT, see PlayJoinGame.
+    :ivar dict packets: The encoded data (packet id + encoded packet) of each static packet,
+        {name: data}.
+    """
+
+    def __init__(self, server) -> None:
+        self.server = server
+
+        self.packets = None
+
+        self._dim_codec = None
+        self._dimensions = None  # {dimension: packed dimension type NBT}
+        self._levels = None  # {name: compression level}
+        self._frames = None  # {comp_thresh: {name: packed frame}}
+        self._brand = None  # the server brand the brand packet was built with
+        self._stale = False
+
+        self.rebuild()
+
+    @property
+    def dim_codec(self) -> bytes:
+        self._check()
+        return self._dim_codec
+
+    def invalidate(self) -> None:
+        """Marks everything as outdated, so it's rebuilt the next time it's used."""
+
+        self._stale = True
+
+    def _check(self) -> None:
+        if self._stale or self._brand != self.server.meta.pymine:
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        """Re-encodes everything, and packs the frames for the server's compression threshold."""
+
+        self._dim_codec = Buffer.pack_nbt(DEFAULT_DIM_CODEC_NBT)
+        self._dimensions = {}
+        self._brand = self.server.meta.pymine
+        self._stale = False
+
+        command_flags = BitField.new(4)  # the root node, there aren't any commands yet
+        command_flags.set(0x00, True)
+        command_flags.set(0x01, False)
+        command_flags.set(0x02, False)
+        command_flags.set(0x03, False)
+        command_flags.set(0x04, False)
+        command_flags.set(0x08, False)
+        command_flags.set(0x10, False)
+
+        static = {
+            "brand": PlayPluginMessageClientBound(
+                "minecraft:brand", Buffer.pack_string(self._brand)
+            ),
+            "tags": PlayTags(tags_data.TAGS),  # looked up here as it may have been replaced
+            "commands": PlayDeclareCommands([{"flags": command_flags.field, "children": []}]),
+        }
+
+        self.packets = {name: Buffer.pack_varint(p.id) + p.encode() for name, p in static.items()}
+        self._levels = {name: p.comp_level for name, p in static.items()}
+        self._frames = {}
+
+        self.frames(self.server.comp_thresh if self.server.comp_thresh > 0 else -1)
+
+    def dimension(self, dimension: str) -> bytes:
+        """Returns the packed dimension type NBT of a dimension, like minecraft:overworld."""
+
+        self._check()
+        packed = self._dimensions.get(dimension)
+
+        if packed is None:
+            packed = self._dimensions[dimension] = Buffer.pack_nbt(get_dimension_data(dimension))
+
+        return packed
+
+    def frames(self, comp_thresh: int) -> dict:
+        """Returns the packed frames of the static packets for a comp_thresh, {name: frame}."""
+
+        self._check()
+        frames = self._frames.get(comp_thresh)
+
+        if frames is None:
+            frames = self._frames[comp_thresh] = {
+                name: Buffer.pack_frame(data, comp_thresh, self._levels[name])
+                for name, data in self.packets.items()
+            }
+
+        return frames
@@ -0,0 +1,163 @@
+# A flexible and fast Minecraft server software written completely in Python.
+# Copyright (C) 2021 PyMine
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+
+from pymine.net.packets.play.keep_alive import PlayKeepAliveClientBound
+from pymine.net.packets.play.player import PlayPlayerInfo
+from pymine.types.connection import Connection
+from pymine.types.timer_wheel import TimerWheel
+from pymine.types.buffer import Buffer
+
+__all__ = ("KeepAlive",)
+
+
+class KeepAlive:
+    """Times out dead connections, sends keep alives and measures latency, for every connection.
+
+    Every connection is tracked in a single TimerWheel instead of having timers of its own. A
+    connection is closed once nothing was received for connection_timeout seconds, or once a keep
+    alive wasn't answered within that time. Players are sent a keep alive every keep_alive_interval
+    seconds, the time until it's answered is their latency, changes of which are sent to everyone's
+    tab list in one PlayPlayerInfo packet every latency_update_interval seconds.
+
+    :param Server server: The server instance.
+    :ivar TimerWheel wheel: The wheel every connection is tracked in.
+    :ivar int sent: How many keep alives were sent.
+    :ivar int timeouts: How many connections were closed for timing out.
+    """
+
+    def __init__(self, server) -> None:
+        self.server = server
+
+        self.timeout = server.conf["connection_timeout"]
+        self.interval = server.conf["keep_alive_interval"]
+        self.latency_interval = server.conf["latency_update_interval"]
+
+        self.wheel = TimerWheel(self._expire)
+
+        self.sent = 0
+        self.timeouts = 0
+
+        self._changed = set()  # connections whose latency changed since the last tab list update
+        self._loop = None
+        self._task = None
+        self._update_task = None
+
+    def start(self) -> None:
+        self._loop = asyncio.get_event_loop()
+        self._task = asyncio.create_task(self.run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    def track(self, conn: Connection) -> None:
+        """Starts tracking a new connection, it's dropped from the wheel once it's closed."""
+
+        self.wheel.schedule(conn, min(self.timeout, self.interval))
+
+    async def run(self) -> None:
+        next_update = self._loop.time() + self.latency_interval
+
+        while True:
+            now = self._loop.time()
+            self.wheel.advance(now)
+
+            if now >= next_update:
+                next_update = now + self.latency_interval
+
+                # sent in a task, so a slow client can't hold up the wheel
+                if self._changed and (self._update_task is None or self._update_task.done()):
+                    self._update_task = asyncio.create_task(self.update_latency())
+
+            await asyncio.sleep(self.wheel.tick)
+
+    def _expire(self, conn: Connection) -> float:
+        stream = conn.stream
+        left = stream.check_idle(self.timeout)
+
+        if left is None:
+            self.timeouts += stream.timed_out
+            self._changed.discard(conn)
+            return None
+
+        if conn.player is None:  # only players in the play state are sent keep alives
+            return left
+
+        now = self._loop.time()
+        since = now - conn.keep_alive_sent
+
+        if conn.keep_alive_id is not None:  # still waiting for a response
+            if since >= self.timeout:
+                self.timeouts += 1
+                self._changed.discard(conn)
+
+                stream.timed_out = True
+                stream.transport.abort()
+
+                return None
+
+            return min(left, self.timeout - since)
+
+        if since >= self.interval:
+            self.send(conn, now)
+            since = 0
+
+        return min(left, self.interval - since)
+
+    def send(self, conn: Connection, now: float) -> None:
+        """Queues a keep alive, its id is the time it was sent at in milliseconds, like vanilla."""
+
+        conn.keep_alive_id = int(now * 1000)
+        conn.keep_alive_sent = now
+
+        packet = PlayKeepAliveClientBound(conn.keep_alive_id)
+        conn.send_queue.push(Buffer.pack_packet(packet, conn.comp_thresh), packet.lane)
+
+        self.sent += 1
+
+    def received(self, conn: Connection, keep_alive_id: int) -> None:
+        """Measures the latency of a connection from the response to its keep alive."""
+
+        if keep_alive_id != conn.keep_alive_id:  # a late response to an older keep alive
+            return
+
+        conn.keep_alive_id = None
+        rtt = int((self._loop.time() - conn.keep_alive_sent) * 1000)
+
+        if conn.latency == 0:  # nothing measured yet
+            latency = rtt
+        else:  # smoothed the same way as vanilla
+            latency = (conn.latency * 3 + rtt) // 4
+
+        if latency != conn.latency:
+            conn.latency = latency
+            self._changed.add(conn)
+
+    async def update_latency(self) -> None:
+        """Sends the latencies which changed to every player's tab list."""
+
+        changed = [
+            {"uuid": conn.player.uuid, "ping": conn.latency}
+            for conn in self._changed
+            if conn.player is not None
+        ]
+
+        self._changed.clear()
+
+        if changed:
+            await self.server.broadcast_packet(PlayPlayerInfo(2, changed))  # 2 is update latency
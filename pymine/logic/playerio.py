@@ -56,8 +56,8 @@ class PlayerDataIO:
 
             async with aiofile.async_open(file, "rb") as player_file:  # load preexisting
                 player = Player(
-                    self.server.eid(), nbt.TAG_Compound.unpack(Buffer(await player_file.read()))
+                    self.server.api.eid(), nbt.TAG_Compound.unpack(Buffer(await player_file.read()))
                 )
-                self.cache[player.uuid] = player
+                self.cache[int(player.uuid)] = player
 
                 return player
@@ -14,12 +14,16 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import asyncio_dgram
 import asyncio
 import struct
+import hmac
+import time
+import os
 
 from pymine.api.errors import ServerBindingError
 
+CHALLENGE_EXPIRY = 30  # seconds challenge tokens are valid for at least, same as vanilla
+
 
 class QueryBuffer:
     """Buffer for the query protocol, contains method for dealing with query protocol types.
@@ -68,10 +72,10 @@ class QueryBuffer:
     @staticmethod
     # Why is short the only little-endian one? Nobody knows.
     def pack_short(short: int) -> bytes:
-        return struct.pack("<h", short)
+        return struct.pack("<H", short)  # unsigned, it's used for the port
 
     def unpack_short(self) -> int:
-        return struct.unpack("<h", self.read(2))[0]
+        return struct.unpack("<H", self.read(2))[0]
 
     @staticmethod
     def pack_magic() -> bytes:
@@ -117,9 +121,13 @@ class QueryBuffer:
         return struct.unpack(">b", self.read(1))[0]
 
 
-class QueryServer:
+class QueryServer(asyncio.DatagramProtocol):
     """A query server that supports the Minecraft query protocol.
 
+    Challenge tokens aren't stored, they're derived from the remote's ip and the current time
+    window using a secret key, so they expire on their own. The stat payloads are built once and
+    reused until invalidate() is called (whenever a player joins or leaves) or the motd is replaced.
+
     :param object server: The PyMine server instance.
     :attr object conf: The contents of server.yml (The server configuration).
     :attr object logger: The instance of the logger.
@@ -136,123 +144,138 @@ class QueryServer:
         if self.port is None:
             self.port = server.port
 
-        self._server = None  # the result of asyncio_dgram.bind(...) (a stream)
-        self.server_task = None  # the task that handles packets
+        self.transport = None  # the asyncio DatagramTransport
+
+        self._secret = os.urandom(16)  # key used to derive challenge tokens
 
-        self.challenge_cache = {}  # {remote_ip: challenge_token (string)}
+        self._basic = None  # the basic stat payload, without the type + session id
+        self._full = None  # the full stat payload, without the type + session id
+        self._motd = None
 
     async def start(self):
         try:
-            self._server = await asyncio_dgram.bind((self.addr, self.port))
+            self.transport, _ = await asyncio.get_event_loop().create_datagram_endpoint(
+                lambda: self, local_addr=(self.addr, self.port)
+            )
         except OSError:
             raise ServerBindingError("query server", self.addr, self.port)
 
         self.console.info(f"Query server started on {self.addr}:{self.port}.")
 
-        self.server_task = asyncio.create_task(self.handle())
+    def challenge_token(self, remote: tuple, window: int = None) -> int:
+        """Returns the challenge token of a remote for the given time window, or the current one."""
 
-    async def handle(self):
-        try:
-            while True:
-                data, remote = await self._server.recv()
-                asyncio.create_task(self.handle_packet(remote, QueryBuffer(data)))
-        except asyncio.CancelledError:
-            pass
-        except BaseException as e:
-            self.console.error(
-                f"Error occurred while handling query packets: {self.console.f_traceback(e)}"
-            )
+        if window is None:
+            window = int(time.time() // CHALLENGE_EXPIRY)
+
+        digest = hmac.digest(self._secret, f"{remote[0]}:{window}".encode(), "sha256")
+
+        return struct.unpack(">i", digest[:4])[0]
+
+    def check_challenge_token(self, remote: tuple, challenge_token: int) -> bool:
+        """Checks a challenge token, tokens are valid for between 1 and 2 times CHALLENGE_EXPIRY."""
+
+        window = int(time.time() // CHALLENGE_EXPIRY)
+
+        return challenge_token in (
+            self.challenge_token(remote, window),
+            self.challenge_token(remote, window - 1),
+        )
+
+    def invalidate(self) -> None:
+        """Marks the stat payloads as outdated, call this whenever the online players change."""
+
+        self._basic = self._full = None
+
+    def _build(self) -> None:
+        conf = self.server.conf
+        players = []
+
+        if self.server.playerio is not None:  # None while the server is starting
+            players = [p.username for p in self.server.playerio.cache.values() if p.username]
+
+        self._motd = conf["motd"]
+
+        self._basic = (
+            QueryBuffer.pack_string(conf["motd"])
+            + QueryBuffer.pack_string("SMP")
+            + QueryBuffer.pack_string(conf["level_name"])
+            + QueryBuffer.pack_string(len(players))
+            + QueryBuffer.pack_string(conf["max_players"])
+            + QueryBuffer.pack_short(self.server.port)
+            + QueryBuffer.pack_string(self.server.addr)
+        )
+
+        stats = (
+            ("hostname", conf["motd"]),
+            ("gametype", "SMP"),
+            ("game_id", "MINECRAFT"),
+            ("version", self.server.meta.version),
+            ("plugins", ""),  # empty for now
+            ("map", conf["level_name"]),
+            ("numplayers", len(players)),
+            ("maxplayers", conf["max_players"]),
+            ("hostport", self.server.port),
+            ("hostip", self.server.addr),
+        )
+
+        self._full = (
+            b"splitnum\x00\x80\x00"  # constant data / padding
+            + b"".join(QueryBuffer.pack_string(k) + QueryBuffer.pack_string(v) for k, v in stats)
+            + b"\x00"
+            + b"\x01player_\x00\x00"  # more constant data / padding
+            + b"".join(QueryBuffer.pack_string(p) for p in players)
+            + b"\x00"
+        )
+
+    def datagram_received(self, data: bytes, remote: tuple) -> None:
+        buf = QueryBuffer(data)
 
-    async def handle_packet(self, remote: tuple, buf: QueryBuffer) -> None:
         try:
-            try:
-                buf.unpack_magic()
-            except ValueError:
-                self.console.debug(
-                    "Invalid value for magic recieved, continuing like nothing happened."
-                )
-                return
+            buf.unpack_magic()
 
             packet_type = buf.unpack_byte()  # should be 9 (handshake) or 0 (stat)
             session_id = buf.unpack_int32()
 
-            if buf.buf[buf.pos :] == b"":  # god this protocol is so fucking shit garbage
-                challenge_token = 0
-            else:
-                challenge_token = buf.unpack_int32()
-
             if packet_type == 9:  # handshake
-                self.challenge_cache[remote] = challenge_token
-
-                await self._server.send(
+                self.transport.sendto(
                     (
                         QueryBuffer.pack_byte(9)
                         + QueryBuffer.pack_int32(session_id)
-                        + QueryBuffer.pack_string(challenge_token)
+                        + QueryBuffer.pack_string(self.challenge_token(remote))
                     ),
                     remote,
                 )
             elif packet_type == 0:  # respond with a stat packet
-                if self.challenge_cache.get(remote) != challenge_token:
-                    self.console.warn(
+                challenge_token = buf.unpack_int32()
+
+                if not self.check_challenge_token(remote, challenge_token):
+                    self.console.debug(
                         f"Invalid challenge token {challenge_token} received for remote {remote}"
                     )
                     return
 
-                if buf.buf[buf.pos : buf.pos + 4] == b"\x00\x00\x00\x00":  # full stat
-                    out = (
-                        QueryBuffer.pack_byte(packet_type)
-                        + QueryBuffer.pack_int32(session_id)
-                        + b"\x73\x70\x6C\x69\x74\x6E\x75\x6D\x00\x80\x00"  # constant data / padding
-                        + QueryBuffer.pack_string("hostname")
-                        + QueryBuffer.pack_string(self.server.conf["motd"])
-                        + QueryBuffer.pack_string("game type")
-                        + QueryBuffer.pack_string("SMP")
-                        + QueryBuffer.pack_string("game_id")
-                        + QueryBuffer.pack_string("MINECRAFT")
-                        + QueryBuffer.pack_string("version")
-                        + QueryBuffer.pack_string(self.server.meta.version)
-                        + QueryBuffer.pack_string("plugins")
-                        + QueryBuffer.pack_string("")  # empty for now
-                        + QueryBuffer.pack_string("map")
-                        + QueryBuffer.pack_string(self.server.conf["level_name"])
-                        + QueryBuffer.pack_string("numplayers")
-                        + QueryBuffer.pack_string(len(self.server.cache.states))
-                        + QueryBuffer.pack_string("maxplayers")
-                        + QueryBuffer.pack_string(self.server.conf["max_players"])
-                        + QueryBuffer.pack_string("hostport")
-                        + QueryBuffer.pack_string(self.server.port)
-                        + QueryBuffer.pack_string("hostip")
-                        + QueryBuffer.pack_string(self.server.addr)
-                        + b"\x00"
-                        + b"\x01\x70\x6C\x61\x79\x65\x72\x5F\x00\x00"  # more constant data / padding / whatever
-                        + b"Penis\x00\x00"  # should be player section, this means no players online
-                    )
-                else:  # basic stat
-                    out = (
-                        QueryBuffer.pack_byte(packet_type)
-                        + QueryBuffer.pack_int32(session_id)
-                        + QueryBuffer.pack_string(self.server.conf["motd"])
-                        + QueryBuffer.pack_string("SMP")
-                        + QueryBuffer.pack_string(self.server.conf["level_name"])
-                        + QueryBuffer.pack_string(len(self.server.cache.states))
-                        + QueryBuffer.pack_string(self.server.conf["max_players"])
-                        + QueryBuffer.pack_string(self.server.port)
-                        + QueryBuffer.pack_string(self.server.addr)
-                    )
+                if self._basic is None or self._motd is not self.server.conf["motd"]:
+                    self._build()
 
-                await self._server.send(out, remote)
-                await asyncio.sleep(0.5)  # fucking shit fucking protocol
+                # full stat requests are padded with 4 extra bytes
+                payload = self._full if len(data) - buf.pos >= 4 else self._basic
 
-        except asyncio.CancelledError:
-            pass
-        except BaseException as e:  # no one give s afucking shit
+                self.transport.sendto(
+                    QueryBuffer.pack_byte(0) + QueryBuffer.pack_int32(session_id) + payload, remote
+                )
+        except (ValueError, struct.error):
+            self.console.debug(f"Invalid query packet received from {remote}, ignoring it.")
+        except BaseException as e:
             self.console.error(f"Error while handling query packet: {self.console.f_traceback(e)}")
 
+    def error_received(self, exc: OSError) -> None:
+        self.console.debug(f"Query server socket error: {exc}")
+
     def stop(self):
         self.console.debug("Query server shutting down.")
 
-        self.server_task.cancel()
-        self._server.close()
+        if self.transport is not None:
+            self.transport.close()
 
         self.console.debug("Query server shut down successfully.")
@@ -0,0 +1,137 @@
+# A flexible and fast Minecraft server software written completely in Python.
+# Copyright (C) 2021 PyMine
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from cryptography.hazmat.primitives.asymmetric.padding import PKCS1v15
+import asyncio
+import aiohttp
+import time
+
+__all__ = ("SessionAuth",)
+
+HAS_JOINED_PATH = "/session/minecraft/hasJoined"
+
+
+def decrypt_login(private_key, verify_token: bytes, shared_key: bytes) -> tuple:
+    """Decrypts the verify token and shared secret sent in LoginEncryptionResponse.
+
+    OpenSSL releases the GIL while decrypting, so this is meant to be run in the thread executor.
+    """
+
+    return (
+        private_key.decrypt(verify_token, PKCS1v15()),
+        private_key.decrypt(shared_key, PKCS1v15()),
+    )
+
+
+class SessionAuth:
+    """Authenticates logins against the session server, see https://wiki.vg/Protocol_Encryption.
+
+    At most session_max_concurrent requests are made at once, each with a timeout of
+    session_timeout seconds and up to session_retries retries. Successful hasJoined responses are
+    cached for session_cache_ttl seconds, keyed by the username and server hash. The server hash is
+    derived from the shared secret, so a cached result is only ever reused for the same login (like
+    a client retrying), never for a different one with the same username.
+
+    :param Server server: The server instance.
+    :ivar str base_url: The session server to use, session_server in server.yml.
+    :ivar dict cache: Successful hasJoined responses,
+        like {(username, server hash): (expiry, response)}.
+    :ivar int requests: How many requests were made to the session server, useful for debugging.
+    """
+
+    def __init__(self, server) -> None:
+        self.server = server
+
+        self.base_url = server.conf["session_server"].rstrip("/")
+        self.timeout = aiohttp.ClientTimeout(total=server.conf["session_timeout"])
+        self.retries = server.conf["session_retries"]
+        self.cache_ttl = server.conf["session_cache_ttl"]
+
+        self.cache = {}
+        self.requests = 0
+
+        self._semaphore = asyncio.Semaphore(server.conf["session_max_concurrent"])
+
+    async def decrypt(self, verify_token: bytes, shared_key: bytes) -> tuple:
+        """Decrypts the verify token and shared secret off the event loop, see decrypt_login()."""
+
+        return await asyncio.get_event_loop().run_in_executor(
+            self.server.thread_executor,
+            decrypt_login,
+            self.server.secrets.rsa_private,
+            verify_token,
+            shared_key,
+        )
+
+    async def has_joined(self, username: str, server_hash: str) -> dict:
+        """Checks whether the client authenticated with the session server.
+
+        :return: The client's profile (id, name, properties), None if it isn't authenticated.
+        :rtype: dict
+        """
+
+        key = (username, server_hash)
+        now = time.monotonic()
+
+        cached = self.cache.get(key)
+
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        async with self._semaphore:
+            profile = await self._request(username, server_hash)
+
+        if profile is not None:
+            # drop expired entries here instead of with a timer, logins are rare enough for this
+            for k in [k for k, (expiry, _) in self.cache.items() if expiry <= now]:
+                del self.cache[k]
+
+            self.cache[key] = (now + self.cache_ttl, profile)
+
+        return profile
+
+    async def _request(self, username: str, server_hash: str) -> dict:
+        for attempt in range(self.retries + 1):
+            if attempt > 0:
+                await asyncio.sleep(0.1 * 2 ** attempt)
+
+            self.requests += 1
+
+            try:
+                async with self.server.aiohttp.get(
+                    self.base_url + HAS_JOINED_PATH,
+                    params={"username": username, "serverId": server_hash},
+                    timeout=self.timeout,
+                ) as resp:
+                    if resp.status == 200:
+                        return await resp.json(content_type=None)
+
+                    if (
+                        resp.status != 429 and resp.status < 500
+                    ):  # 204, the client isn't authenticated
+                        return None
+
+                    error = f"status {resp.status}"
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = repr(e)
+
+            self.server.console.debug(f"Session server request for {username} failed: {error}")
+
+        self.server.console.warn(
+            f"Failed to authenticate {username}, the session server couldn't be reached."
+        )
+
+        return None
@@ -0,0 +1,99 @@
+# A flexible and fast Minecraft server software written completely in Python.
+# Copyright (C) 2021 PyMine
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import random
+import time
+
+from pymine.net.packets.status.status import StatusStatusResponse
+from pymine.types.buffer import Buffer
+from pymine.types.chat import Chat
+
+__all__ = ("StatusCache",)
+
+SAMPLE_SIZE = 12  # max amount of players in the sample shown when hovering over the player count
+# seconds between picking a new sample, when there are more players than fit
+SAMPLE_ROTATE_INTERVAL = 5
+
+
+class StatusCache:
+    """Caches the packed StatusStatusResponse frame sent to server list pings.
+
+    The frame is rebuilt when invalidate() was called (whenever a player joins or leaves), when
+    the motd or favicon was replaced, or when it's time to rotate the player sample.
+
+    :param Server server: The server instance.
+    :ivar int builds: How many times the frame was built, useful for debugging.
+    """
+
+    def __init__(self, server) -> None:
+        self.server = server
+
+        self.builds = 0
+
+        self._frame = None
+        self._motd = None
+        self._favicon = None
+        self._rotation = None
+
+    def invalidate(self) -> None:
+        """Marks the cached frame as outdated, call this when the set of online players changes."""
+
+        self._frame = None
+
+    def frame(self) -> bytes:
+        """Returns the packed (uncompressed) StatusStatusResponse frame, rebuilding it if needed."""
+
+        server = self.server
+        players = server.playerio.cache
+
+        if len(players) > SAMPLE_SIZE:
+            rotation = int(time.monotonic() // SAMPLE_ROTATE_INTERVAL)
+        else:
+            rotation = None
+
+        if (
+            self._frame is None
+            or self._motd is not server.conf["motd"]
+            or self._favicon is not server.favicon
+            or self._rotation != rotation
+        ):
+            self._motd = server.conf["motd"]
+            self._favicon = server.favicon
+            self._rotation = rotation
+            self._frame = self._build(list(players.values()))
+
+        return self._frame
+
+    def _build(self, players: list) -> bytes:
+        if len(players) > SAMPLE_SIZE:
+            players = random.sample(players, SAMPLE_SIZE)
+
+        data = {
+            "version": {"name": self.server.meta.version, "protocol": self.server.meta.protocol},
+            "players": {
+                "max": self.server.conf["max_players"],
+                "online": len(self.server.playerio.cache),
+                "sample": [{"name": p.username, "id": str(p.uuid)} for p in players],
+            },
+            "description": Chat(self.server.conf["motd"]).msg,  # a Chat
+        }
+
+        if self.server.favicon:
+            data["favicon"] = self.server.favicon
+
+        self.builds += 1
+
+        return Buffer.pack_packet(StatusStatusResponse(data), -1)
@@ -19,7 +19,6 @@
 from __future__ import annotations
 
 from pymine.types.packet import Packet
-from pymine.types.buffer import Buffer
 
 __all__ = ("HandshakeHandshake",)
 
@@ -41,6 +40,12 @@ class HandshakeHandshake(Packet):
 
     id = 0x00
     to = 0
+    schema = (
+        ("protocol", "varint"),
+        ("address", "string"),
+        ("port", "H"),
+        ("next_state", "varint"),
+    )
 
     def __init__(self, protocol: int, address: str, port: int, next_state: int) -> None:
         super().__init__()
@@ -49,7 +54,3 @@ class HandshakeHandshake(Packet):
         self.address = address
         self.port = port
         self.next_state = next_state
-
-    @classmethod
-    def decode(cls, buf: Buffer) -> HandshakeHandshake:
-        return cls(buf.unpack_varint(), buf.unpack_string(), buf.unpack("H"), buf.unpack_varint())
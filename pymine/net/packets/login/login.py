@@ -23,7 +23,6 @@ import uuid
 
 from pymine.types.packet import Packet
 from pymine.types.buffer import Buffer
-from pymine.types.chat import Chat
 
 __all__ = (
     "LoginStart",
@@ -123,6 +122,10 @@ class LoginSuccess(Packet):
 
     id = 0x02
     to = 1
+    schema = (
+        ("uuid", "uuid"),
+        ("username", "string"),
+    )
 
     def __init__(self, uuid_: uuid.UUID, username: str) -> None:
         super().__init__()
@@ -130,9 +133,6 @@ class LoginSuccess(Packet):
         self.uuid = uuid_
         self.username = username
 
-    def encode(self) -> bytes:
-        return Buffer.pack_uuid(self.uuid) + Buffer.pack_string(self.username)
-
 
 class LoginDisconnect(Packet):
     """Sent by the server to kick a player while in the login state. (Server -> Client)
@@ -145,11 +145,9 @@ class LoginDisconnect(Packet):
 
     id = 0x00
     to = 1
+    schema = (("reason", "chat"),)
 
     def __init__(self, reason: str) -> None:
         super().__init__()
 
         self.reason = reason
-
-    def encode(self) -> bytes:
-        return Buffer.pack_chat(Chat(self.reason))
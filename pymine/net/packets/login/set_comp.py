@@ -19,7 +19,6 @@
 from __future__ import annotations
 
 from pymine.types.packet import Packet
-from pymine.types.buffer import Buffer
 
 __all__ = ("LoginSetCompression",)
 
@@ -35,11 +34,9 @@ class LoginSetCompression(Packet):
 
     id = 0x03
     to = 1
+    schema = (("comp_thresh", "varint"),)
 
     def __init__(self, comp_thresh: int = -1) -> None:
         super().__init__()
 
         self.comp_thresh = comp_thresh
-
-    def encode(self) -> bytes:
-        return Buffer.pack_varint(self.comp_thresh)
@@ -18,6 +18,7 @@
 
 from __future__ import annotations
 
+from pymine.types.send_queue import LANE_BULK
 from pymine.types.packet import Packet
 from pymine.types.buffer import Buffer
 
@@ -42,6 +43,10 @@ class PlayEntityAnimation(Packet):
 
     id = 0x05
     to = 1
+    schema = (
+        ("entity_id", "varint"),
+        ("animation", "B"),
+    )
 
     def __init__(self, entity_id: int, animation: int) -> None:
         super().__init__()
@@ -49,9 +54,6 @@ class PlayEntityAnimation(Packet):
         self.entity_id = entity_id
         self.animation = animation
 
-    def encode(self) -> bytes:
-        return Buffer.pack_varint(self.entity_id) + Buffer.pack("B", self.animation)
-
 
 class PlayBlockBreakAnimation(Packet):
     """Sent to play a block breaking animation. (Server -> Client)
@@ -72,6 +74,12 @@ class PlayBlockBreakAnimation(Packet):
 
     id = 0x08
     to = 1
+    lane = LANE_BULK  # applies to a chunk, so it can't overtake the chunk's data
+    schema = (
+        ("entity_id", "varint"),
+        (("x", "y", "z"), "position"),
+        ("stage", "b"),
+    )
 
     def __init__(self, entity_id: int, x: int, y: int, z: int, stage: int) -> None:
         super().__init__()
@@ -80,13 +88,6 @@ class PlayBlockBreakAnimation(Packet):
         self.x, self.y, self.z = x, y, z
         self.stage = stage
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack_varint(self.entity_id)
-            + Buffer.pack_position(self.x, self.y, self.z)
-            + Buffer.pack("b", self.stage)
-        )
-
 
 class PlayAnimationServerBound(Packet):
     """Sent when a client's arm swings. (Client -> Server)
@@ -121,11 +122,9 @@ class PlayOpenBook(Packet):
 
     id = 0x2C
     to = 1
+    schema = (("hand", "varint"),)
 
     def __init__(self, hand: int) -> None:
         super().__init__()
 
         self.hand = hand
-
-    def encode(self) -> bytes:
-        return Buffer.pack_varint(self.hand)
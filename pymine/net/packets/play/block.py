@@ -18,6 +18,7 @@
 
 from __future__ import annotations
 
+from pymine.types.send_queue import LANE_BULK
 from pymine.types.packet import Packet
 from pymine.types.buffer import Buffer
 import pymine.types.nbt as nbt
@@ -53,6 +54,13 @@ class PlayBlockAction(Packet):
 
     id = 0x0A
     to = 1
+    lane = LANE_BULK  # applies to a chunk, so it can't overtake the chunk's data
+    schema = (
+        (("x", "y", "z"), "position"),
+        ("action_id", "B"),
+        ("action_param", "B"),
+        ("block_type", "varint"),
+    )
 
     def __init__(
         self, x: int, y: int, z: int, action_id: int, action_param: int, block_type: int
@@ -64,14 +72,6 @@ class PlayBlockAction(Packet):
         self.action_param = action_param
         self.block_type = block_type
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack_position(self.x, self.y, self.z)
-            + Buffer.pack("B", self.action_id)
-            + Buffer.pack("B", self.action_param)
-            + Buffer.pack_varint(self.block_type)
-        )
-
 
 class PlayBlockChange(Packet):
     """Fired when a block is changed within the render distance. (Server -> Client)
@@ -89,6 +89,11 @@ class PlayBlockChange(Packet):
 
     id = 0x0B
     to = 1
+    lane = LANE_BULK  # applies to a chunk, so it can't overtake the chunk's data
+    schema = (
+        (("x", "y", "z"), "position"),
+        ("block_id", "varint"),
+    )
 
     def __init__(self, x: int, y: int, z: int, block_id: int) -> None:
         super().__init__()
@@ -96,9 +101,6 @@ class PlayBlockChange(Packet):
         self.x, self.y, self.z = x, y, z
         self.block_id = block_id
 
-    def encode(self) -> bytes:
-        return Buffer.pack_position(self.x, self.y, self.z) + Buffer.pack_varint(self.block_id)
-
 
 class PlayQueryBlockNBT(Packet):
     """Used when SHIFT+F3+I is used on a block. (Client -> Server)
@@ -197,6 +199,10 @@ class PlayNBTQueryResponse(Packet):
 
     id = 0x54
     to = 1
+    schema = (
+        ("transaction_id", "varint"),
+        ("nbt", "nbt"),
+    )
 
     def __init__(self, transaction_id: int, nbt: nbt.TAG) -> None:
         super().__init__()
@@ -204,9 +210,6 @@ class PlayNBTQueryResponse(Packet):
         self.transaction_id = transaction_id
         self.nbt = nbt
 
-    def encode(self) -> bytes:
-        return Buffer.pack_varint(self.transaction_id) + Buffer.pack_nbt(self.nbt)
-
 
 class PlayMultiBlockChange(Packet):
     """Sent whenever 2 or more blocks change in the same chunk on the same tick. (Server -> Client)
@@ -227,6 +230,7 @@ class PlayMultiBlockChange(Packet):
 
     id = 0x3B
     to = 1
+    lane = LANE_BULK  # applies to a chunk, so it can't overtake the chunk's data
 
     def __init__(
         self,
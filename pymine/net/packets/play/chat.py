@@ -20,6 +20,7 @@ from __future__ import annotations
 
 import uuid
 
+from pymine.types.send_queue import LANE_CHAT
 from pymine.types.packet import Packet
 from pymine.types.buffer import Buffer
 from pymine.types.chat import Chat
@@ -48,6 +49,12 @@ class PlayChatMessageClientBound(Packet):
 
     id = 0x0E
     to = 1
+    lane = LANE_CHAT
+    schema = (
+        ("data", "chat"),
+        ("position", "b"),
+        ("sender", "uuid"),
+    )
 
     def __init__(self, data: Chat, position: int, sender: uuid.UUID) -> None:
         super().__init__()
@@ -56,13 +63,6 @@ class PlayChatMessageClientBound(Packet):
         self.position = position
         self.sender = sender
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack_chat(self.data)
-            + Buffer.pack("b", self.position)
-            + Buffer.pack_uuid(self.sender)
-        )
-
 
 class PlayChatMessageServerBound(Packet):
     """A chat message from a client to the server. Can be a command. (Client -> Server)
@@ -165,6 +165,7 @@ class PlayTitle(Packet):
 
     id = 0x4F
     to = 1
+    lane = LANE_CHAT
 
     def __init__(self, action: int, data: object = None) -> None:
         super().__init__()
@@ -18,6 +18,7 @@
 
 from __future__ import annotations
 
+from pymine.types.send_queue import LANE_BULK
 from pymine.types.packet import Packet
 from pymine.types.buffer import Buffer
 from pymine.types.chunk import Chunk
@@ -35,15 +36,17 @@ class PlayUnloadChunk(Packet):
 
     id = 0x1C
     to = 1
+    lane = LANE_BULK
+    schema = (
+        ("chunk_x", "i"),
+        ("chunk_z", "i"),
+    )
 
     def __init__(self, chunk_x: int, chunk_z: int) -> None:
         super().__init__()
 
         self.chunk_x, self.chunk_z = chunk_x, chunk_z
 
-    def encode(self) -> bytes:
-        return Buffer.pack("i", self.chunk_x) + Buffer.pack("i", self.chunk_z)
-
 
 class PlayChunkData(Packet):
     """Sends a chunk / its data to the client. (Server -> Client)
@@ -58,6 +61,7 @@ class PlayChunkData(Packet):
 
     id = 0x20
     to = 1
+    lane = LANE_BULK
 
     def __init__(self, chunk: Chunk, full: bool) -> None:
         super().__init__()
@@ -66,51 +70,73 @@ class PlayChunkData(Packet):
         self.full = full
 
     def encode(self) -> bytes:
-        out = (
-            Buffer.pack("i", self.chunk.x)
-            + Buffer.pack("i", self.chunk.z)
-            + Buffer.pack("?", self.full)
-        )
+        out = Buffer()
+
+        out.write_pack("ii?", self.chunk.x, self.chunk.z, self.full)
 
         mask = 0
         chunk_sections_buffer = Buffer()
+        packed_sections = self.chunk.packed_sections
+
+        # pack chunk columns into buffer and generate a bitmask, sections packed before are reused
+        for y in range(16):
+            section = self.chunk.sections.get(y)
+
+            if section is None or section.block_states is None:
+                continue
 
-        for (
-            y,
-            section,
-        ) in self.chunk.sections.items():  # pack chunk columns into buffer and generate a bitmask
-            if y >= 0:
-                mask |= 1 << y
-                chunk_sections_buffer.write(Buffer.pack_chunk_section_blocks(section))
-
-        out += Buffer.pack_varint(mask) + Buffer.pack_nbt(
-            nbt.TAG_Compound(
-                "",
-                [
-                    self.chunk["Heightmaps"]["MOTION_BLOCKING"],
-                    self.chunk["Heightmaps"]["WORLD_SURFACE"],
-                ],
+            mask |= 1 << y
+            packed = packed_sections.get(y)
+
+            if packed is None:
+                packed = packed_sections[y] = Buffer.pack_chunk_section_blocks(section)
+
+            chunk_sections_buffer.write(packed)
+
+        if self.chunk.packed_heightmaps is None:
+            self.chunk.packed_heightmaps = Buffer.pack_nbt(
+                nbt.TAG_Compound(
+                    "",
+                    [
+                        self.chunk["Heightmaps"]["MOTION_BLOCKING"],
+                        self.chunk["Heightmaps"]["WORLD_SURFACE"],
+                    ],
+                )
             )
-        )
+
+        out.write_varint(mask)
+        out.write(self.chunk.packed_heightmaps)
 
         if self.full:
-            out += Buffer.pack_varint(len(self.chunk["Biomes"])) + b"".join(
-                [Buffer.pack_varint(n) for n in self.chunk["Biomes"]]
-            )
+            if self.chunk.packed_biomes is None:
+                biomes = self.chunk["Biomes"]
+                self.chunk.packed_biomes = Buffer.pack_varint(len(biomes)) + Buffer.pack_varints(
+                    biomes
+                )
+
+            out.write(self.chunk.packed_biomes)
 
-        out += Buffer.pack_varint(len(chunk_sections_buffer)) + chunk_sections_buffer.read()
+        out.write_varint(len(chunk_sections_buffer))
+        out.write(chunk_sections_buffer.buf)
 
         # here we would pack the block entities, but we don't support them yet so we just send an array with length of 0
-        out += Buffer.pack_varint(0)
+        out.write_varint(0)
 
-        return out
+        return out.read()
 
 
 class PlayUpdateLight(Packet):
-    """Updates light levels for a chunk."""
+    """Updates the light levels of a chunk, sent before its PlayChunkData. (Server -> Client)
+
+    :param Chunk chunk: The chunk to send the light levels of.
+    :ivar int id: Unique packet ID.
+    :ivar int to: Packet direction.
+    :ivar chunk:
+    """
 
     id = 0x23
     to = 1
+    lane = LANE_BULK
 
     def __init__(self, chunk: Chunk) -> None:
         super().__init__()
@@ -119,64 +145,3 @@ class PlayUpdateLight(Packet):
 
     def encode(self) -> bytes:
         return Buffer.pack_chunk_light(self.chunk)
-
-    # def encode(self) -> bytes:
-    #     out = Buffer.pack_varint(self.chunk.x) + Buffer.pack_varint(self.chunk.z) + Buffer.pack("?", True)
-    #
-    #     sky_light_mask = 0
-    #     block_light_mask = 0
-    #     empty_sky_light_mask = 0
-    #     empty_block_light_mask = 0
-    #
-    #     sky_light_arrays = []
-    #     block_light_arrays = []
-    #
-    #     for y, section in self.chunk.sections.items():
-    #         if y >= 0:
-    #             if section.sky_light is not None:
-    #                 if len(section.sky_light.nonzero()) == 0:
-    #                     empty_sky_light_mask |= 1 << y
-    #                 else:
-    #                     sky_light_mask |= 1 << y
-    #
-    #                     data = []
-    #
-    #                     for y in range(16):
-    #                         for z in range(16):
-    #                             for x in range(0, 16, 2):
-    #                                 data.append(
-    #                                     Buffer.pack("b", section.sky_light[x][y][z] | (section.sky_light[x + 1][y][z] << 4))
-    #                                 )
-    #
-    #                     sky_light_arrays.append(b"".join(data))
-    #
-    #             if section.block_light is not None:
-    #                 if len(section.block_light.nonzero()) == 0:
-    #                     empty_block_light_mask |= 1 << y
-    #                 else:
-    #                     block_light_mask |= 1 << y
-    #
-    #                     data = []
-    #
-    #                     for y in range(16):
-    #                         for z in range(16):
-    #                             for x in range(0, 16, 2):
-    #                                 data.append(
-    #                                     Buffer.pack(
-    #                                         "b", section.block_light[x][y][z] | (section.block_light[x + 1][y][z] << 4)
-    #                                     )
-    #                                 )
-    #
-    #                     block_light_arrays.append(b"".join(data))
-    #
-    #     return (
-    #         out
-    #         + Buffer.pack_varint(sky_light_mask)
-    #         + Buffer.pack_varint(block_light_mask)
-    #         + Buffer.pack_varint(empty_sky_light_mask)
-    #         + Buffer.pack_varint(empty_block_light_mask)
-    #         + Buffer.pack_varint(len(sky_light_arrays))
-    #         + b"".join(sky_light_arrays)
-    #         + Buffer.pack_varint(len(block_light_arrays))
-    #         + b"".join(block_light_arrays)
-    #     )
@@ -19,7 +19,6 @@
 from __future__ import annotations
 
 from pymine.types.packet import Packet
-from pymine.types.buffer import Buffer
 
 __all__ = ("PlaySetCooldown",)
 
@@ -36,12 +35,13 @@ class PlaySetCooldown(Packet):
 
     id = 0x16
     to = 1
+    schema = (
+        ("item_id", "varint"),
+        ("cooldown_ticks", "varint"),
+    )
 
     def __init__(self, item_id: int, cooldown_ticks: int) -> None:
         super().__init__()
 
         self.item_id = item_id
         self.cooldown_ticks = cooldown_ticks
-
-    def encode(self) -> bytes:
-        return Buffer.pack_varint(self.item_id) + Buffer.pack_varint(self.cooldown_ticks)
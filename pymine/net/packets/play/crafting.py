@@ -114,6 +114,10 @@ class PlayCraftRecipeResponse(Packet):
 
     id = 0x2F
     to = 1
+    schema = (
+        ("window_id", "b"),
+        ("recipe_identifier", "string"),
+    )
 
     def __init__(self, window_id: int, recipe_identifier: str) -> None:
         super().__init__()
@@ -121,9 +125,6 @@ class PlayCraftRecipeResponse(Packet):
         self.window_id = window_id
         self.recipe_identifier = recipe_identifier
 
-    def encode(self) -> bytes:
-        return Buffer.pack("b", self.window_id) + Buffer.pack_string(self.recipe_identifier)
-
 
 class PlayDeclareRecipes(Packet):
     """Sends all registered recipes to the client. (Server -> Client)
@@ -41,6 +41,10 @@ class PlayServerDifficulty(Packet):
 
     id = 0x0D
     to = 1
+    schema = (
+        ("difficulty", "B"),
+        ("locked", "?"),
+    )
 
     def __init__(self, difficulty: int, locked: bool) -> None:
         super().__init__()
@@ -48,9 +52,6 @@ class PlayServerDifficulty(Packet):
         self.difficulty = difficulty
         self.locked = locked
 
-    def encode(self) -> bytes:
-        return Buffer.pack("B", self.difficulty) + Buffer.pack("?", self.locked)
-
 
 class PlaySetDifficulty(Packet):
     """Used by the client to set difficulty. Not used normally. (Client -> Server)
@@ -49,6 +49,12 @@ class PlayEffect(Packet):
 
     id = 0x21
     to = 1
+    schema = (
+        ("effect_id", "i"),
+        (("x", "y", "z"), "position"),
+        ("data", "i"),
+        ("disable_relative_volume", "?"),
+    )
 
     def __init__(
         self, effect_id: int, x: int, y: int, z: int, data: int, disable_relative_volume: bool
@@ -60,14 +66,6 @@ class PlayEffect(Packet):
         self.data = data
         self.disable_relative_volume = disable_relative_volume
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack("i", self.effect_id)
-            + Buffer.pack_position(self.x, self.y, self.z)
-            + Buffer.pack("i", self.data)
-            + Buffer.pack("?", self.disable_relative_volume)
-        )
-
 
 class PlayEntityEffect(Packet):
     """Insert fancy docstring here (server -> client)"""
@@ -18,6 +18,7 @@
 
 from __future__ import annotations
 
+from pymine.types.send_queue import LANE_MOVEMENT, LANE_BULK
 from pymine.types.packet import Packet
 from pymine.types.buffer import Buffer
 import pymine.types.nbt as nbt
@@ -62,6 +63,12 @@ class PlayBlockEntityData(Packet):
 
     id = 0x09
     to = 1
+    lane = LANE_BULK  # applies to a chunk, so it can't overtake the chunk's data
+    schema = (
+        (("x", "y", "z"), "position"),
+        ("action", "B"),
+        ("nbt_data", "nbt"),
+    )
 
     def __init__(self, x: int, y: int, z: int, action: int, nbt_data: nbt.TAG) -> None:
         super().__init__()
@@ -70,13 +77,6 @@ class PlayBlockEntityData(Packet):
         self.action = action
         self.nbt_data = nbt_data
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack_position(self.x, self.y, self.z)
-            + Buffer.pack("B", self.action)
-            + Buffer.pack_nbt(self.nbt_data)
-        )
-
 
 class PlayQueryEntityNBT(Packet):
     """Sent by the client when Shift+F3+I is used. (Client -> Server)
@@ -174,6 +174,10 @@ class PlayEntityStatus(Packet):
 
     id = 0x1A
     to = 1
+    schema = (
+        ("entity_id", "i"),
+        ("entity_status", "b"),
+    )
 
     def __init__(self, entity_id: int, entity_status: int) -> None:
         super().__init__()
@@ -181,9 +185,6 @@ class PlayEntityStatus(Packet):
         self.entity_id = entity_id
         self.entity_status = entity_status
 
-    def encode(self) -> bytes:
-        return Buffer.pack("i", self.entity_id) + Buffer.pack("b", self.entity_status)
-
 
 class PlayEntityAction(Packet):
     """Sent by the client to indicate it has performed a certain action. (Client -> Server)
@@ -232,6 +233,14 @@ class PlayEntityPosition(Packet):
 
     id = 0x27
     to = 1
+    lane = LANE_MOVEMENT
+    schema = (
+        ("entity_id", "varint"),
+        ("dx", "h"),
+        ("dy", "h"),
+        ("dz", "h"),
+        ("on_ground", "?"),
+    )
 
     def __init__(self, entity_id: int, dx: int, dy: int, dz: int, on_ground: bool) -> None:
         super().__init__()
@@ -240,15 +249,6 @@ class PlayEntityPosition(Packet):
         self.dx, self.dy, self.dz = dx, dy, dz
         self.on_ground = on_ground
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack_varint(self.entity_id)
-            + Buffer.pack("h", self.dx)
-            + Buffer.pack("h", self.dy)
-            + Buffer.pack("h", self.dz)
-            + Buffer.pack("?", self.on_ground)
-        )
-
 
 class PlayEntityPositionAndRotation(Packet):
     """Sent by the server when an entity rotates and moves. (Server -> Client)
@@ -273,6 +273,16 @@ class PlayEntityPositionAndRotation(Packet):
 
     id = 0x28
     to = 1
+    lane = LANE_MOVEMENT
+    schema = (
+        ("entity_id", "varint"),
+        ("dx", "h"),
+        ("dy", "h"),
+        ("dz", "h"),
+        ("yaw", "f"),
+        ("pitch", "f"),
+        ("on_ground", "?"),
+    )
 
     def __init__(
         self, entity_id: int, dx: int, dy: int, dz: int, yaw: float, pitch: float, on_ground: bool
@@ -285,17 +295,6 @@ class PlayEntityPositionAndRotation(Packet):
         self.pitch = pitch
         self.on_ground = on_ground
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack_varint(self.entity_id)
-            + Buffer.pack("h", self.dx)
-            + Buffer.pack("h", self.dy)
-            + Buffer.pack("h", self.dz)
-            + Buffer.pack("f", self.yaw)
-            + Buffer.pack("f", self.pitch)
-            + Buffer.pack("?", self.on_ground)
-        )
-
 
 class PlayEntityRotation(Packet):
     """Sent by the server when an entity rotates. (Server -> Client)
@@ -313,6 +312,13 @@ class PlayEntityRotation(Packet):
 
     id = 0x29
     to = 1
+    lane = LANE_MOVEMENT
+    schema = (
+        ("entity_id", "varint"),
+        ("yaw", "f"),
+        ("pitch", "f"),
+        ("on_ground", "?"),
+    )
 
     def __init__(self, entity_id: int, yaw: float, pitch: float, on_ground: bool) -> None:
         super().__init__()
@@ -322,35 +328,30 @@ class PlayEntityRotation(Packet):
         self.pitch = pitch
         self.on_ground = on_ground
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack_varint(self.entity_id)
-            + Buffer.pack("f", self.yaw)
-            + Buffer.pack("f", self.pitch)
-            + Buffer.pack("?", self.on_ground)
-        )
-
 
 class PlayEntityMovement(Packet):
     """insert fancy doscstring here (server -> client)"""
 
     id = 0x2A
     to = 1
+    lane = LANE_MOVEMENT
+    schema = (("entity_id", "varint"),)
 
     def __init__(self, entity_id: int) -> None:
         super().__init__()
 
         self.entity_id = entity_id
 
-    def encode(self) -> bytes:
-        return Buffer.pack_varint(self.entity_id)
-
 
 class PlayRemoveEntityEffect(Packet):
     """insert fancy doscstring here (server -> client)"""
 
     id = 0x37
     to = 1
+    schema = (
+        ("entity_id", "varint"),
+        ("effect_id", "b"),
+    )
 
     def __init__(self, entity_id: int, effect_id: int) -> None:
         super().__init__()
@@ -358,15 +359,17 @@ class PlayRemoveEntityEffect(Packet):
         self.entity_id = entity_id
         self.effect_id = effect_id
 
-    def encode(self) -> bytes:
-        return Buffer.pack_varint(self.entity_id) + Buffer.pack("b", self.effect_id)
-
 
 class PlayEntityHeadLook(Packet):
     """Insert fancy docstring here (server -> client)"""
 
     id = 0x3A
     to = 1
+    lane = LANE_MOVEMENT
+    schema = (
+        ("entity_id", "varint"),
+        ("head_yaw", "B"),
+    )
 
     def __init__(self, entity_id: int, head_yaw: int) -> None:
         super().__init__()
@@ -374,15 +377,16 @@ class PlayEntityHeadLook(Packet):
         self.entity_id = entity_id
         self.head_yaw = head_yaw
 
-    def encode(self) -> bytes:
-        return Buffer.pack_varint(self.entity_id) + Buffer.pack("B", self.head_yaw)
-
 
 class PlayAttachEntity(Packet):
     """Insert fancy docstring here (server -> client)"""
 
     id = 0x45
     to = 1
+    schema = (
+        ("attached_eid", "i"),
+        ("holding_eid", "i"),
+    )
 
     def __init__(self, attached_eid: int, holding_eid: int) -> None:
         super().__init__()
@@ -390,15 +394,19 @@ class PlayAttachEntity(Packet):
         self.attached_eid = attached_eid
         self.holding_eid = holding_eid
 
-    def encode(self) -> bytes:
-        return Buffer.pack("i", self.attached_eid) + Buffer.pack("i", self.holding_eid)
-
 
 class PlayEntityVelocity(Packet):
     """Insert fancy docstring here (server -> client)"""
 
     id = 0x46
     to = 1
+    lane = LANE_MOVEMENT
+    schema = (
+        ("eid", "varint"),
+        ("vel_x", "h"),
+        ("vel_y", "h"),
+        ("vel_z", "h"),
+    )
 
     def __init__(self, eid: int, velocity_x: int, velocity_y: int, velocity_z: int) -> None:
         super().__init__()
@@ -408,20 +416,22 @@ class PlayEntityVelocity(Packet):
         self.vel_y = velocity_y
         self.vel_z = velocity_z
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack_varint(self.eid)
-            + Buffer.pack("h", self.vel_x)
-            + Buffer.pack("h", self.vel_y)
-            + Buffer.pack("h", self.vel_z)
-        )
-
 
 class PlayEntityTeleport(Packet):
     """Insert fancy docstring here (server -> client)"""
 
     id = 0x56
     to = 1
+    lane = LANE_MOVEMENT
+    schema = (
+        ("eid", "varint"),
+        ("x", "d"),
+        ("y", "d"),
+        ("z", "d"),
+        ("yaw", "i"),
+        ("pitch", "i"),
+        ("on_ground", "?"),
+    )
 
     def __init__(
         self, eid: int, x: int, y: int, z: int, yaw: int, pitch: int, on_ground: bool
@@ -436,17 +446,6 @@ class PlayEntityTeleport(Packet):
         self.pitch = pitch
         self.on_ground = on_ground
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack_varint(self.eid)
-            + Buffer.pack("d", self.x)
-            + Buffer.pack("d", self.y)
-            + Buffer.pack("d", self.z)
-            + Buffer.pack("i", self.yaw)
-            + Buffer.pack("i", self.pitch)
-            + Buffer.pack("?", self.on_ground)
-        )
-
 
 class PlayDestroyEntities(Packet):
     """Insert fancy docstring here (server -> client)"""
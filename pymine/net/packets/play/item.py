@@ -153,21 +153,24 @@ class PlayHeldItemChangeClientBound(Packet):
 
     id = 0x3F
     to = 1
+    schema = (("slot", "b"),)
 
     def __init__(self, slot: int) -> None:
         super().__init__()
 
         self.slot = slot
 
-    def encode(self) -> bytes:
-        return Buffer.pack("b", self.slot)
-
 
 class PlayCollectItem(Packet):
     """Insert fancy docstring here (server -> client)"""
 
     id = 0x55
     to = 1
+    schema = (
+        ("collected_eid", "varint"),
+        ("collector_eid", "varint"),
+        ("item_count", "varint"),
+    )
 
     def __init__(self, collected_eid: int, collector_eid: int, item_count: int) -> None:
         super().__init__()
@@ -175,10 +178,3 @@ class PlayCollectItem(Packet):
         self.collected_eid = collected_eid
         self.collector_eid = collector_eid
         self.item_count = item_count
-
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack_varint(self.collected_eid)
-            + Buffer.pack_varint(self.collector_eid)
-            + Buffer.pack_varint(self.item_count)
-        )
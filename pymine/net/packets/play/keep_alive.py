@@ -19,7 +19,6 @@
 from __future__ import annotations
 
 from pymine.types.packet import Packet
-from pymine.types.buffer import Buffer
 
 __all__ = (
     "PlayKeepAliveClientBound",
@@ -38,15 +37,13 @@ class PlayKeepAliveClientBound(Packet):
 
     id = 0x1F
     to = 1
+    schema = (("keep_alive_id", "q"),)
 
     def __init__(self, keep_alive_id: int) -> None:
         super().__init__()
 
         self.keep_alive_id = keep_alive_id
 
-    def encode(self) -> bytes:
-        return Buffer.pack("q", self.keep_alive_id)
-
 
 class PlayKeepAliveServerBound(Packet):
     """Sent by client in order to maintain connection with server. (Client -> Server)
@@ -59,12 +56,9 @@ class PlayKeepAliveServerBound(Packet):
 
     id = 0x10
     to = 0
+    schema = (("keep_alive_id", "q"),)
 
     def __init__(self, keep_alive_id: int) -> None:
         super().__init__()
 
         self.keep_alive_id = keep_alive_id
-
-    @classmethod
-    def decode(cls, buf: Buffer) -> PlayKeepAliveServerBound:
-        return cls(buf.unpack("q"))
@@ -108,6 +108,12 @@ class PlayAcknowledgePlayerDigging(Packet):
 
     id = 0x07
     to = 1
+    schema = (
+        (("x", "y", "z"), "position"),
+        ("block", "varint"),
+        ("status", "varint"),
+        ("successful", "?"),
+    )
 
     def __init__(self, x: int, y: int, z: int, block: int, status: int, successful: bool) -> None:
         super().__init__()
@@ -117,14 +123,6 @@ class PlayAcknowledgePlayerDigging(Packet):
         self.status = status
         self.successful = successful
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack_position(self.x, self.y, self.z)
-            + Buffer.pack_varint(self.block)
-            + Buffer.pack_varint(self.status)
-            + Buffer.pack("?", self.successful)
-        )
-
 
 class PlayDisconnect(Packet):
     """Sent by the server before it disconnects a client. The client assumes that the server has already closed the connection by the time the packet arrives.
@@ -133,15 +131,13 @@ class PlayDisconnect(Packet):
 
     id = 0x19
     to = 1
+    schema = (("reason", "chat"),)
 
     def __init__(self, reason: Chat) -> None:
         super().__init__()
 
         self.reason = reason
 
-    def encode(self) -> bytes:
-        return Buffer.pack_chat(self.reason)
-
 
 class PlayPlayerAbilitiesClientBound(Packet):
     """Defines the player's abilities. (Server -> Client)
@@ -158,6 +154,11 @@ class PlayPlayerAbilitiesClientBound(Packet):
 
     id = 0x30
     to = 1
+    schema = (
+        ("flags", "b"),
+        ("flying_speed", "f"),
+        ("fov_modifier", "f"),
+    )
 
     def __init__(self, flags: int, flying_speed: float, fov_modifier: float) -> None:
         super().__init__()
@@ -166,13 +167,6 @@ class PlayPlayerAbilitiesClientBound(Packet):
         self.flying_speed = flying_speed
         self.fov_modifier = fov_modifier
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack("b", self.flags)
-            + Buffer.pack("f", self.flying_speed)
-            + Buffer.pack("f", self.fov_modifier)
-        )
-
 
 class PlayPlayerAbilitiesServerBound(Packet):
     """Tells the server whether the client is flying or not. (Client -> Server)
@@ -204,8 +198,10 @@ class PlayJoinGame(Packet):
     :param int gamemode: The player's gamemode.
     :param int prev_gamemode: The player's previous gamemode.
     :param list world_names: All of the worlds loaded on the server.
-    :param nbt.TAG dim_codec: Represents a dimension and biome registry, see here: https://wiki.vg/Protocol#Join_Game.
+    :param nbt.TAG dim_codec: Represents a dimension and biome registry, see here:
+        https://wiki.vg/Protocol#Join_Game. Can also be the already packed NBT.
     :param nbt.TAG dimension: A dimension type, see here: https://wiki.vg/Protocol#Join_Game.
+        Can also be the already packed NBT.
     :param str world_name: The name of the world the player is joining.
     :param int hashed_seed: First 8 bytes of SHA-256 hash of the world's seed.
     :param int max_players: Max players allowed on the server, now ignored.
@@ -243,8 +239,8 @@ class PlayJoinGame(Packet):
         gamemode: int,
         prev_gamemode: int,
         world_names: list,
-        dim_codec: nbt.TAG,
-        dimension: nbt.TAG,
+        dim_codec: nbt.TAG | bytes,
+        dimension: nbt.TAG | bytes,
         world_name: str,
         hashed_seed: int,
         max_players: int,
@@ -273,6 +269,14 @@ class PlayJoinGame(Packet):
         self.is_flat = is_flat
 
     def encode(self) -> bytes:
+        dim_codec, dimension = self.dim_codec, self.dimension
+
+        if not isinstance(dim_codec, bytes):
+            dim_codec = Buffer.pack_nbt(dim_codec)
+
+        if not isinstance(dimension, bytes):
+            dimension = Buffer.pack_nbt(dimension)
+
         return (
             Buffer.pack("i", self.entity_id)
             + Buffer.pack("?", self.is_hardcore)
@@ -280,8 +284,8 @@ class PlayJoinGame(Packet):
             + Buffer.pack("b", self.prev_gamemode)
             + Buffer.pack_varint(len(self.world_names))
             + b"".join([Buffer.pack_string(w) for w in self.world_names])
-            + Buffer.pack_nbt(self.dim_codec)
-            + Buffer.pack_nbt(self.dimension)
+            + dim_codec
+            + dimension
             + Buffer.pack_string(self.world_name)
             + Buffer.pack("q", self.hashed_seed)
             + Buffer.pack_varint(self.max_players)
@@ -310,6 +314,13 @@ class PlayPlayerPosition(Packet):
 
     id = 0x12
     to = 0
+    lazy = True
+    schema = (
+        ("x", "d"),
+        ("feet_y", "d"),
+        ("z", "d"),
+        ("on_ground", "?"),
+    )
 
     def __init__(self, x: float, feet_y: float, z: float, on_ground: bool) -> None:
         super().__init__()
@@ -319,10 +330,6 @@ class PlayPlayerPosition(Packet):
         self.z = z
         self.on_ground = on_ground
 
-    @classmethod
-    def decode(cls, buf: Buffer) -> PlayPlayerPosition:
-        return cls(buf.unpack("d"), buf.unpack("d"), buf.unpack("d"), buf.unpack("?"))
-
 
 class PlayPlayerPositionAndRotationServerBound(Packet):
     """Packet sent by the client to update both position and rotation. (Client -> Server)
@@ -345,6 +352,15 @@ class PlayPlayerPositionAndRotationServerBound(Packet):
 
     id = 0x13
     to = 0
+    lazy = True
+    schema = (
+        ("x", "d"),
+        ("feet_y", "d"),
+        ("z", "d"),
+        ("yaw", "f"),
+        ("pitch", "f"),
+        ("on_ground", "?"),
+    )
 
     def __init__(
         self, x: float, feet_y: float, z: float, yaw: float, pitch: float, on_ground: bool
@@ -358,17 +374,6 @@ class PlayPlayerPositionAndRotationServerBound(Packet):
         self.pitch = pitch
         self.on_ground = on_ground
 
-    @classmethod
-    def decode(cls, buf: Buffer) -> PlayPlayerPositionAndRotationServerBound:
-        return cls(
-            buf.unpack("d"),
-            buf.unpack("d"),
-            buf.unpack("d"),
-            buf.unpack("d"),
-            buf.unpack("d"),
-            buf.unpack("?"),
-        )
-
 
 class PlayPlayerPositionAndLookClientBound(Packet):
     """Insert fancy docstring here (server -> client)"""
@@ -409,6 +414,12 @@ class PlayPlayerRotation(Packet):
 
     id = 0x14
     to = 0
+    lazy = True
+    schema = (
+        ("yaw", "f"),
+        ("pitch", "f"),
+        ("on_ground", "?"),
+    )
 
     def __init__(self, yaw: float, pitch: float, on_ground: bool) -> None:
         super().__init__()
@@ -417,10 +428,6 @@ class PlayPlayerRotation(Packet):
         self.pitch = pitch
         self.on_ground = on_ground
 
-    @classmethod
-    def decode(cls, buf: Buffer) -> PlayPlayerRotation:
-        return cls(buf.unpack("d"), buf.unpack("d"), buf.unpack("?"))
-
 
 class PlayPlayerMovement(Packet):
     """Tells server whether client/player is on ground or not. (Client -> Server)
@@ -433,16 +440,14 @@ class PlayPlayerMovement(Packet):
 
     id = 0x15
     to = 0
+    lazy = True
+    schema = (("on_ground", "?"),)
 
     def __init__(self, on_ground: bool) -> None:
         super().__init__()
 
         self.on_ground = on_ground
 
-    @classmethod
-    def decode(cls, buf: Buffer) -> PlayPlayerMovement:
-        return cls(buf.unpack("?"))
-
 
 class PlayTeleportConfirm(Packet):
     """Sent by the client as a confirmation to a player position and look packet. (Client -> Server)
@@ -592,21 +597,23 @@ class PlayCamera(Packet):
 
     id = 0x3E
     to = 1
+    schema = (("camera_id", "varint"),)
 
     def __init__(self, camera_id: int) -> None:
         super().__init__()
 
         self.camera_id = camera_id
 
-    def encode(self) -> bytes:
-        return Buffer.pack_varint(self.camera_id)
-
 
 class PlayUpdateViewPosition(Packet):
     """insert fancy docstring here (server -> client)"""
 
     id = 0x40
     to = 1
+    schema = (
+        ("chunk_x", "varint"),
+        ("chunk_z", "varint"),
+    )
 
     def __init__(self, chunk_x: int, chunk_z: int) -> None:
         super().__init__()
@@ -614,30 +621,30 @@ class PlayUpdateViewPosition(Packet):
         self.chunk_x = chunk_x
         self.chunk_z = chunk_z
 
-    def encode(self) -> bytes:
-        return Buffer.pack_varint(self.chunk_x) + Buffer.pack_varint(self.chunk_z)
-
 
 class PlayUpdateViewDistance(Packet):
     """Insert fancy docstring here (server -> client)"""
 
     id = 0x41
     to = 1
+    schema = (("view_distance", "varint"),)
 
     def __init__(self, view_distance: int) -> None:
         super().__init__()
 
         self.view_distance = view_distance
 
-    def encode(self) -> bytes:
-        return Buffer.pack_varint(self.view_distance)
-
 
 class PlaySetExperience(Packet):
     """Insert fancy docstring here (server -> client)"""
 
     id = 0x48
     to = 1
+    schema = (
+        ("xp_bar", "f"),
+        ("lvl", "varint"),
+        ("total_xp", "varint"),
+    )
 
     def __init__(self, xp_bar: float, lvl: int, total_xp: int) -> None:
         super().__init__()
@@ -646,19 +653,17 @@ class PlaySetExperience(Packet):
         self.lvl = lvl
         self.total_xp = total_xp
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack("f", self.xp_bar)
-            + Buffer.pack_varint(self.lvl)
-            + Buffer.pack_varint(self.total_xp)
-        )
-
 
 class PlayUpdateHealth(Packet):
     """Insert fancy docstring here (server -> client)"""
 
     id = 0x49
     to = 1
+    schema = (
+        ("health", "f"),
+        ("food", "varint"),
+        ("saturation", "f"),
+    )
 
     def __init__(self, health: float, food: int, saturation: float) -> None:
         super().__init__()
@@ -667,13 +672,6 @@ class PlayUpdateHealth(Packet):
         self.food = food
         self.saturation = saturation
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack("f", self.health)
-            + Buffer.pack_varint(self.food)
-            + Buffer.pack("f", self.saturation)
-        )
-
 
 class PlayCombatEvent(Packet):
     """Sent by the server to display the game over screen. (Server -> Client)
@@ -859,6 +857,16 @@ class PlayRespawn(Packet):
 
     id = 0x39
     to = 1
+    schema = (
+        ("dimension", "nbt"),
+        ("world_name", "string"),
+        ("hashed_seed", "q"),
+        ("gamemode", "B"),
+        ("prev_gamemode", "B"),
+        ("is_debug", "?"),
+        ("is_flat", "?"),
+        ("copy_metadata", "?"),
+    )
 
     def __init__(
         self,
@@ -881,15 +889,3 @@ class PlayRespawn(Packet):
         self.is_debug = is_debug
         self.is_flat = is_flat
         self.copy_metadata = copy_metadata
-
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack_nbt(self.dimension)
-            + Buffer.pack_string(self.world_name)
-            + Buffer.pack("l", self.hashed_seed)
-            + Buffer.pack("B", self.gamemode)
-            + Buffer.pack("B", self.prev_gamemode)
-            + Buffer.pack("?", self.is_debug)
-            + Buffer.pack("?", self.is_flat)
-            + Buffer.pack("?", self.copy_metadata)
-        )
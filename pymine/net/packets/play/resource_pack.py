@@ -62,12 +62,13 @@ class PlayResourcePackSend(Packet):
 
     id = 0x38
     to = 1
+    schema = (
+        ("url", "string"),
+        ("hash_", "string"),
+    )
 
     def __init__(self, url: str, hash_: str) -> None:
         super().__init__()
 
         self.url = url
         self.hash_ = hash_
-
-    def encode(self) -> bytes:
-        return Buffer.pack_string(self.url) + Buffer.pack_string(self.hash_)
@@ -35,6 +35,10 @@ class PlayDisplayScoreboard(Packet):
 
     id = 0x43
     to = 1
+    schema = (
+        ("pos", "b"),
+        ("score", "string"),
+    )
 
     def __init__(self, position: int, score_name: str) -> None:
         super().__init__()
@@ -42,9 +46,6 @@ class PlayDisplayScoreboard(Packet):
         self.pos = position
         self.score = score_name
 
-    def encode(self) -> bytes:
-        return Buffer.pack("b", self.pos) + Buffer.pack_string(self.score)
-
 
 class PlayUpdateScore(Packet):
     """Insert fancy doscstring here (server -> client)"""
@@ -72,6 +72,13 @@ class PlayEntitySoundEffect(Packet):
 
     id = 0x50
     to = 1
+    schema = (
+        ("sound_id", "varint"),
+        ("category", "varint"),
+        ("eid", "varint"),
+        ("volume", "f"),
+        ("pitch", "f"),
+    )
 
     def __init__(self, sound_id: int, category: int, eid: int, volume: float, pitch: float) -> None:
         super().__init__()
@@ -82,15 +89,6 @@ class PlayEntitySoundEffect(Packet):
         self.volume = volume
         self.pitch = pitch
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack_varint(self.sound_id)
-            + Buffer.pack_varint(self.category)
-            + Buffer.pack_varint(self.eid)
-            + Buffer.pack("f", self.volume)
-            + Buffer.pack("f", self.pitch)
-        )
-
 
 class PlayStopSound(Packet):
     """Sent by the server to stop a sound. (Server -> Client)
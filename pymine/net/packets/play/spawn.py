@@ -88,6 +88,13 @@ class PlaySpawnExperienceOrb(Packet):
 
     id = 0x01
     to = 1
+    schema = (
+        ("entity_id", "varint"),
+        ("x", "d"),
+        ("y", "d"),
+        ("z", "d"),
+        ("count", "h"),
+    )
 
     def __init__(
         self, entity_id: int, x: int = 0, y: int = 0, z: int = 0, count: int = 1237
@@ -98,15 +105,6 @@ class PlaySpawnExperienceOrb(Packet):
         self.x, self.y, self.z = x, y, z
         self.count = count
 
-    def encode(self):
-        return (
-            Buffer.pack_varint(self.entity_id)
-            + Buffer.pack("d", self.x)
-            + Buffer.pack("d", self.y)
-            + Buffer.pack("d", self.z)
-            + Buffer.pack("h", self.count)
-        )
-
 
 class PlayLivingEntitySpawn(Packet):
     """Sent by the server when a living entity is spawned.  Client bound(Server -> Client)."""
@@ -192,6 +190,15 @@ class PlaySpawnPlayer(Packet):
 
     id = 0x04
     to = 1
+    schema = (
+        ("entity_id", "varint"),
+        ("player_uuid", "uuid"),
+        ("x", "d"),
+        ("y", "d"),
+        ("z", "d"),
+        ("pitch", "B"),
+        ("yaw", "B"),
+    )
 
     def __init__(
         self, entity_id: int, player_uuid: uuid.UUID, x: int, y: int, z: int, pitch: int, yaw: int
@@ -203,28 +210,15 @@ class PlaySpawnPlayer(Packet):
         self.x, self.y, self.z = x, y, z
         self.pitch, self.yaw = pitch, yaw
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack_varint(self.entity_id)
-            + Buffer.pack_uuid(self.player_uuid)
-            + Buffer.pack("d", self.x)
-            + Buffer.pack("d", self.y)
-            + Buffer.pack("d", self.z)
-            + Buffer.pack("B", self.pitch)
-            + Buffer.pack("B", self.yaw)
-        )
-
 
 class PlaySpawnPosition(Packet):
     """insert fancy docstring here (server -> client)"""
 
     id = 0x42
     to = 1
+    schema = ((("x", "y", "z"), "position"),)
 
     def __init__(self, x: int, y: int, z: int) -> None:
         super().__init__()
 
         self.x, self.y, self.z = x, y, z
-
-    def encode(self) -> bytes:
-        return Buffer.pack_position(self.x, self.y, self.z)
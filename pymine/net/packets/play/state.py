@@ -19,7 +19,6 @@
 from __future__ import annotations
 
 from pymine.types.packet import Packet
-from pymine.types.buffer import Buffer
 
 __all__ = ("PlayChangeGameState",)
 
@@ -29,12 +28,13 @@ class PlayChangeGameState(Packet):
 
     id = 0x1D
     to = 1
+    schema = (
+        ("reason", "B"),
+        ("value", "f"),
+    )
 
     def __init__(self, reason: int, value: float) -> None:
         super().__init__()
 
         self.reason = reason
         self.value = value
-
-    def encode(self) -> bytes:
-        return Buffer.pack("B", self.reason) + Buffer.pack("f", self.value)
@@ -82,8 +82,7 @@ class PlayTags(Packet):
                 # pack identifier name and  length of upcoming array
                 out += Buffer.pack_string(identifier) + Buffer.pack_varint(len(tags[identifier]))
 
-                for value in tags[identifier]:
-                    # values should be encoded as varints, so we need their id
-                    out += Buffer.pack_varint(REG.encode(value))
+                # values should be encoded as varints, so we need their id
+                out += Buffer.pack_varints([REG.encode(value) for value in tags[identifier]])
 
         return out
@@ -19,7 +19,6 @@
 from __future__ import annotations
 
 from pymine.types.packet import Packet
-from pymine.types.buffer import Buffer
 
 __all__ = ("PlayUpdateTime",)
 
@@ -37,12 +36,13 @@ class PlayUpdateTime(Packet):
 
     id = 0x4E
     to = 1
+    schema = (
+        ("world_age", "q"),
+        ("day_time", "q"),
+    )
 
     def __init__(self, world_age: int, day_time: int) -> None:
         super().__init__()
 
         self.world_age = world_age
         self.day_time = day_time
-
-    def encode(self) -> bytes:
-        return Buffer.pack("l", self.world_age) + Buffer.pack("l", self.day_time)
@@ -18,6 +18,7 @@
 
 from __future__ import annotations
 
+from pymine.types.send_queue import LANE_MOVEMENT
 from pymine.types.packet import Packet
 from pymine.types.buffer import Buffer
 
@@ -49,6 +50,14 @@ class PlayVehicleMoveServerBound(Packet):
 
     id = 0x16
     to = 0
+    lazy = True
+    schema = (
+        ("x", "d"),
+        ("y", "d"),
+        ("z", "d"),
+        ("yaw", "f"),
+        ("pitch", "f"),
+    )
 
     def __init__(self, x: float, y: float, z: float, yaw: float, pitch: float) -> None:
         super().__init__()
@@ -57,12 +66,6 @@ class PlayVehicleMoveServerBound(Packet):
         self.yaw = yaw
         self.pitch = pitch
 
-    @classmethod
-    def decode(cls, buf: Buffer) -> PlayVehicleMoveServerBound:
-        return cls(
-            buf.unpack("d"), buf.unpack("d"), buf.unpack("d"), buf.unpack("f"), buf.unpack("f")
-        )
-
 
 class PlayVehicleMoveClientBound(Packet):
     """Sent by the server when a vehicle moves. (Server -> Client)
@@ -83,6 +86,14 @@ class PlayVehicleMoveClientBound(Packet):
 
     id = 0x2B
     to = 1
+    lane = LANE_MOVEMENT
+    schema = (
+        ("x", "d"),
+        ("y", "d"),
+        ("z", "d"),
+        ("yaw", "f"),
+        ("pitch", "f"),
+    )
 
     def __init__(self, x: float, y: float, z: float, yaw: float, pitch: float) -> None:
         super().__init__()
@@ -91,15 +102,6 @@ class PlayVehicleMoveClientBound(Packet):
         self.yaw = yaw
         self.pitch = pitch
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack("d", self.x)
-            + Buffer.pack("d", self.y)
-            + Buffer.pack("d", self.z)
-            + Buffer.pack("f", self.yaw)
-            + Buffer.pack("f", self.pitch)
-        )
-
 
 class PlaySteerBoat(Packet):
     """Used to visually update when the boat paddles are turning. (Client -> Server)
@@ -53,6 +53,11 @@ class PlayOpenWindow(Packet):
 
     id = 0x2D
     to = 1
+    schema = (
+        ("window_id", "varint"),
+        ("window_type", "varint"),
+        ("title", "chat"),
+    )
 
     def __init__(self, window_id: int, window_type: int, title: Chat) -> None:
         super().__init__()
@@ -61,13 +66,6 @@ class PlayOpenWindow(Packet):
         self.window_type = window_type
         self.title = title
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack_varint(self.window_id)
-            + Buffer.pack_varint(self.window_type)
-            + Buffer.pack_chat(self.title)
-        )
-
 
 class PlayWindowConfirmationClientBound(Packet):
     """A packet indicating whether a request from the client was accepted or if there was a problem.
@@ -75,6 +73,11 @@ class PlayWindowConfirmationClientBound(Packet):
 
     id = 0x11
     to = 1
+    schema = (
+        ("window_id", "b"),
+        ("action_number", "h"),
+        ("accepted", "?"),
+    )
 
     def __init__(self, window_id: int, action_number: int, accepted: bool) -> None:
         super().__init__()
@@ -83,13 +86,6 @@ class PlayWindowConfirmationClientBound(Packet):
         self.action_number = action_number
         self.accepted = accepted
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack("b", self.window_id)
-            + Buffer.pack("h", self.action_number)
-            + Buffer.pack("?", self.accepted)
-        )
-
 
 class PlayWindowConfirmationServerBound(Packet):
     """Used by the client to respond to a nearly identical packet by the server. (Client -> Server)
@@ -223,15 +219,13 @@ class PlayCloseWindowClientBound(Packet):
 
     id = 0x12
     to = 1
+    schema = (("window_id", "B"),)
 
     def __init__(self, window_id: int) -> None:
         super().__init__()
 
         self.window_id = window_id
 
-    def encode(self) -> bytes:
-        return Buffer.pack("B", self.window_id)
-
 
 class PlayWindowItems(Packet):
     """Sent by the server when multiple slots in an inventory window are updated (Server -> Client)
@@ -268,6 +262,11 @@ class PlayWindowProperty(Packet):
 
     id = 0x14
     to = 1
+    schema = (
+        ("window_id", "B"),
+        ("prop", "h"),
+        ("value", "h"),
+    )
 
     def __init__(self, window_id: int, prop: int, value: int) -> None:
         super().__init__()
@@ -276,13 +275,6 @@ class PlayWindowProperty(Packet):
         self.prop = prop
         self.value = value
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack("B", self.window_id)
-            + Buffer.pack("h", self.prop)
-            + Buffer.pack("h", self.value)
-        )
-
 
 class PlaySetSlot(Packet):
     """Sent by the server when an item in a slot (in a window) is added/removed."""
@@ -320,6 +312,11 @@ class PlayOpenHorseWindow(Packet):
 
     id = 0x1E
     to = 1
+    schema = (
+        ("window_id", "b"),
+        ("num_slots", "varint"),
+        ("entity_id", "i"),
+    )
 
     def __init__(self, window_id: int, num_slots: int, entity_id: int) -> None:
         super().__init__()
@@ -328,13 +325,6 @@ class PlayOpenHorseWindow(Packet):
         self.num_slots = num_slots
         self.entity_id = entity_id
 
-    def encode(self) -> bytes:
-        return (
-            Buffer.pack("b", self.window_id)
-            + Buffer.pack_varint(self.num_slots)
-            + Buffer.pack("i", self.entity_id)
-        )
-
 
 class PlayOpenSignEditor(Packet):
     """Sent after a client places a sign, opens the sign editor GUI. (Server -> Client)
@@ -351,11 +341,9 @@ class PlayOpenSignEditor(Packet):
 
     id = 0x2E
     to = 1
+    schema = ((("x", "y", "z"), "position"),)
 
     def __init__(self, x: int, y: int, z: int) -> None:
         super().__init__()
 
         self.x, self.y, self.z = x, y, z
-
-    def encode(self) -> bytes:
-        return Buffer.pack_position(self.x, self.y, self.z)
@@ -55,6 +55,7 @@ class StatusStatusResponse(Packet):
 
     id = 0x00
     to = 1
+    schema = (("response_data", "json"),)
 
     def __init__(self, response_data: dict) -> None:
         # What response_data should be like
@@ -83,9 +84,6 @@ class StatusStatusResponse(Packet):
 
         self.response_data = response_data
 
-    def encode(self) -> bytes:
-        return Buffer.pack_json(self.response_data)
-
 
 class StatusStatusPingPong(Packet):
     """Ping pong? (Server -> Client AND Client -> Server)
@@ -97,15 +95,9 @@ class StatusStatusPingPong(Packet):
 
     id = 0x01
     to = 2
+    schema = (("payload", "q"),)
 
     def __init__(self, payload: int) -> None:
         super().__init__()
 
         self.payload = payload
-
-    @classmethod
-    def decode(cls, buf: Buffer) -> StatusStatusPingPong:
-        return cls(buf.unpack("q"))
-
-    def encode(self) -> bytes:
-        return Buffer.pack("q", self.payload)
@@ -17,19 +17,28 @@
 from prompt_toolkit.enums import EditingMode
 import asyncio
 import aiohttp
-import struct
 import socket
 import random
+import uuid
+import os
 
-from pymine.api.errors import ServerBindingError, InvalidPacketID, StopHandling
+from pymine.api.errors import ServerBindingError, InvalidPacketData, InvalidPacketID, StopHandling
+from pymine.types.send_queue import EgressLimiter, SendQueue, LANE_CONTROL
 from pymine.logic.config import load_favicon, load_config
 from pymine.logic.worldio import load_worlds, ChunkIO
-from pymine.util.encryption import gen_rsa_keys
+from pymine.util.encryption import gen_rsa_keys, gen_aes_cipher
 from pymine.logic.playerio import PlayerDataIO
+from pymine.logic.status_cache import StatusCache
+from pymine.logic.session_auth import SessionAuth
+from pymine.logic.keep_alive import KeepAlive
+from pymine.logic.front_end import FrontEndHub
+from pymine.logic.join_frames import JoinFrames
+from pymine.logic.chunk_frames import ChunkFrames
 from pymine.net.packet_map import PACKET_MAP
 from pymine.logic.query import QueryServer
+from pymine.types.connection import Connection
 from pymine.types.stream import Stream
-from pymine.types.packet import Packet
+from pymine.types.packet import Packet, LazyPacket
 from pymine.types.buffer import Buffer
 from pymine.api import PyMineAPI
 
@@ -50,19 +59,12 @@ class Server:
             self.rsa_private = rsa_private
             self.rsa_public = rsa_public
 
-    class Cache:
-        def __init__(self):
-            self.states = {}  # {remote: state}
-            self.login = {}  # {remote: {username: username, verify: verify token}}
-            self.uuid = {}  # {remote: uuid as int}
-
     def __init__(self, console, process_executor, thread_executor):
         self.console = console  # console instance (see pymine/api/console.py)
         self.process_executor = process_executor  # the process pool executor instance
         self.thread_executor = thread_executor  # the thread pool executor instance
 
         self.meta = self.Meta()
-        self.cache = self.Cache()
         self.secrets = self.Secrets(*gen_rsa_keys())
 
         self.conf = load_config()  # contents of server.yml in the root dir
@@ -75,7 +77,16 @@ class Server:
 
         self.console.ses.vi_mode = self.conf["vi_mode"]
         self.console.set_prompt(self.conf["prompt"])
-        self.console.debug_ = self.conf["debug"]
+        self.console.set_debug(self.conf["debug"])
+        self.console.set_limits(self.conf["log_max_queued"], self.conf["log_rate_limit"])
+
+        if self.conf["log_file"]:
+            self.console.add_file_sink(
+                self.conf["log_file"],
+                self.conf["log_file_max_bytes"],
+                self.conf["log_file_backups"],
+            )
+
         self.console.debug("Debug mode enabled.")
 
         self.port = self.conf["server_port"]
@@ -92,7 +103,17 @@ class Server:
         self.worlds = None  # world dictionary
         self.generator = None  # the world generator
 
+        self.join_frames = JoinFrames(self)  # packets sent to every joining player, pre-encoded
+        self.status_cache = StatusCache(self)  # the cached response to server list pings
+        self.chunk_frames = ChunkFrames(self)  # the packed frames of chunks, shared by all players
+        self.session_auth = SessionAuth(self)  # used to authenticate logins in online mode
+        self.keep_alive = KeepAlive(self)  # times out connections and sends keep alives
+        # the EgressLimiter shared by all connections, None if egress isn't capped
+        self.egress = None
+        self.unhandled_packets = set()  # packet classes received without a handler, warned once
+        self.dispatch = None  # the api's packet dispatch table, see Register.get_packet_handlers()
         self.query_server = None  # the QueryServer instance
+        self.front_end = None  # the FrontEndHub instance, None unless front end workers are used
         self.api = None  # the api instance
         self.aiohttp = None  # the aiohttp session
         self.server = None  # the actual underlying asyncio server
@@ -101,15 +122,21 @@ class Server:
         self.console.out.set_title(self.meta.pymine)
 
         try:
-            self.server = await asyncio.start_server(
-                self.handle_connection, host=self.addr, port=self.port
-            )
+            if self.conf["front_end_workers"] <= 0:  # else the workers listen on the port instead
+                self.server = await asyncio.start_server(
+                    self.handle_connection, host=self.addr, port=self.port
+                )
         except OSError as e:
             if e.errno == 98:
                 raise ServerBindingError("PyMine", self.addr, self.port)
 
             raise
 
+        self.keep_alive.start()
+
+        if self.conf["outbound_egress_cap"] > 0:
+            self.egress = EgressLimiter(self.conf["outbound_egress_cap"])
+
         if self.conf["enable_query"]:
             self.query_server = QueryServer(self)
             await self.query_server.start()
@@ -117,8 +144,12 @@ class Server:
         self.aiohttp = aiohttp.ClientSession()
 
         self.api = PyMineAPI(self)
+        self.dispatch = self.api.register._dispatch  # updated in place as handlers are registered
         await self.api.init()
 
+        # plugins are loaded now, and may have changed the tags, brand etc. sent to joining players
+        self.join_frames.rebuild()
+
         # 24 / the second arg (the max chunk cache size per world instance), should be dynamically changed based on the
         # amount of players online on each world, probably something like (len(players)*24)
         self.worlds = await load_worlds(self, self.conf["level_name"], 1000)
@@ -133,12 +164,20 @@ class Server:
             self.console.error("Invalid world generator chosen in server.yml.")
             return
 
+        # started last, as the workers hand off players and want the status right away
+        if self.conf["front_end_workers"] > 0:
+            self.front_end = FrontEndHub(self, self.conf["front_end_workers"])
+            await self.front_end.start()
+
         self.console.info(f"PyMine {self.meta.server:.1f} started on {self.addr}:{self.port}!")
 
         self.api.trigger_handlers(self.api.register._on_server_start)
 
         try:
-            await self.server.serve_forever()
+            if self.front_end is not None:
+                await self.front_end.serve_forever()
+            else:
+                await self.server.serve_forever()
         except asyncio.CancelledError:
             pass
 
@@ -151,9 +190,14 @@ class Server:
             self.server.close()
             await self.server.wait_closed()
 
+        if self.front_end is not None:
+            self.front_end.stop()
+
         if self.query_server is not None:
             self.query_server.stop()
 
+        self.keep_alive.stop()
+
         if self.api is not None:
             await self.api.stop()
 
@@ -162,122 +206,217 @@ class Server:
 
         self.console.info("Server closed.")
 
-    async def close_connection(self, stream: Stream):  # Close a connection to a client
+    async def close_connection(self, conn: Connection):  # Close a connection to a client
         try:
-            await stream.drain()
+            await conn.send_queue.close()
         except (ConnectionResetError, BrokenPipeError):
             pass
 
         try:
-            stream.close()
-            await stream.wait_closed()
+            conn.stream.close()
+            await conn.stream.wait_closed()
         except (ConnectionResetError, BrokenPipeError):
             pass
 
-        try:
-            del self.cache.states[stream.remote]
-        except KeyError:
-            pass
+        player = conn.player
 
-        try:
-            del self.cache.login[stream.remote]
-        except KeyError:
-            pass
+        if player is not None:
+            conn.player = player.conn = None
 
-        try:
-            del self.playerio.cache[self.cache.uuid[stream.remote]]
-        except KeyError:
-            pass
+            self.playerio.cache.pop(int(player.uuid), None)
+            self.status_cache.invalidate()
 
-        try:
-            del self.cache.uuid[stream.remote]
-        except KeyError:
-            pass
+            if self.query_server is not None:
+                self.query_server.invalidate()
 
-        self.console.debug(f"Disconnected nicely from {stream.remote[0]}:{stream.remote[1]}.")
+        if self.console.debug_:
+            self.console.debug(f"Disconnected nicely from {conn.remote[0]}:{conn.remote[1]}.")
 
-        return False, stream
+        return False, conn
 
-    async def send_packet(self, stream: Stream, packet: Packet, comp_thresh=None):
-        self.console.debug(f"OUT: state:-1 | id:0x{packet.id:02X} | packet:{type(packet).__name__}")
+    async def send_packet(self, conn: Connection, packet: Packet, comp_thresh=None):
+        if self.console.debug_:
+            self.console.debug(
+                f"OUT: state:-1 | id:0x{packet.id:02X} | packet:{type(packet).__name__}"
+            )
 
         if comp_thresh is None:
-            comp_thresh = self.comp_thresh
+            comp_thresh = conn.comp_thresh
+
+        data = Buffer.pack_varint(packet.id) + packet.encode()
 
-        stream.write(Buffer.pack_packet(packet, comp_thresh))
-        await stream.drain()
+        if not self.offloads(data, comp_thresh):
+            await self.send_raw(
+                conn, Buffer.pack_frame(data, comp_thresh, packet.comp_level), packet.lane
+            )
+            return
 
-    async def broadcast_packet(
-        self, packet: Packet
-    ):  # should broadcast a packet to all connected clients in the play state
-        self.console.debug(f"BROADCAST:      id:0x{packet.id:02X} | packet:{type(packet).__name__}")
+        # its place is reserved first, so frames sent while it's compressed can't overtake it
+        queue = conn.send_queue
+        pending = queue.reserve(packet.lane)
+        frame = b""
 
-        senders = []
+        try:
+            frame = await self.pack_frame(data, comp_thresh, packet.comp_level)
+        finally:
+            queue.fill(pending, frame)  # left empty if packing failed, else it'd hold up the lane
 
-        for p in self.playerio.cache.values():
-            if p.stream is not None:
-                senders.append(self.send_packet(p.stream, packet))
+        if queue.pressured:
+            await queue.drain()
 
-        await asyncio.gather(*senders)
+    def offloads(self, data: bytes, comp_thresh: int) -> bool:
+        """Whether pack_frame() compresses the data in the thread executor, so it can yield."""
 
-    async def handle_packet(
-        self, stream: Stream
-    ):  # Handle / respond to packets, this is called in a loop
-        packet_length = 0
-
-        # Basically an implementation of Buffer.unpack_varint()
-        # except designed to read directly from a a StreamReader
-        # and also to handle legacy server list ping packets
-        for i in range(3):
-            try:
-                read = await asyncio.wait_for(stream.read(1), 30)
-            except asyncio.TimeoutError:
-                self.console.debug("Closing due to timeout on read...")
-                raise StopHandling
+        return 1 <= comp_thresh <= len(data) and len(data) >= self.conf["comp_offload_size"]
 
-            if read == b"":
-                self.console.debug("Closing due to invalid read....")
-                raise StopHandling
+    async def pack_frame(self, data: bytes, comp_thresh: int, comp_level: int = -1) -> bytes:
+        """Packs encoded packet data into a frame (see Buffer.pack_frame()).
 
-            if i == 0 and read == b"\xFE":
-                self.console.warn("Legacy ping attempted, legacy ping is not supported.")
-                raise StopHandling
+        Data which is at least comp_offload_size bytes long is compressed in the thread executor,
+        zlib releases the GIL so this keeps big packets like chunk data from blocking the loop.
+        """
 
-            b = struct.unpack(">B", read)[0]
-            packet_length |= (b & 0x7F) << 7 * i
+        if self.offloads(data, comp_thresh):
+            return await asyncio.get_event_loop().run_in_executor(
+                self.thread_executor, Buffer.pack_frame, data, comp_thresh, comp_level
+            )
 
-            if not b & 0x80:
-                break
+        return Buffer.pack_frame(data, comp_thresh, comp_level)
+
+    async def send_raw(self, conn: Connection, frame: bytes, lane: int = LANE_CONTROL):
+        """Queues an already packed frame (see Buffer.pack_packet()) to be sent to a client."""
+
+        queue = conn.send_queue
+        queue.push(frame, lane)
+
+        if queue.pressured:  # only wait when the client isn't keeping up
+            await queue.drain()
+
+    async def broadcast_packet(self, packet: Packet, players: list = None):
+        """Broadcasts a packet to the given players, or all players in the play state if None.
+
+        The packet is only encoded once, and only packed/compressed once per compression setting.
+        """
+
+        if self.console.debug_:
+            self.console.debug(
+                f"BROADCAST:      id:0x{packet.id:02X} | packet:{type(packet).__name__}"
+            )
+
+        await self.broadcast_raw(
+            Buffer.pack_varint(packet.id) + packet.encode(), players, packet.lane, packet.comp_level
+        )
+
+    async def broadcast_raw(
+        self, data: bytes, players: list = None, lane: int = LANE_CONTROL, comp_level: int = -1
+    ):
+        """Broadcasts already encoded packet data (the packet id + the encoded packet) to players.
+
+        :param bytes data: The encoded packet, like Buffer.pack_varint(packet.id) + packet.encode().
+        :param list players: The players to send the packet to, all in the play state if None.
+        :param int lane: The SendQueue lane to send the packet in.
+        :param int comp_level: The zlib compression level to use.
+        """
+
+        if players is None:
+            players = self.playerio.cache.values()
+
+        # every player's place is reserved before anything is packed, since compressing the frame
+        # can yield to the event loop and frames sent meanwhile mustn't overtake it
+        reserved = {}  # {comp_thresh: [(queue, pending frame)]}
 
-        if packet_length & (1 << 31):
-            packet_length -= 1 << 32
+        for player in players:
+            conn = player.conn
 
-        buf = Buffer(await stream.read(packet_length))
+            if conn is not None:
+                reserved.setdefault(conn.comp_thresh, []).append(
+                    (conn.send_queue, conn.send_queue.reserve(lane))
+                )
+
+        queues = []
+
+        try:
+            for comp_thresh, places in reserved.items():
+                frame = await self.pack_frame(data, comp_thresh, comp_level)
+
+                # encrypted streams only have to encrypt the already packed frame
+                for queue, pending in places:
+                    queue.fill(pending, frame)
+
+                    if queue.pressured:
+                        queues.append(queue)
+        finally:
+            # if packing failed the places are left empty, else they'd hold up their lanes
+            for places in reserved.values():
+                for queue, pending in places:
+                    if pending.frame is None:
+                        queue.fill(pending, b"")
+
+        # a client disconnecting shouldn't stop the packet from being sent to everyone else
+        await asyncio.gather(*[queue.drain() for queue in queues], return_exceptions=True)
+
+    async def handle_packet(
+        self, conn: Connection
+    ) -> None:  # Handle / respond to packets, this is called in a loop
+        stream = conn.stream
+        state = conn.state
+
+        try:
+            # legacy server list pings can only be the first thing sent by a client
+            if state == 0 and await stream.peek(1) == b"\xFE":
+                self.console.warn("Legacy ping attempted, legacy ping is not supported.")
+                raise StopHandling
 
-        state = self.cache.states.get(stream.remote, 0)
+            buf = Buffer(await stream.read_frame())
+        except asyncio.IncompleteReadError:
+            if stream.timed_out:
+                self.console.debug("Closing due to timeout on read...")
+            elif conn.send_queue.overflowed:
+                self.console.warn("Closing due to the client not keeping up with sent data...")
+            else:
+                self.console.debug("Closing due to invalid read....")
+
+            raise StopHandling
+        except InvalidPacketData as e:
+            self.console.warn(f"Closing due to invalid frame: {e.msg}")
+            raise StopHandling
 
         try:
-            packet = buf.unpack_packet(state, PACKET_MAP)
+            packet_class = buf.unpack_packet_class(
+                state, PACKET_MAP, conn.comp_thresh, conn.inflater
+            )
         except InvalidPacketID:
             self.console.warn("Invalid packet ID received.")
-            return stream
-
-        self.console.debug(
-            f"IN : state: {state} | id:0x{packet.id:02X} | packet:{type(packet).__name__}"
-        )
+            return
+        except InvalidPacketData as e:
+            self.console.warn(f"Closing due to invalid packet: {e.msg}")
+            raise StopHandling
 
-        if self.api.register._on_packet[state].get(packet.id) is None:
-            self.console.warn(
-                f"No packet handler found for packet: 0x{packet.id:02X} {type(packet).__name__}"
+        if self.console.debug_:
+            self.console.debug(
+                f"IN : state: {state} | id:0x{packet_class.id:02X} | packet:{packet_class.__name__}"
             )
-            return stream
 
-        for handler in self.api.register._on_packet[state][packet.id].values():
-            try:
-                res = await handler(stream, packet)
+        handlers = self.dispatch[state << 8 | packet_class.id]
+
+        if handlers is None:  # nothing would use the packet, so it isn't decoded at all
+            if packet_class not in self.unhandled_packets:
+                self.unhandled_packets.add(packet_class)
+                self.console.warn(
+                    "No packet handler found for packet: "
+                    f"0x{packet_class.id:02X} {packet_class.__name__}"
+                )
+
+            return
+
+        if packet_class.lazy:
+            packet = LazyPacket(packet_class, buf)
+        else:
+            packet = packet_class.decode(buf)
 
-                if isinstance(res, Stream):
-                    stream = res
+        for handler in handlers:
+            try:
+                await handler(conn, packet)
             except StopHandling:
                 raise
             except BaseException as e:
@@ -285,17 +424,80 @@ class Server:
                     f"Error occurred in {handler.__module__}.{handler.__qualname__}: {self.console.f_traceback(e)}"
                 )
 
-        return stream
+    def new_connection(self, reader, writer) -> Connection:
+        stream = Stream(reader, writer)
+
+        conn = Connection(stream)
+        conn.send_queue = SendQueue(
+            stream,
+            self.conf["outbound_flush_interval"],
+            self.conf["outbound_high_water"],
+            self.conf["outbound_low_water"],
+            self.conf["outbound_max_buffered"],
+            self.conf["outbound_player_budget"],
+            self.egress,
+        )
+
+        self.keep_alive.track(conn)
+
+        return conn
 
     async def handle_connection(self, reader, writer):  # Handle a connection from a client
-        stream = Stream(reader, writer)
-        self.console.debug(f"Connection received from {stream.remote[0]}:{stream.remote[1]}.")
+        conn = self.new_connection(reader, writer)
+
+        if self.console.debug_:
+            self.console.debug(f"Connection received from {conn.remote[0]}:{conn.remote[1]}.")
+
+        await self.serve_connection(conn)
+
+    async def adopt_connection(self, handoff: dict, fd: int):
+        """Continues a connection logged in by a front end worker, see pymine/logic/front_end.py."""
+
+        # pymine.logic.join imports the server instance from here
+        from pymine.logic.join import join
+
+        try:
+            reader, writer = await asyncio.open_connection(sock=socket.socket(fileno=fd))
+        except OSError:  # the client disconnected before the connection was received
+            os.close(fd)
+            return
+
+        conn = self.new_connection(reader, writer)
+        conn.state = 3  # play, the worker already sent LoginSuccess
+
+        if handoff["shared_key"] is not None:
+            shared_key = bytes.fromhex(handoff["shared_key"])
+
+            conn.enable_encryption(
+                gen_aes_cipher(shared_key, bytes.fromhex(handoff["encrypt_iv"])),
+                gen_aes_cipher(shared_key, bytes.fromhex(handoff["decrypt_iv"])),
+            )
+
+        conn.stream.read_buf += bytes.fromhex(handoff["read_buf"])  # already decrypted
+
+        if handoff["comp_thresh"] > 0:
+            conn.enable_compression(handoff["comp_thresh"])
+
+        if self.console.debug_:
+            self.console.debug(
+                f"Connection received from {conn.remote[0]}:{conn.remote[1]} (via the front end)."
+            )
+
+        try:
+            await join(conn, uuid.UUID(handoff["uuid"]), handoff["username"], handoff["props"])
+        except BaseException as e:
+            self.console.error(self.console.f_traceback(e))
+            await self.close_connection(conn)
+            return
+
+        await self.serve_connection(conn)
 
+    async def serve_connection(self, conn: Connection):  # Handle packets until the conn is closed
         error_count = 0
 
         while True:
             try:
-                stream = await self.handle_packet(stream)
+                await self.handle_packet(conn)
             except StopHandling:
                 break
             except (ConnectionResetError, BrokenPipeError):
@@ -311,4 +513,4 @@ class Server:
             if error_count > 0:
                 error_count -= 0.5
 
-        await self.close_connection(stream)
+        await self.close_connection(conn)
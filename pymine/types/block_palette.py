@@ -27,12 +27,13 @@ import pymine.types.nbt as nbt
 
 class DirectPalette(AbstractPalette):
     registry = BLOCK_STATES
+    bits_per_block = math.ceil(
+        math.log2(sum(len(b["states"]) for b in BLOCK_STATES.data.values()))
+    )  # should be 14 or 15
 
     @staticmethod
     def get_bits_per_block():
-        return math.ceil(
-            math.log2(sum(len(b["states"]) for b in BLOCK_STATES.data.values()))
-        )  # should be 14 or 15
+        return DirectPalette.bits_per_block
 
     @staticmethod
     def encode(block: str, props: dict = None) -> int:
@@ -64,15 +65,15 @@ class IndirectPalette(AbstractPalette):
         return self.bits_per_block
 
     @classmethod
-    def from_nbt(cls, tag: nbt.TAG) -> IndirectPalette:
+    def from_nbt(cls, tag: nbt.TAG, bits_per_block: int) -> IndirectPalette:
         data = {}
         reverse_data = {}
 
         for i, b in enumerate(tag):
-            reverse_data[i] = {"name": b["Name"]}
+            reverse_data[i] = {"name": b["Name"].data}
 
             if b.get("Properties"):
-                reverse_data[i]["properties"] = {k: v for k, v in b["Properties"].items()}
+                reverse_data[i]["properties"] = {k: v.data for k, v in b["Properties"].items()}
 
         for id_, b in reverse_data.items():
             if b["name"] not in data:
@@ -85,7 +86,7 @@ class IndirectPalette(AbstractPalette):
 
             data[b["name"]]["states"].append(state_data)
 
-        return cls(Registry(data, reverse_data))
+        return cls(Registry(data, reverse_data), bits_per_block)
 
     def encode(self, block: str, props: dict = None) -> int:
         props = {} if props is None else props
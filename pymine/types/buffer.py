@@ -18,6 +18,7 @@ from __future__ import annotations
 
 import immutables
 import struct
+import numpy
 import zlib
 import uuid
 import json
@@ -26,33 +27,66 @@ from pymine.types.block_palette import DirectPalette
 from pymine.types.chunk import ChunkSection, Chunk
 from pymine.data.registries import ITEM_REGISTRY
 from pymine.api.errors import InvalidPacketID
+from pymine.util.long_array import pack_long_array
+from pymine.util.nibble_array import pack_nibbles
+from pymine.util.compression import Inflater
+from pymine.util.structs import get_struct
 from pymine.types.abc import AbstractPalette
 from pymine.types.bitfield import BitField
 from pymine.types.packet import Packet
 from pymine.types.chat import Chat
 import pymine.data.misc as misc_data
 from pymine.data.tags import TAGS
+import pymine.util.structs as structs
+import pymine.util.varint as varint
 import pymine.types.nbt as nbt
 
+AIR_BLOCKS = ("minecraft:air", "minecraft:cave_air", "minecraft:void_air")
+DIRECT_AIR_STATES = [DirectPalette.encode(block) for block in AIR_BLOCKS]
+
+_PADDING = {}  # {size: bytes(size)}, used to make room for Buffer.write_pack()
+
+
+def _padding(size: int) -> bytes:
+    padding = _PADDING.get(size)
+
+    if padding is None:
+        padding = _PADDING[size] = bytes(size)
+
+    return padding
+
 
 class Buffer:
     """
     Base class for a buffer, contains methods
     for handling most basic types and for
     converting from/to a Buffer object itself.
+
+    Data is appended to a bytearray, and read through
+    memoryviews so reading doesn't copy the buffer.
     """
 
     def __init__(self, buf: bytes = None) -> None:
-        self.buf = b"" if buf is None else buf
+        self.buf = bytearray() if buf is None else buf
         self.pos = 0
 
     def __len__(self):
         return len(self.buf)
 
+    def _writable(self) -> bytearray:
+        if type(self.buf) is not bytearray:  # bytes or a memoryview, copy it once
+            self.buf = bytearray(self.buf)
+
+        return self.buf
+
     def write(self, data: bytes) -> None:
-        """Writes data to the buffer."""
+        """Writes data to the end of the buffer."""
 
-        self.buf += data
+        try:
+            self._writable().extend(data)
+        except BufferError:  # a view from read_view() is still alive, so it can't be resized
+            self.buf = bytearray(self.buf)
+            self.buf.extend(data)
 
     def read(self, length: int = None) -> bytes:
         """
@@ -60,14 +94,27 @@ class Buffer:
         then all remaining data from the buffer is sent.
         """
 
-        try:
-            if length is None:
-                length = len(self.buf)
-                return self.buf[self.pos :]
+        end = len(self.buf) if length is None else self.pos + length
 
-            return self.buf[self.pos : self.pos + length]
-        finally:
-            self.pos += length
+        with memoryview(self.buf) as view:
+            data = view[self.pos : end].tobytes()
+
+        self.pos = end
+
+        return data
+
+    def read_view(self, length: int = None) -> memoryview:
+        """
+        Like read(), but returns a memoryview of the buffer instead of a copy,
+        the buffer is copied on the next write if the view is still alive.
+        """
+
+        end = len(self.buf) if length is None else self.pos + length
+        view = memoryview(self.buf)[self.pos : end]
+
+        self.pos = end
+
+        return view
 
     def unpack_byte(self) -> int:
         byte = self.buf[self.pos]
@@ -78,22 +125,88 @@ class Buffer:
     def pack_byte(cls, b: int) -> bytes:
         return struct.pack(">b", b)
 
+    def write_byte(self, b: int) -> None:
+        self.write_pack("b", b)
+
     def reset(self) -> None:
         """Resets the position in the buffer."""
 
         self.pos = 0
 
     def unpack(self, f: str) -> object:
-        unpacked = struct.unpack(">" + f, self.read(struct.calcsize(f)))
+        s = get_struct(f)
+        unpacked = s.unpack_from(self.buf, self.pos)
+        self.pos += s.size
 
         if len(unpacked) == 1:
             return unpacked[0]
 
         return unpacked
 
+    def unpack_array(self, f: str, length: int) -> tuple:
+        """Unpacks length values of the same format (like "i" or "q") from the buffer at once."""
+
+        f = f">{length}{f}"
+        unpacked = struct.unpack_from(f, self.buf, self.pos)
+        self.pos += struct.calcsize(f)
+
+        return unpacked
+
+    def unpack_bool(self) -> bool:
+        value = structs.BOOL.unpack_from(self.buf, self.pos)[0]
+        self.pos += 1
+        return value
+
+    def unpack_short(self) -> int:
+        value = structs.SHORT.unpack_from(self.buf, self.pos)[0]
+        self.pos += 2
+        return value
+
+    def unpack_ushort(self) -> int:
+        value = structs.USHORT.unpack_from(self.buf, self.pos)[0]
+        self.pos += 2
+        return value
+
+    def unpack_int(self) -> int:
+        value = structs.INT.unpack_from(self.buf, self.pos)[0]
+        self.pos += 4
+        return value
+
+    def unpack_long(self) -> int:
+        value = structs.LONG.unpack_from(self.buf, self.pos)[0]
+        self.pos += 8
+        return value
+
+    def unpack_float(self) -> float:
+        value = structs.FLOAT.unpack_from(self.buf, self.pos)[0]
+        self.pos += 4
+        return value
+
+    def unpack_double(self) -> float:
+        value = structs.DOUBLE.unpack_from(self.buf, self.pos)[0]
+        self.pos += 8
+        return value
+
     @classmethod
     def pack(cls, f: str, *data: object) -> bytes:
-        return struct.pack(">" + f, *data)
+        return get_struct(f).pack(*data)
+
+    def write_pack(self, f: str, *data: object) -> None:
+        """Packs data straight into the end of the buffer, like Buffer.pack()."""
+
+        s = get_struct(f)
+        size = s.size
+
+        try:
+            buf = self._writable()
+            end = len(buf)
+            buf.extend(_padding(size))
+        except BufferError:
+            self.write(_padding(size))
+            buf = self.buf
+            end = len(buf) - size
+
+        s.pack_into(buf, end, *data)
 
     @classmethod
     def pack_packet(cls, packet: Packet, comp_thresh: int = -1) -> bytes:
@@ -101,32 +214,58 @@ class Buffer:
         Packs a Packet object into bytes.
         """
 
-        data = cls.pack_varint(packet.id) + packet.encode()
+        return cls.pack_frame(
+            cls.pack_varint(packet.id) + packet.encode(), comp_thresh, packet.comp_level
+        )
+
+    @classmethod
+    def pack_frame(cls, data: bytes, comp_thresh: int = -1, comp_level: int = -1) -> bytes:
+        """
+        Packs the data of a packet (the packet id + the encoded packet)
+        into a length prefixed frame, compressing it if needed.
+        """
 
         if comp_thresh >= 1:
             if len(data) >= comp_thresh:
-                data = cls.pack_varint(len(data)) + zlib.compress(data)
+                data = cls.pack_varint(len(data)) + zlib.compress(data, comp_level)
             else:
                 data = cls.pack_varint(0) + data
 
         return cls.pack_varint(len(data)) + data
 
-    def unpack_packet(self, state: str, PACKET_MAP: object, comp_thresh: int = -1) -> Packet:
-        data = self.buf
+    def unpack_packet(
+        self, state: str, PACKET_MAP: object, comp_thresh: int = -1, inflater: Inflater = None
+    ) -> Packet:
+        """
+        Unpacks a Packet object from the buffer, if the packet
+        is compressed it's decompressed via the inflater.
+        """
+
+        return self.unpack_packet_class(state, PACKET_MAP, comp_thresh, inflater).decode(self)
+
+    def unpack_packet_class(
+        self, state: str, PACKET_MAP: object, comp_thresh: int = -1, inflater: Inflater = None
+    ) -> type:
+        """
+        Unpacks the header of a packet and returns its Packet class without decoding
+        it, the buffer is left at the start of the packet's fields.
+        """
 
         if comp_thresh >= 0:
             uncomp_len = self.unpack_varint()
 
             if uncomp_len > 0:
-                data = zlib.decompress(self.read())
+                if inflater is None:
+                    inflater = Inflater(comp_thresh)
+
+                self.buf = inflater.inflate(memoryview(self.buf)[self.pos :], uncomp_len)
+                self.pos = 0
 
         try:
-            packet_class = PACKET_MAP[state][self.unpack_varint()]
+            return PACKET_MAP[state][self.unpack_varint()]
         except KeyError:
             raise InvalidPacketID
 
-        return packet_class.decode(self)
-
     @classmethod
     def pack_optional(cls, packer: object, data: object = None) -> bytes:
         """Packs an optional field into bytes."""
@@ -148,49 +287,38 @@ class Buffer:
     def pack_varint(cls, num: int, max_bits: int = 32) -> bytes:
         """Packs a varint (Varying Integer) into bytes."""
 
-        num_max = (1 << (max_bits - 1)) - 1
-        num_min = -1 << (max_bits - 1)
-
-        if not (num_min <= num <= num_max):
-            raise ValueError(f"num doesn't fit in given range: {num_min} <= {num} < {num_max}")
-
-        if num < 0:
-            num += 1 << 32
-
-        out = b""
+        return varint.pack_varint(num, max_bits)
 
-        for i in range(10):
-            b = num & 0x7F
-            num >>= 7
-
-            out += cls.pack("B", (b | (0x80 if num > 0 else 0)))
+    @classmethod
+    def pack_varints(cls, nums: list, max_bits: int = 32) -> bytes:
+        """Packs an array of varints into bytes, without a length prefix."""
 
-            if num == 0:
-                break
-
-        return out
+        return varint.pack_varints(nums, max_bits)
 
     def unpack_varint(self, max_bits: int = 32) -> int:
         """Unpacks a varint from the buffer."""
 
-        num = 0
+        num, self.pos = varint.unpack_varint(self.buf, self.pos, max_bits)
+        return num
 
-        for i in range(10):
-            b = self.unpack("B")
-            num |= (b & 0x7F) << 7 * i
+    def write_varint(self, num: int, max_bits: int = 32) -> None:
+        """Packs a varint straight into the end of the buffer."""
 
-            if not b & 0x80:
-                break
+        try:
+            varint.write_varint(self._writable(), num, max_bits)
+        except BufferError:  # see write()
+            self.write(varint.pack_varint(num, max_bits))
 
-        if num & (1 << 31):
-            num -= 1 << 32
+    @classmethod
+    def pack_varlong(cls, num: int) -> bytes:
+        """Packs a varlong (a varint of up to 64 bits) into bytes."""
 
-        num_max = (1 << (max_bits - 1)) - 1
-        num_min = -1 << (max_bits - 1)
+        return varint.pack_varint(num, 64)
 
-        if not (num_min <= num <= num_max):
-            raise ValueError(f"num doesn't fit in given range: {num_min} <= {num} < {num_max}")
+    def unpack_varlong(self) -> int:
+        """Unpacks a varlong from the buffer."""
 
+        num, self.pos = varint.unpack_varint(self.buf, self.pos, 64)
         return num
 
     @classmethod
@@ -218,7 +346,15 @@ class Buffer:
         """Unpacks a string from the buffer."""
 
         length = self.unpack_varint(max_bits=16)
-        return self.read(length).decode("utf-8")
+        return str(self.read_view(length), "utf-8")
+
+    def write_string(self, text: str) -> None:
+        """Packs a string straight into the end of the buffer."""
+
+        text = text.encode("utf-8")
+
+        self.write_varint(len(text), max_bits=16)
+        self.write(text)
 
     @classmethod
     def pack_json(cls, obj: object) -> bytes:
@@ -231,6 +367,9 @@ class Buffer:
 
         return json.loads(self.unpack_string())
 
+    def write_json(self, obj: object) -> None:
+        self.write_string(json.dumps(obj))
+
     @classmethod
     def pack_nbt(cls, tag: nbt.TAG = None) -> bytes:
         """Packs an NBT tag into bytes."""
@@ -243,6 +382,9 @@ class Buffer:
     def unpack_nbt(self):
         return nbt.unpack(self)
 
+    def write_nbt(self, tag: nbt.TAG = None) -> None:
+        self.write(self.pack_nbt(tag))
+
     @classmethod
     def pack_uuid(cls, uuid_: uuid.UUID) -> bytes:
         """Packs a UUID into bytes."""
@@ -254,6 +396,9 @@ class Buffer:
 
         return uuid.UUID(bytes=self.read(16))
 
+    def write_uuid(self, uuid_: uuid.UUID) -> None:
+        self.write(uuid_.bytes)
+
     @classmethod
     def pack_chat(cls, msg: Chat) -> bytes:
         """Packs a Minecraft chat message into bytes."""
@@ -625,12 +770,14 @@ class Buffer:
         if palette is DirectPalette:
             return b""
 
-        return cls.pack_varint(
-            len(palette.registry.data)
-        ) + b"".join(  # map indirect ids to the global palette
+        states = [
+            palette.decode(state_id) for state_id in range(len(palette.registry.data_reversed))
+        ]
+
+        return cls.pack_varint(len(states)) + b"".join(  # map indirect ids to the global palette
             [
-                cls.pack_varint(DirectPalette.encode(palette.decode(state_id)))
-                for state_id in range(len(palette.registry.data))
+                cls.pack_varint(DirectPalette.encode(state["name"], state.get("properties")))
+                for state in states
             ]
         )
 
@@ -642,35 +789,44 @@ class Buffer:
             palette = section.palette
             bits_per_block = palette.get_bits_per_block()
 
-            # pack bits per block and palette
-            out = cls.pack("b", bits_per_block) + cls.pack_block_palette(palette)
+            # the states of the palette which are air, so the non-air blocks can be counted
+            if palette is DirectPalette:
+                air = DIRECT_AIR_STATES
+            else:
+                air = [
+                    state_id
+                    for state_id in range(len(palette.registry.data_reversed))
+                    if palette.decode(state_id)["name"] in AIR_BLOCKS
+                ]
+
+            block_count = section.block_states.size
 
-            data = [0] * int((16 * 16 * 16) * bits_per_block / 64)
-            individual_value_mask = (1 << bits_per_block) - 1
+            for state in air:  # quicker than numpy.isin() for so few values
+                block_count -= numpy.count_nonzero(section.block_states == state)
 
-            # create the long array from the block states
-            for y in range(16):
-                for z in range(16):
-                    for x in range(16):
-                        block_num = (((y * 16) + z) * 16) + x
-                        start_long = (block_num * bits_per_block) // 64
-                        start_offset = (block_num * bits_per_block) % 64
-                        end_long = ((block_num + 1) * bits_per_block - 1) // 64
+            data = pack_long_array(section.block_states, bits_per_block)
 
-                        value = section.block_states[y][z][x] & individual_value_mask
+            return (
+                cls.pack("hB", block_count, bits_per_block)
+                + cls.pack_block_palette(palette)
+                + cls.pack_varint(len(data))
+                + data.tobytes()
+            )
 
-                        data[start_long] |= value << start_offset
+    @classmethod
+    def pack_section_light(cls, light: numpy.ndarray) -> bytes:
+        if light is None:
+            return None
 
-                        if start_long != end_long:
-                            data[end_long] = value >> (64 - start_offset)
+        if light.any():
+            return pack_nibbles(light)
 
-            # pack and return the block state long array
-            return cls.pack_varint(len(data)) + b"".join([cls.pack("q", q) for q in data])
+        return b""
 
     @classmethod
     def pack_chunk_light(cls, chunk: Chunk) -> bytes:
-        out = cls.pack_varint(chunk.x) + cls.pack_varint(chunk.z) + cls.pack("?", True)
-
+        # the masks have a bit per section from y -1 (the lowest bit) up to y 16, sections which are
+        # all 0 only have their bit set in the empty masks, and sections without light in neither
         sky_light_mask = 0
         block_light_mask = 0
         empty_sky_light_mask = 0
@@ -679,62 +835,48 @@ class Buffer:
         sky_light_arrays = []
         block_light_arrays = []
 
-        for section_y in range(-1, 17, 1):
+        packed_light = chunk.packed_light
+
+        for section_y in range(-1, 17):
             section = chunk.get(section_y)
 
             if section is None:
                 continue
 
-            print("Section y/index:", section_y)
-
-            if section.sky_light is not None and len(section.sky_light.nonzero()) > 0:
-                sky_light_mask |= 1 << section_y
-
-                sky_light_array = b""
-
-                for y in range(16):
-                    for z in range(16):
-                        for x in range(0, 16, 2):
-                            sky_light_array += cls.pack(
-                                "B",
-                                (section.sky_light[y][z][x] << 4)
-                                | (section.sky_light[y][z][x + 1]),
-                            )
-
-                print("Sky light array length:", len(sky_light_array))
+            # per section the packed sky and block light, None without light and b"" when all 0
+            packed = packed_light.get(section_y)
 
-                sky_light_arrays.append(cls.pack_varint(len(sky_light_array)) + sky_light_array)
-
-            if section.block_light is not None and len(section.block_light.nonzero()) > 0:
-                block_light_mask |= 1 << section_y
-
-                block_light_array = b""
-
-                for y in range(16):
-                    for z in range(16):
-                        for x in range(0, 16, 2):
-                            block_light_array += cls.pack(
-                                "B",
-                                (section.block_light[y][z][x] << 4)
-                                | (section.block_light[y][z][x + 1]),
-                            )
+            if packed is None:
+                packed = packed_light[section_y] = (
+                    cls.pack_section_light(section.sky_light),
+                    cls.pack_section_light(section.block_light),
+                )
 
-                print("Block light array length:", len(block_light_array))
+            bit = 1 << (section_y + 1)
+            sky_light, block_light = packed
 
-                block_light_arrays.append(
-                    cls.pack_varint(len(block_light_array)) + block_light_array
-                )
+            if sky_light is not None:
+                if sky_light:
+                    sky_light_mask |= bit
+                    sky_light_arrays.append(sky_light)
+                else:
+                    empty_sky_light_mask |= bit
 
-        print("Sky light mask:", sky_light_mask)
-        print("Block light mask:", block_light_mask)
+            if block_light is not None:
+                if block_light:
+                    block_light_mask |= bit
+                    block_light_arrays.append(block_light)
+                else:
+                    empty_block_light_mask |= bit
 
-        out = (
-            cls.pack_varint(sky_light_mask)
+        return (
+            cls.pack_varint(chunk.x)
+            + cls.pack_varint(chunk.z)
+            + cls.pack("?", True)  # trust edges
+            + cls.pack_varint(sky_light_mask)
             + cls.pack_varint(block_light_mask)
             + cls.pack_varint(empty_sky_light_mask)
             + cls.pack_varint(empty_block_light_mask)
-            + b"".join(sky_light_arrays)
-            + b"".join(block_light_arrays)
+            + b"".join([cls.pack_varint(len(array)) + array for array in sky_light_arrays])
+            + b"".join([cls.pack_varint(len(array)) + array for array in block_light_arrays])
         )
-
-        return out  # [:len(out) - 4095]
@@ -79,6 +79,8 @@ class Chat:
 
                 if "extra" in msg:
                     text += parse(msg["extra"])
+
+                return text
             elif msg is None:
                 return ""
             else:
@@ -16,10 +16,11 @@
 
 from __future__ import annotations
 
-import struct
 import numpy
 
+from pymine.util.long_array import long_array_len, unpack_long_array
 from pymine.types.block_palette import IndirectPalette, DirectPalette
+from pymine.util.nibble_array import unpack_nibbles
 from pymine.types.abc import AbstractPalette
 import pymine.types.nbt as nbt
 
@@ -64,67 +65,49 @@ class ChunkSection:
 
     @classmethod
     def from_nbt(cls, tag: nbt.TAG) -> ChunkSection:
-        if tag.get("BlockStates") is not None:
-            # this is a calculation one would use to serialize a chunk section
-            # we need this to solve for bits_per_block as we don't have that
-            # but we *do* have the length of the array from the nbt data
-            # that we read earlier
-            # long_array_len = ((16*16*16)*bits_per_block) / 64
-            # this simplifies to 64*bits_per_block which is easy to solve
-            # for bits_per_block so we get the below
-            bits_per_block = len(tag["BlockStates"]) // 64  # probably 4
-
-            individual_value_mask = (1 << bits_per_block) - 1
-
-            if tag.get("Palette") is None:
+        if tag.get("BlockStates") is not None and tag.get("Palette") is not None:
+            # like vanilla, the amount of bits per block follows from the size of the palette
+            bits_per_block = max(4, (len(tag["Palette"]) - 1).bit_length())
+
+            if len(tag["BlockStates"]) != long_array_len(4096, bits_per_block):
+                raise ValueError(
+                    f"BlockStates has {len(tag['BlockStates'])} longs, expected "
+                    f"{long_array_len(4096, bits_per_block)} "
+                    "(worlds from before 1.16 aren't supported)."
+                )
+
+            palette = IndirectPalette.from_nbt(tag["Palette"], bits_per_block)
+            block_states = unpack_long_array(tag["BlockStates"], bits_per_block)
+
+            # clients only accept indirect palettes of up to 8 bits, bigger ones use global ids
+            if bits_per_block > 8:
+                global_ids = numpy.array(
+                    [
+                        DirectPalette.encode(state["name"], state.get("properties"))
+                        for state in map(palette.decode, range(len(tag["Palette"])))
+                    ],
+                    numpy.int32,
+                )
+
                 palette = DirectPalette
-            else:
-                palette = IndirectPalette.from_nbt(tag["Palette"], bits_per_block)
+                block_states = global_ids[block_states]
 
             section = cls(tag["Y"].data, palette)
-
-            section.block_states = numpy.ndarray((16, 16, 16), numpy.int32)
-
-            # yoinked most of the logic for chunk deserialization from https://wiki.vg/Chunk_Format
-            # however, that is for deserialization of a chunk packet, not the nbt data so it's a bit
-            # different but most of the logic still applies and this is needed for that
-            state_bytes = b"".join([struct.pack(">q", n) for n in tag["BlockStates"]])
-
-            # populate block_states array
-            for y in range(16):
-                for z in range(16):
-                    for x in range(16):
-                        block_num = (((y * 16) + z) * 16) + x
-                        start_long = (block_num * bits_per_block) // 64
-                        start_offset = (block_num * bits_per_block) % 64
-                        end_long = ((block_num + 1) * bits_per_block - 1) // 64
-
-                        if start_long == end_long:
-                            data = state_bytes[start_long] >> start_offset
-                        else:
-                            data = state_bytes[start_long] >> start_offset | state_bytes[
-                                end_long
-                            ] << (64 - start_offset)
-
-                        section.block_states[y, z, x] = data & individual_value_mask
+            section.block_states = block_states.reshape(16, 16, 16)  # y, z, x
         else:
-            section = cls(tag["Y"], None)
+            section = cls(tag["Y"].data, None)
 
         # the light arrays (SkyLight and BlockLight) are byte arrays (8 bits), and four bits are used per block
 
         if tag.get("BlockLight") is None:
             section.block_light = None
         else:
-            section.block_light = numpy.asarray(
-                [n for n in ((b & 0x0F, b >> 4 & 0x0F) for b in tag["BlockLight"])], numpy.int16
-            ).reshape(16, 16, 16)
+            section.block_light = unpack_nibbles(tag["BlockLight"]).reshape(16, 16, 16)
 
         if tag.get("SkyLight") is None:
             section.sky_light = None
         else:
-            section.sky_light = numpy.asarray(
-                [n for n in ((b & 0x0F, b >> 4 & 0x0F) for b in tag["SkyLight"])], numpy.int16
-            ).reshape(16, 16, 16)
+            section.sky_light = unpack_nibbles(tag["SkyLight"]).reshape(16, 16, 16)
 
         return section
 
@@ -141,6 +124,15 @@ class Chunk:
 
         self.sections = {}  # indexes go below 0 so a dict it is
 
+        # packed packet data shared by all the chunk is sent to, see invalidate() and ChunkFrames
+        # {section y: packed blocks, see Buffer.pack_chunk_section_blocks()}
+        self.packed_sections = {}
+        self.packed_light = {}  # {section y: (packed sky light, packed block light)}
+        self.packed_heightmaps = None
+        self.packed_biomes = None
+        # {("data" or "light", comp_thresh): packed frame, or a future while it's packed}
+        self.frames = {}
+
         for section_tag in self.data["Sections"]:
             self.sections[section_tag["Y"].data] = ChunkSection.from_nbt(section_tag)
 
@@ -173,6 +165,41 @@ class Chunk:
         except KeyError:
             return default
 
+    def invalidate(self, section_y: int = None, blocks: bool = True, light: bool = True) -> None:
+        """Drops the packed packet data of a section, call this after changing its blocks or light.
+
+        Only that section is packed again the next time the chunk is sent, the rest is reused. If
+        section_y is None the data of every section is dropped, as well as the biomes.
+
+        :param int section_y: The y of the changed section, None if the whole chunk changed.
+        :param bool blocks: Whether blocks were changed, which also drops the heightmaps.
+        :param bool light: Whether light was changed.
+        """
+
+        if section_y is None:
+            if blocks:
+                self.packed_sections.clear()
+                self.packed_biomes = None
+
+            if light:
+                self.packed_light.clear()
+        else:
+            if blocks:
+                self.packed_sections.pop(section_y, None)
+
+            if light:
+                self.packed_light.pop(section_y, None)
+
+        if blocks:
+            self.packed_heightmaps = None
+
+        stale = {"data"} if blocks else set()
+
+        if light:
+            stale.add("light")
+
+        self.frames = {key: frame for key, frame in self.frames.items() if key[0] not in stale}
+
     @classmethod
     def new(cls, chunk_x: int, chunk_z: int, timestamp: int) -> Chunk:
         return cls(cls.new_nbt(chunk_x, chunk_z), timestamp)
@@ -0,0 +1,101 @@
+# A flexible and fast Minecraft server software written completely in Python.
+# Copyright (C) 2021 PyMine
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+
+from cryptography.hazmat.primitives.ciphers import Cipher
+
+from pymine.types.stream import EncryptedStream, Stream
+from pymine.util.compression import Inflater
+
+__all__ = ("Connection",)
+
+
+class Connection:
+    """The state of a single client connection, passed to packet handlers.
+
+    Everything about a connection lives here, so nothing has to be looked up by the remote and
+    closing a connection only has to drop this object (and its player, if it has one).
+
+    :param Stream stream: The stream of the connection.
+    :ivar Stream stream: The stream of the connection, an EncryptedStream once it's encrypted.
+    :ivar tuple remote: A tuple which stores the remote client's address and port.
+    :ivar int state: The protocol state, see pymine/data/states.py.
+    :ivar int comp_thresh: The compression threshold of the connection, -1 if it's disabled.
+    :ivar Inflater inflater: Used to decompress incoming packets once compression is enabled.
+    :ivar SendQueue send_queue: Used to queue outgoing frames, see pymine/types/send_queue.py.
+    :ivar str username: The username sent in LoginStart, used while logging in.
+    :ivar bytes verify_token: The token sent in LoginEncryptionRequest, used while logging in.
+    :ivar Player player: The player of the connection, None until the client has joined.
+    :ivar int keep_alive_id: The id of the keep alive waiting for a response, None if there's none.
+    :ivar float keep_alive_sent: The loop time the last keep alive was sent at.
+    :ivar int latency: The smoothed round trip time of keep alives in ms, shown in the tab list.
+    """
+
+    __slots__ = (
+        "stream",
+        "remote",
+        "state",
+        "comp_thresh",
+        "inflater",
+        "send_queue",
+        "username",
+        "verify_token",
+        "player",
+        "keep_alive_id",
+        "keep_alive_sent",
+        "latency",
+    )
+
+    def __init__(self, stream: Stream) -> None:
+        self.stream = stream
+        self.remote = stream.remote
+        self.state = 0
+
+        self.comp_thresh = -1
+        self.inflater = None
+        self.send_queue = None
+
+        self.username = None
+        self.verify_token = None
+        self.player = None
+
+        self.keep_alive_id = None
+        self.keep_alive_sent = stream.last_read  # the first one is due an interval after connecting
+        self.latency = 0
+
+    def enable_compression(self, comp_thresh: int) -> None:
+        """Call this after LoginSetCompression is sent, the client compresses what follows it."""
+
+        self.comp_thresh = comp_thresh
+        self.inflater = Inflater(comp_thresh)
+
+    def enable_encryption(self, cipher: Cipher, decrypt_cipher: Cipher = None) -> None:
+        """Replaces the stream with an EncryptedStream, call once the shared secret is known."""
+
+        if self.send_queue is not None:  # anything still queued was meant to be sent unencrypted
+            self.send_queue.write()
+
+        self.stream = EncryptedStream(self.stream, cipher, decrypt_cipher)
+
+        if self.send_queue is not None:
+            self.send_queue.stream = self.stream
+
+    def login_done(self) -> None:
+        """Drops the state which is only needed while logging in."""
+
+        self.username = None
+        self.verify_token = None
@@ -20,6 +20,8 @@ from mutf8 import encode_modified_utf8, decode_modified_utf8
 import struct
 import gzip
 
+from pymine.util.structs import get_struct
+
 __all__ = (
     "TAG",
     "TAG_End",
@@ -60,7 +62,9 @@ def unpack(buf, root_is_full: bool = True) -> TAG_Compound:
 class BufferUtil:
     @staticmethod
     def unpack(buf, f: str) -> object:
-        unpacked = struct.unpack(">" + f, buf.read(struct.calcsize(f)))
+        s = get_struct(f)
+        unpacked = s.unpack_from(buf.buf, buf.pos)
+        buf.pos += s.size
 
         if len(unpacked) == 1:
             return unpacked[0]
@@ -69,7 +73,11 @@ class BufferUtil:
 
     @staticmethod
     def pack(f: str, *data: object) -> bytes:
-        return struct.pack(">" + f, *data)
+        return get_struct(f).pack(*data)
+
+    @staticmethod
+    def pack_array(f: str, data: list) -> bytes:
+        return struct.pack(f">i{len(data)}{f}", len(data), *data)
 
 
 class TAG:
@@ -99,7 +107,7 @@ class TAG:
 
     @staticmethod
     def unpack_name(buf) -> str:
-        return decode_modified_utf8(buf.read(buf.unpack("H")))
+        return decode_modified_utf8(buf.read(buf.unpack_ushort()))
 
     def pack_data(self) -> bytes:
         raise NotImplementedError(self.__class__.__name__)
@@ -192,7 +200,7 @@ class TAG_Short(TAG):
 
     @staticmethod
     def unpack_data(buf) -> int:
-        return buf.unpack("h")
+        return buf.unpack_short()
 
 
 class TAG_Int(TAG):
@@ -215,7 +223,7 @@ class TAG_Int(TAG):
 
     @staticmethod
     def unpack_data(buf) -> int:
-        return buf.unpack("i")
+        return buf.unpack_int()
 
 
 class TAG_Long(TAG):
@@ -238,7 +246,7 @@ class TAG_Long(TAG):
 
     @staticmethod
     def unpack_data(buf) -> int:
-        return buf.unpack("q")
+        return buf.unpack_long()
 
 
 class TAG_Float(TAG):
@@ -261,7 +269,7 @@ class TAG_Float(TAG):
 
     @staticmethod
     def unpack_data(buf) -> float:
-        return buf.unpack("f")
+        return buf.unpack_float()
 
 
 class TAG_Double(TAG):
@@ -284,7 +292,7 @@ class TAG_Double(TAG):
 
     @staticmethod
     def unpack_data(buf) -> float:
-        return buf.unpack("d")
+        return buf.unpack_double()
 
 
 class TAG_Byte_Array(TAG, bytearray):
@@ -311,7 +319,7 @@ class TAG_Byte_Array(TAG, bytearray):
 
     @staticmethod
     def unpack_data(buf) -> bytearray:
-        return bytearray(buf.read(buf.unpack("i")))
+        return bytearray(buf.read_view(buf.unpack_int()))
 
     def pretty(self, indent: int = 0) -> str:
         return f'{" " * 4 * indent}TAG_Byte_Array("{self.name}"): [{", ".join([str(v) for v in self])}]'
@@ -338,7 +346,7 @@ class TAG_String(TAG):
 
     @staticmethod
     def unpack_data(buf) -> str:
-        return decode_modified_utf8(buf.read(buf.unpack("H")))
+        return decode_modified_utf8(buf.read(buf.unpack_ushort()))
 
     def pretty(self, indent: int = 0) -> str:
         return f'{" " * 4 * indent}{self.__class__.__name__}("{self.name}"): {self.data}'
@@ -371,7 +379,7 @@ class TAG_List(TAG, list):
     @staticmethod
     def unpack_data(buf) -> list:
         tag = TYPES[buf.unpack("b")]
-        length = buf.unpack("i")
+        length = buf.unpack_int()
 
         out = []
 
@@ -454,13 +462,11 @@ class TAG_Int_Array(TAG, list):
         list.__init__(self, data)
 
     def pack_data(self) -> bytes:
-        return BufferUtil.pack("i", len(self)) + b"".join(
-            [BufferUtil.pack("i", num) for num in self]
-        )
+        return BufferUtil.pack_array("i", self)
 
     @staticmethod
     def unpack_data(buf) -> list:
-        return [buf.unpack("i") for _ in range(buf.unpack("i"))]
+        return list(buf.unpack_array("i", buf.unpack_int()))
 
     def pretty(self, indent: int = 0) -> str:
         return (
@@ -483,13 +489,11 @@ class TAG_Long_Array(TAG, list):
         list.__init__(self, data)
 
     def pack_data(self) -> bytes:
-        return BufferUtil.pack("i", len(self)) + b"".join(
-            [BufferUtil.pack("q", num) for num in self]
-        )
+        return BufferUtil.pack_array("q", self)
 
     @staticmethod
     def unpack_data(buf) -> list:
-        return [buf.unpack("q") for _ in range(buf.unpack("i"))]
+        return list(buf.unpack_array("q", buf.unpack_int()))
 
     def pretty(self, indent: int = 0) -> str:
         return f'{" " * 4 * indent}TAG_Long_Array("{self.name}"): [{", ".join([str(v) for v in self])}]'
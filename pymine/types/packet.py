@@ -16,7 +16,12 @@
 
 from __future__ import annotations
 
-__all__ = ("Packet",)
+from pymine.types.send_queue import LANE_CONTROL
+
+__all__ = (
+    "Packet",
+    "LazyPacket",
+)
 
 
 class Packet:
@@ -24,11 +29,64 @@ class Packet:
 
     :param int id: Packet identifaction number. Defaults to -0x1.
     :ivar id:
+    :ivar lane: The SendQueue lane the packet is sent in, see pymine/types/send_queue.py.
+    :ivar comp_level: The zlib level used when the packet is compressed, -1 for zlib's default.
+    :ivar schema: The fields of the packet as (attribute, type) pairs, see pymine/types/schema.py.
+    :ivar lazy: Whether the server passes the packet to handlers as a LazyPacket.
     """
 
     id: int = None
     to: int = None
+    lane: int = LANE_CONTROL
+    comp_level: int = -1
+    schema: tuple = None
+    lazy: bool = False
 
     def __init__(self) -> None:
         self.id: int = self.__class__.id
         self.to: int = self.__class__.to
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+
+        if cls.__dict__.get("schema") is not None:
+            # imported here because pymine.types.buffer imports this module
+            from pymine.types.schema import compile_schema
+
+            compile_schema(cls)
+
+
+class LazyPacket:
+    """A received packet which is only decoded once one of its fields is accessed.
+
+    Used for serverbound packets with lazy = True, so handlers which only need to know
+    that a packet arrived don't pay for decoding it.
+
+    :param type packet_class: The class of the packet.
+    :param Buffer buf: The buffer of the packet, positioned at the start of its fields.
+    :ivar id:
+    :ivar to:
+    :ivar packet_class:
+    """
+
+    __slots__ = ("id", "to", "packet_class", "_buf", "_packet")
+
+    def __init__(self, packet_class: type, buf) -> None:
+        self.id = packet_class.id
+        self.to = packet_class.to
+        self.packet_class = packet_class
+
+        self._buf = buf
+        self._packet = None
+
+    def decode(self) -> Packet:
+        """Decodes the packet if it hasn't been yet, and returns it."""
+
+        if self._packet is None:
+            self._packet = self.packet_class.decode(self._buf)
+            self._buf = None
+
+        return self._packet
+
+    def __getattr__(self, name: str) -> object:  # only called for attributes that aren't slots
+        return getattr(self.decode(), name)
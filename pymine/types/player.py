@@ -30,7 +30,7 @@ class Player:
 
         self.uuid = uuid.UUID(bytes=struct.pack(">iiii", *data["UUID"]))
 
-        self.stream = None
+        self.conn = None  # the Connection of the player, None if the player is offline
 
         self.props = None  # textures from the mojang api
         self.username = None
@@ -0,0 +1,145 @@
+# A flexible and fast Minecraft server software written completely in Python.
+# Copyright (C) 2021 PyMine
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Compiles the declared fields of a packet (Packet.schema) into specialized encode/decode methods.
+
+A schema is a sequence of (attribute, type) pairs in the order the fields are sent, for example:
+
+    schema = (
+        ("entity_id", "varint"),
+        (("x", "y", "z"), "position"),
+        ("stage", "b"),
+    )
+
+A type is either a struct format character (see FIXED_WIDTH) or a name from TYPES. Consecutive
+fixed-width fields are packed and unpacked with one precompiled struct, and every other field is
+packed by the matching Buffer method, the encoded fields are then joined into a single bytes object.
+Generated decoders pass the fields to the packet's constructor in schema order. Packets which
+define encode() or decode() themselves keep their own.
+"""
+
+from __future__ import annotations
+
+from pymine.util.structs import get_struct
+from pymine.types.buffer import Buffer
+import pymine.util.varint as varint
+
+__all__ = (
+    "FIXED_WIDTH",
+    "TYPES",
+    "compile_schema",
+)
+
+FIXED_WIDTH = frozenset("?bBhHiIqQfd")
+
+# {type: (packing function, name of the Buffer method which unpacks it)}
+TYPES = {
+    "varint": (varint.pack_varint, "unpack_varint"),
+    "varlong": (varint.pack_varlong, "unpack_varlong"),
+    "string": (Buffer.pack_string, "unpack_string"),
+    "json": (Buffer.pack_json, "unpack_json"),
+    "chat": (Buffer.pack_chat, "unpack_chat"),
+    "nbt": (Buffer.pack_nbt, "unpack_nbt"),
+    "uuid": (Buffer.pack_uuid, "unpack_uuid"),
+    "position": (Buffer.pack_position, "unpack_position"),  # attribute is a tuple of (x, y, z)
+}
+
+
+def _segments(cls: type) -> list:
+    """Groups the schema into runs of fixed-width fields and single variable-length fields."""
+
+    segments = []  # [(type or None for fixed-width, [attribute names], struct format)]
+
+    for attrs, type_ in cls.schema:
+        attrs = [attrs] if isinstance(attrs, str) else list(attrs)
+
+        if type_ in FIXED_WIDTH:
+            if len(attrs) != 1:
+                raise ValueError(f"Field {attrs} of {cls.__name__} must be a single attribute.")
+
+            if segments and segments[-1][0] is None:
+                segments[-1][1].extend(attrs)
+                segments[-1][2] += type_
+            else:
+                segments.append([None, attrs, type_])
+        elif type_ in TYPES:
+            segments.append([type_, attrs, None])
+        else:
+            raise ValueError(f"Unknown type {type_!r} for field {attrs} of {cls.__name__}.")
+
+    return segments
+
+
+def compile_schema(cls: type) -> None:
+    """Generates encode() and decode() for a packet class from its schema.
+
+    :param type cls: The packet class, its schema attribute must be set.
+    :raises ValueError: If the schema contains an unknown type.
+    """
+
+    namespace = {}
+    pack_exprs = []
+    unpack_lines = []
+    values = []
+
+    for i, (type_, attrs, f) in enumerate(_segments(cls)):
+        names = [f"v{len(values) + j}" for j in range(len(attrs))]
+        values.extend(names)
+
+        if type_ is None:
+            s = namespace[f"s{i}"] = get_struct(f)
+
+            pack_exprs.append(f"s{i}.pack({', '.join(f'self.{a}' for a in attrs)})")
+            unpack_lines.append(f"{', '.join(names)}, = s{i}.unpack_from(buf.buf, buf.pos)")
+            unpack_lines.append(f"buf.pos += {s.size}")
+        else:
+            packer, unpacker = TYPES[type_]
+            namespace[f"pack{i}"] = packer
+
+            pack_exprs.append(f"pack{i}({', '.join(f'self.{a}' for a in attrs)})")
+
+            if len(attrs) == 1:
+                unpack_lines.append(f"{names[0]} = buf.{unpacker}()")
+            else:
+                unpack_lines.append(f"{', '.join(names)} = buf.{unpacker}()")
+
+    if len(pack_exprs) == 0:
+        encode_body = 'return b""'
+    elif len(pack_exprs) == 1:
+        encode_body = f"return {pack_exprs[0]}"
+    else:
+        encode_body = f"return b''.join(({', '.join(pack_exprs)},))"
+
+    source = "\n".join(
+        [
+            "def encode(self):",
+            f"    {encode_body}",
+            "",
+            "def decode(cls, buf):",
+            *[f"    {line}" for line in unpack_lines],
+            f"    return cls({', '.join(values)})",
+        ]
+    )
+
+    exec(compile(source, f"<schema of {cls.__module__}.{cls.__name__}>", "exec"), namespace)
+
+    if "encode" not in cls.__dict__:
+        namespace["encode"].__qualname__ = f"{cls.__qualname__}.encode"
+        cls.encode = namespace["encode"]
+
+    if "decode" not in cls.__dict__:
+        namespace["decode"].__qualname__ = f"{cls.__qualname__}.decode"
+        cls.decode = classmethod(namespace["decode"])
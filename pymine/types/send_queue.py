@@ -0,0 +1,319 @@
+# A flexible and fast Minecraft server software written completely in Python.
+# Copyright (C) 2021 PyMine
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from collections import deque
+import asyncio
+
+__all__ = (
+    "LANE_CONTROL",
+    "LANE_MOVEMENT",
+    "LANE_CHAT",
+    "LANE_BULK",
+    "LANE_NAMES",
+    "EgressLimiter",
+    "PendingFrame",
+    "SendQueue",
+)
+
+# Lanes outgoing frames are queued in, lower lanes are written first, see Packet.lane
+LANE_CONTROL = 0  # keep alives, teleports, anything else which doesn't have a lane
+LANE_MOVEMENT = 1  # entity movement
+LANE_CHAT = 2  # chat messages and titles
+# chunk data and light, and everything applying to a loaded chunk (block changes, block entities,
+# unloading) so that it's written in the same order as the chunk's data
+LANE_BULK = 3
+LANE_NAMES = ("control", "movement", "chat", "bulk")
+
+
+class EgressLimiter:
+    """A token bucket which limits the total amount of bytes sent by the server per second.
+
+    :param int rate: Max amount of bytes sent per second.
+    :param int burst: Max amount of bytes sent at once after being idle, defaults to rate.
+    :ivar float tokens: The amount of bytes which can currently be sent, can be negative.
+    """
+
+    def __init__(self, rate: int, burst: int = None) -> None:
+        self.rate = rate
+        self.burst = rate if burst is None else burst
+
+        self._loop = asyncio.get_event_loop()
+        self._last = self._loop.time()
+
+        self.tokens = self.burst
+
+    def available(self) -> float:
+        """Refills the bucket and returns the amount of bytes which can currently be sent."""
+
+        now = self._loop.time()
+        self.tokens = min(self.burst, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+        return self.tokens
+
+    def consume(self, amount: int) -> None:
+        self.tokens -= amount
+
+
+class PendingFrame:
+    """A place in a lane reserved for a frame which is still being packed, see SendQueue.reserve().
+
+    :ivar int lane: The lane the place is in.
+    :ivar bytes frame: The packed frame, None until SendQueue.fill() was called.
+    :ivar bool dropped: Whether the queue was cleared meanwhile, so the frame won't be sent.
+    """
+
+    __slots__ = ("lane", "frame", "dropped")
+
+    def __init__(self, lane: int) -> None:
+        self.lane = lane
+        self.frame = None
+        self.dropped = False
+
+
+class SendQueue:
+    """Queues the outgoing frames of a connection, which are written together once per flush window.
+
+    Frames are queued in lanes (see LANE_NAMES) and written in the order of their lane, so latency
+    sensitive packets don't have to wait behind chunk data. Frames in the control lane are always
+    written on the next flush, the other lanes are written until the budget or the server's egress
+    limit is used up, anything left over is written on a later flush. Frames within a lane are
+    always written in the order they were queued in.
+
+    :param Stream stream: The stream to write to.
+    :param float flush_interval: The amount of seconds frames are queued for before being written.
+    :param int high_water: Frames aren't written while the transport's buffer is bigger than this.
+    :param int low_water: Size the transport's buffer has to drop to before writing resumes.
+    :param int max_buffered: Max amount of bytes queued + buffered before the connection is aborted.
+    :param int budget: Max amount of bytes written per flush, 0 for no limit.
+    :param EgressLimiter limiter: The server wide egress limiter, None for no limit.
+    :ivar list lanes: The frames which haven't been written yet, per lane.
+    :ivar list lane_bytes: The total size of the queued frames, per lane.
+    :ivar int queued: The total size of the queued frames.
+    :ivar bool overflowed: Whether the connection was aborted because the client was too slow.
+    """
+
+    def __init__(
+        self,
+        stream,
+        flush_interval: float,
+        high_water: int,
+        low_water: int,
+        max_buffered: int,
+        budget: int = 0,
+        limiter: EgressLimiter = None,
+    ) -> None:
+        self.stream = stream
+
+        self.flush_interval = flush_interval
+        self.high_water = high_water
+        self.max_buffered = max_buffered
+        self.budget = budget
+        self.limiter = limiter
+
+        self.lanes = [deque() for _ in LANE_NAMES]
+        self.lane_bytes = [0] * len(LANE_NAMES)
+        self.queued = 0
+        self.overflowed = False
+
+        self._loop = asyncio.get_event_loop()
+        self._flush_handle = None
+        self._waiters = []  # futures of drain() calls waiting for the next flush
+
+        stream.transport.set_write_buffer_limits(high_water, low_water)
+
+    @property
+    def buffered(self) -> int:
+        """The amount of bytes which haven't been sent yet, queued or in the transport's buffer."""
+
+        return self.queued + self.stream.transport.get_write_buffer_size()
+
+    @property
+    def pressured(self) -> bool:
+        """Whether producers should wait for the queue to drain before queueing more."""
+
+        return self.buffered > self.high_water
+
+    def stats(self) -> dict:
+        """Returns the amount of queued bytes per lane, like {lane name: bytes}."""
+
+        return dict(zip(LANE_NAMES, self.lane_bytes))
+
+    def push(self, frame: bytes, lane: int = LANE_CONTROL) -> None:
+        """Queues a frame in the given lane, it's written on the next flush."""
+
+        if self.stream.transport.is_closing():
+            return
+
+        self.lanes[lane].append(frame)
+        self._queued(lane, frame)
+
+    def reserve(self, lane: int = LANE_CONTROL) -> PendingFrame:
+        """Reserves the next place in a lane for a frame which is still being packed.
+
+        Frames queued in the lane afterwards aren't written before it, so they can't overtake it
+        while it's compressed in the thread executor. Pass the frame to fill() once it's packed.
+        """
+
+        pending = PendingFrame(lane)
+
+        if self.stream.transport.is_closing():
+            pending.dropped = True
+        else:
+            self.lanes[lane].append(pending)
+
+        return pending
+
+    def fill(self, pending: PendingFrame, frame: bytes) -> None:
+        """Sets the frame of a reserved place, which is written on the next flush.
+
+        b"" leaves the place empty, for when packing the frame failed.
+        """
+
+        if not pending.dropped:
+            pending.frame = frame
+            self._queued(pending.lane, frame)
+
+    def _queued(self, lane: int, frame: bytes) -> None:
+        self.lane_bytes[lane] += len(frame)
+        self.queued += len(frame)
+
+        if self.buffered > self.max_buffered:  # client isn't reading fast enough, so drop it
+            self.overflowed = True
+            self.clear()
+            self.stream.transport.abort()
+        elif self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self.flush_interval, self.flush)
+
+    def _take(self, allowance: float) -> list:
+        """Removes frames from the lanes in order, until the allowance is used up."""
+
+        frames = []
+        taken = 0
+
+        for lane, pending in enumerate(self.lanes):
+            lane_taken = 0
+
+            # the control lane ignores the allowance, but still uses it up
+            while pending and (lane == LANE_CONTROL or taken + lane_taken < allowance):
+                frame = pending[0]
+
+                if frame.__class__ is PendingFrame:
+                    if frame.frame is None:  # still being packed, what's behind it has to wait
+                        break
+
+                    frame = frame.frame
+
+                pending.popleft()
+                frames.append(frame)
+                lane_taken += len(frame)
+
+            self.lane_bytes[lane] -= lane_taken
+            taken += lane_taken
+
+        self.queued -= taken
+
+        if self.limiter is not None:
+            self.limiter.consume(taken)
+
+        return frames
+
+    def _wake(self) -> None:
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+        self._waiters.clear()
+
+    def flush(self) -> None:
+        """Writes the queued frames the budget allows for.
+
+        Nothing is written while the transport's buffer is above the high watermark.
+        """
+
+        self._flush_handle = None
+
+        if self.stream.transport.is_closing():
+            self.clear()
+            return
+
+        if self.queued and self.stream.transport.get_write_buffer_size() <= self.high_water:
+            allowance = self.budget or float("inf")
+
+            if self.limiter is not None:
+                allowance = min(allowance, self.limiter.available())
+
+            frames = self._take(allowance)
+
+            if frames:
+                self.stream.writelines(frames)
+
+        if self.queued:  # whatever is left is written on the next flush
+            self._flush_handle = self._loop.call_later(self.flush_interval, self.flush)
+
+        self._wake()
+
+    def write(self) -> None:
+        """Writes all queued frames at once, regardless of the transport's buffer or the budget."""
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if self.queued:
+            frames = self._take(float("inf"))
+
+            if not self.stream.transport.is_closing():
+                self.stream.writelines(frames)
+
+        self._wake()
+
+    async def drain(self) -> None:
+        """Waits until the amount of queued + buffered bytes is below the high watermark."""
+
+        while self.pressured and not self.stream.transport.is_closing():
+            if self.stream.transport.get_write_buffer_size() > self.high_water:
+                # waits until the transport's buffer is below the low watermark
+                await self.stream.drain()
+            else:
+                waiter = self._loop.create_future()
+                self._waiters.append(waiter)
+                await waiter
+
+    async def close(self) -> None:
+        """Writes all queued frames and waits until they've been handed off to the OS."""
+
+        self.write()
+        await self.stream.drain()
+
+    def clear(self) -> None:
+        """Drops all queued frames."""
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        for pending in self.lanes:
+            for frame in pending:
+                if frame.__class__ is PendingFrame:
+                    frame.dropped = True
+
+            pending.clear()
+
+        self.lane_bytes = [0] * len(LANE_NAMES)
+        self.queued = 0
+
+        self._wake()
@@ -16,6 +16,15 @@
 
 from cryptography.hazmat.primitives.ciphers import Cipher
 from asyncio import StreamWriter, StreamReader
+import asyncio
+import time
+
+from pymine.api.errors import InvalidPacketData
+
+READ_SIZE = 65536  # max amount of bytes to pull from the StreamReader per read
+MAX_FRAME_HEADER = 3  # frame lengths are varints no longer than 3 bytes (max 2097151)
+CIPHER_PADDING = 15  # update_into() needs block size - 1 extra bytes in the output buffer
+PADDING = bytes(CIPHER_PADDING)
 
 
 class Stream(StreamWriter):
@@ -24,13 +33,23 @@ class Stream(StreamWriter):
     :param StreamReader reader: An asyncio.StreamReader instance.
     :param StreamWriter writer: An asyncio.StreamWriter instance.
     :ivar tuple remote: A tuple which stores the remote client's address and port.
+    :ivar bytearray read_buf: Data which has been received but not yet split into frames.
+    :ivar float last_read: The loop time of the last successful read.
+    :ivar bool timed_out: Whether the connection was aborted for being idle, see check_idle().
     """
 
     def __init__(self, reader: StreamReader, writer: StreamWriter) -> None:
         super().__init__(writer._transport, writer._protocol, writer._reader, writer._loop)
 
+        # StreamWriter.__del__ closes the transport, so the wrapped writer has to outlive this one
+        self._wrapped = writer
+
         self.remote = self.get_extra_info("peername")
 
+        self.read_buf = bytearray()
+        self.last_read = self._loop.time()
+        self.timed_out = False
+
     def read(self, n: int = -1) -> bytes:
         return self._reader.read(n)
 
@@ -43,36 +62,218 @@ class Stream(StreamWriter):
     def readuntil(self, separator: bytes = b"\n") -> bytes:
         return self._reader.readuntil(separator)
 
+    def _buffer(self, data: bytes) -> None:
+        """Appends received data to the read buffer."""
+
+        self.read_buf += data
+
+    async def fill(self) -> None:
+        """Reads whatever data is available into the read buffer, at most READ_SIZE bytes."""
+
+        data = await self._reader.read(READ_SIZE)
+
+        if not data:
+            raise asyncio.IncompleteReadError(bytes(self.read_buf), None)
+
+        self._buffer(data)
+        self.last_read = self._loop.time()
+
+    async def fill_exactly(self, n: int) -> None:
+        """Reads exactly n bytes into the read buffer."""
+
+        self._buffer(await self._reader.readexactly(n))
+        self.last_read = self._loop.time()
+
+    async def peek(self, n: int) -> bytes:
+        """Returns the next n bytes of the read buffer without consuming them."""
+
+        while len(self.read_buf) < n:
+            await self.fill()
+
+        return bytes(self.read_buf[:n])
+
+    async def read_frame(self) -> bytearray:
+        """Reads a single length-prefixed frame, the length is parsed straight from the read buffer.
+
+        Raw reads (read(), readexactly(), etc...) shouldn't be mixed with this, as data may already
+        be buffered.
+
+        :raises InvalidPacketData: If the frame's length is invalid.
+        :raises asyncio.IncompleteReadError: If the connection was closed before a full frame was
+            read.
+        :return: The contents of the frame, without the length prefix.
+        :rtype: bytearray
+        """
+
+        buf = self.read_buf
+
+        while True:
+            length = 0
+
+            for i in range(min(len(buf), MAX_FRAME_HEADER)):
+                b = buf[i]
+                length |= (b & 0x7F) << 7 * i
+
+                if not b & 0x80:
+                    header = i + 1
+                    break
+            else:
+                if len(buf) >= MAX_FRAME_HEADER:
+                    raise InvalidPacketData("Frame length is longer than 3 bytes.")
+
+                await self.fill()
+                continue
+
+            break
+
+        if length == 0:
+            raise InvalidPacketData("Frame length is 0.")
+
+        end = header + length
+        missing = end - len(buf)
+
+        if missing > 0:  # body isn't fully buffered yet, so wait for exactly what's missing
+            await self.fill_exactly(missing)
+
+        frame = buf[header:end]
+        del buf[:end]
+
+        return frame
+
+    def check_idle(self, timeout: float) -> float:
+        """Aborts the connection if nothing was read for timeout seconds, called by a TimerWheel.
+
+        :param float timeout: The max amount of seconds between reads.
+        :return: The seconds left until the connection times out, None if it's closed.
+        :rtype: float
+        """
+
+        if self.transport.is_closing():
+            return None
+
+        left = timeout - (self._loop.time() - self.last_read)
+
+        if left <= 0:
+            self.timed_out = True
+            self.transport.abort()
+            return None
+
+        return left
+
 
 class EncryptedStream(Stream):
     """An encrypted version of a Stream, automatically encrypts and decrypts outgoing and incoming data.
 
+    Received chunks are decrypted with update_into() into a buffer allocated once per stream, and
+    everything written at once (like the frames flushed by a SendQueue) is encrypted in place with
+    a single cipher call.
+
     :param Stream stream: The original, stream-compatible object.
     :param Cipher cipher: The cipher object, used to encrypt + decrypt data.
-    :ivar _CipherContext decryptor: Description of parameter `_CipherContext`.
-    :ivar _CipherContext encryptor: Description of parameter `_CipherContext`.
+    :param Cipher decrypt_cipher: Used to decrypt data instead of cipher, if the two directions are
+        at different states.
+    :ivar _CipherContext decryptor: Used to decrypt incoming data.
+    :ivar _CipherContext encryptor: Used to encrypt outgoing data.
+    :ivar int bytes_decrypted: The total amount of bytes decrypted.
+    :ivar int bytes_encrypted: The total amount of bytes encrypted.
+    :ivar float cipher_time: The total amount of seconds spent encrypting and decrypting.
     """
 
-    def __init__(self, stream: Stream, cipher: Cipher) -> None:
+    def __init__(self, stream: Stream, cipher: Cipher, decrypt_cipher: Cipher = None) -> None:
         super().__init__(stream._reader, stream)
 
-        self.decryptor = cipher.decryptor()
+        if decrypt_cipher is None:
+            decrypt_cipher = cipher
+
+        self.decryptor = decrypt_cipher.decryptor()
         self.encryptor = cipher.encryptor()
 
+        # AES/CFB8's state is the last 16 bytes of ciphertext, see cipher_state()
+        self._encrypt_tail = cipher.mode.initialization_vector
+        self._decrypt_tail = decrypt_cipher.mode.initialization_vector
+
+        self.bytes_decrypted = 0
+        self.bytes_encrypted = 0
+        self.cipher_time = 0
+
+        self._decrypt_buf = bytearray(READ_SIZE + CIPHER_PADDING)
+        self._decrypt_view = memoryview(self._decrypt_buf)
+
+        # take over the state of the original stream, anything left in its buffer was sent encrypted
+        self._buffer(stream.read_buf)
+        self.last_read = stream.last_read
+
+    def _decrypt(self, data: bytes) -> bytes:
+        self._decrypt_tail = (self._decrypt_tail + data[-16:])[-16:]
+        return self.decryptor.update(data)
+
     async def read(self, n: int = -1) -> bytes:
-        return self.decryptor.update(await super().read(n))
+        return self._decrypt(await super().read(n))
 
     async def readline(self) -> bytes:
-        return self.decryptor.update(await super().readline())
+        return self._decrypt(await super().readline())
 
     async def readexactly(self, n: int) -> bytes:
-        return self.decryptor.update(await super().readexactly(n))
+        return self._decrypt(await super().readexactly(n))
 
     async def readuntil(self, separator: bytes = b"\n") -> bytes:
-        return self.decryptor.update(await super().readuntil(separator))
+        return self._decrypt(await super().readuntil(separator))
+
+    def _buffer(self, data: bytes) -> None:
+        start = time.perf_counter()
+        data = memoryview(data)
+
+        # a single chunk, unless data is bigger than READ_SIZE (like a frame read by fill_exactly())
+        for i in range(0, len(data), READ_SIZE):
+            n = self.decryptor.update_into(data[i : i + READ_SIZE], self._decrypt_buf)
+            self.read_buf += self._decrypt_view[:n]
+
+        self._decrypt_tail = (self._decrypt_tail + data[-16:].tobytes())[-16:]
+        self.bytes_decrypted += len(data)
+        self.cipher_time += time.perf_counter() - start
+
+    def _encrypt(self, data: bytearray) -> bytearray:
+        """Encrypts data in place, data has to be a fresh bytearray as the transport may keep it."""
+
+        start = time.perf_counter()
+        length = len(data)
+
+        data += PADDING
+        self.encryptor.update_into(memoryview(data)[:length], data)
+        del data[length:]
+
+        self._encrypt_tail = (self._encrypt_tail + data[-16:])[-16:]
+
+        self.bytes_encrypted += length
+        self.cipher_time += time.perf_counter() - start
+
+        return data
 
     def write(self, data: bytes) -> None:
-        return super().write(self.encryptor.update(data))
+        return super().write(self._encrypt(bytearray(data)))
+
+    def writelines(self, data: list) -> None:
+        return super().write(self._encrypt(bytearray().join(data)))
+
+    def cipher_state(self) -> tuple:
+        """Returns the ivs which continue the current encryption and decryption.
+
+        CFB8's state is the last 16 bytes of ciphertext, so gen_aes_cipher(shared_key, iv) with
+        these picks up exactly where this stream left off, even in another process.
+
+        :return: (encrypt iv, decrypt iv)
+        """
+
+        return bytes(self._encrypt_tail), bytes(self._decrypt_tail)
+
+    def cipher_stats(self) -> dict:
+        """Returns the amount of bytes encrypted/decrypted and the cipher's bytes per second."""
+
+        total = self.bytes_encrypted + self.bytes_decrypted
 
-    def writelines(self, data: bytes) -> None:
-        return super().writelines(self.encryptor.update(data))
+        return {
+            "bytes_encrypted": self.bytes_encrypted,
+            "bytes_decrypted": self.bytes_decrypted,
+            "cipher_time": self.cipher_time,
+            "throughput": total / self.cipher_time if self.cipher_time else 0,
+        }
@@ -0,0 +1,73 @@
+# A flexible and fast Minecraft server software written completely in Python.
+# Copyright (C) 2021 PyMine
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import math
+
+__all__ = ("TimerWheel",)
+
+
+class TimerWheel:
+    """Tracks deadlines for any amount of objects at once, like the idle deadlines of connections.
+
+    Objects are put in the slot of the tick their deadline falls in, so scheduling is O(1) and each
+    tick only looks at the objects which are due. Deadlines which only ever move later (an idle
+    deadline moves on every read) don't touch the wheel at all, expire is called at the old deadline
+    and returns how much longer to wait from there.
+
+    :param expire: Called with an object once it's due, returns the seconds until it's due again,
+        or None to drop it.
+    :param float tick: The resolution of the wheel in seconds, objects are due up to a tick off.
+    :param int slots: The amount of slots, longer delays are split up into multiple turns.
+    :ivar int tracked: The amount of objects in the wheel.
+    """
+
+    def __init__(self, expire, tick: float = 1, slots: int = 64) -> None:
+        self.expire = expire
+        self.tick = tick
+        self.slots = [[] for _ in range(slots)]
+        self.tracked = 0
+
+        self._position = 0  # the slot of the last processed tick
+        self._time = None  # the time of the last processed tick
+
+    def schedule(self, obj: object, delay: float) -> None:
+        """Calls expire with obj once delay seconds have passed."""
+
+        ticks = min(max(math.ceil(delay / self.tick), 1), len(self.slots) - 1)
+
+        self.slots[(self._position + ticks) % len(self.slots)].append(obj)
+        self.tracked += 1
+
+    def advance(self, now: float) -> None:
+        """Processes every tick up to now, the first call only sets the time the wheel starts at."""
+
+        if self._time is None:
+            self._time = now
+            return
+
+        while now - self._time >= self.tick:
+            self._time += self.tick
+            self._position = (self._position + 1) % len(self.slots)
+
+            due = self.slots[self._position]
+            self.slots[self._position] = []
+            self.tracked -= len(due)
+
+            for obj in due:
+                delay = self.expire(obj)
+
+                if delay is not None:
+                    self.schedule(obj, delay)
@@ -0,0 +1,81 @@
+# A flexible and fast Minecraft server software written completely in Python.
+# Copyright (C) 2021 PyMine
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import zlib
+
+from pymine.api.errors import InvalidPacketData
+
+__all__ = (
+    "MAX_UNCOMPRESSED_LENGTH",
+    "Inflater",
+)
+
+MAX_UNCOMPRESSED_LENGTH = 2097152  # max size of a decompressed serverbound packet, same as vanilla
+
+
+class Inflater:
+    """Decompresses the serverbound packets of a single connection.
+
+    zlib decompression objects can't be reset once a stream is finished, so a new one is
+    created for each packet, the output is however bounded by the length the client claims
+    (and max_length), so a small packet can't inflate into something huge.
+
+    :param int comp_thresh: The compression threshold which was sent to the client.
+    :param int max_length: The max size of a packet once decompressed.
+    :ivar int packets: The amount of packets which have been decompressed.
+    :ivar int bytes_in: The total size of the packets before decompression.
+    :ivar int bytes_out: The total size of the packets after decompression.
+    """
+
+    def __init__(self, comp_thresh: int, max_length: int = MAX_UNCOMPRESSED_LENGTH) -> None:
+        self.comp_thresh = comp_thresh
+        self.max_length = max_length
+
+        self.packets = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def inflate(self, data: memoryview, length: int) -> memoryview:
+        """Decompresses a packet, the result can be read from without being copied.
+
+        :param memoryview data: The compressed data.
+        :param int length: The uncompressed length that was sent by the client.
+        :raises InvalidPacketData: If the data is invalid or doesn't match the given length.
+        :return: The decompressed data.
+        :rtype: memoryview
+        """
+
+        if length < self.comp_thresh:
+            raise InvalidPacketData(f"Compressed packet is below the threshold ({length}).")
+
+        if length > self.max_length:
+            raise InvalidPacketData(f"Compressed packet is too big ({length}).")
+
+        try:
+            # ask for one more byte than expected, so packets which are too big can be detected
+            # without decompressing all of them
+            out = zlib.decompressobj().decompress(data, length + 1)
+        except zlib.error as e:
+            raise InvalidPacketData(f"Failed to decompress packet: {e}")
+
+        if len(out) != length:
+            raise InvalidPacketData(f"Compressed packet has the wrong length ({length}).")
+
+        self.packets += 1
+        self.bytes_in += len(data)
+        self.bytes_out += length
+
+        return memoryview(out)
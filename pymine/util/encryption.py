@@ -45,6 +45,7 @@ def gen_verify_hash(shared_key: bytes, public_key: bytes):
 
 
 def gen_aes_cipher(
-    shared_key: bytes,
+    shared_key: bytes, iv: bytes = None
 ):  # cipher used to encrypt + decrypt data sent via an encrypted socket
-    return Cipher(algorithms.AES(shared_key), modes.CFB8(shared_key))
+    # iv defaults to the shared key, pass one to continue a cipher, see EncryptedStream.cipher_state
+    return Cipher(algorithms.AES(shared_key), modes.CFB8(shared_key if iv is None else iv))
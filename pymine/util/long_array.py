@@ -0,0 +1,79 @@
+# A flexible and fast Minecraft server software written completely in Python.
+# Copyright (C) 2021 PyMine
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Packs and unpacks the long arrays chunk sections (and heightmaps) are stored and sent in."""
+
+import numpy
+
+__all__ = (
+    "long_array_len",
+    "pack_long_array",
+    "unpack_long_array",
+)
+
+
+def long_array_len(count: int, bits: int) -> int:
+    """Returns how many longs count values of the given amount of bits are packed into."""
+
+    return -(-count // (64 // bits))
+
+
+def pack_long_array(values: numpy.ndarray, bits: int) -> numpy.ndarray:
+    """Packs values into a big-endian long array, flattened in C order (so y, z, x for sections).
+
+    Since 1.16 values don't span multiple longs, each long holds 64 // bits values starting from its
+    lowest bits and whatever bits are left over at the top are 0.
+
+    :param numpy.ndarray values: The values to pack, like a (16, 16, 16) array of block states.
+    :param int bits: The amount of bits per value, values are masked to fit.
+    :return: The packed longs, call .tobytes() on it to get the data sent over the network.
+    :rtype: numpy.ndarray
+    """
+
+    per_long = 64 // bits
+    flat = values.ravel()
+    padding = -len(flat) % per_long
+
+    if padding:
+        flat = numpy.concatenate((flat, numpy.zeros(padding, flat.dtype)))
+
+    grid = flat.astype(numpy.uint64).reshape(-1, per_long)  # one row per long
+    grid &= numpy.uint64((1 << bits) - 1)
+    grid <<= numpy.arange(0, per_long * bits, bits, dtype=numpy.uint64)
+
+    return numpy.bitwise_or.reduce(grid, axis=1).astype(">i8")
+
+
+def unpack_long_array(
+    longs: object, bits: int, count: int = 4096, dtype: type = numpy.int32
+) -> numpy.ndarray:
+    """Unpacks a long array made by pack_long_array(), the inverse of it.
+
+    :param longs: The longs, anything numpy can make a 64 bit int array from, like a TAG_Long_Array.
+    :param int bits: The amount of bits per value.
+    :param int count: The amount of values to unpack, the padding of the last long is ignored.
+    :param type dtype: The type of the returned array.
+    :return: A flat array of count values, reshape it to get (16, 16, 16) block states for example.
+    :rtype: numpy.ndarray
+    """
+
+    per_long = 64 // bits
+    longs = numpy.asarray(longs, numpy.int64).view(numpy.uint64)
+
+    grid = longs[:, None] >> numpy.arange(0, per_long * bits, bits, dtype=numpy.uint64)
+    grid &= numpy.uint64((1 << bits) - 1)
+
+    return grid.ravel()[:count].astype(dtype)
@@ -0,0 +1,56 @@
+# A flexible and fast Minecraft server software written completely in Python.
+# Copyright (C) 2021 PyMine
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Packs and unpacks the nibble arrays (4 bits per value) light levels are stored and sent in."""
+
+import numpy
+
+__all__ = (
+    "pack_nibbles",
+    "unpack_nibbles",
+)
+
+
+def pack_nibbles(values: numpy.ndarray) -> bytes:
+    """Packs values of 0-15 into a nibble array, flattened in C order (so y, z, x for sections).
+
+    :param numpy.ndarray values: An even amount of values, like (16, 16, 16) light levels.
+    :return: The packed nibbles, values.size // 2 bytes.
+    :rtype: bytes
+    """
+
+    pairs = values.reshape(-1, 2)
+
+    return (pairs[:, 0] | pairs[:, 1] << 4).astype(numpy.uint8).tobytes()
+
+
+def unpack_nibbles(data: bytes, dtype: type = numpy.int16) -> numpy.ndarray:
+    """Unpacks a nibble array, each byte holds two values with the first one in its low nibble.
+
+    :param bytes data: The packed nibbles, anything supporting the buffer protocol, like a
+        TAG_Byte_Array.
+    :param type dtype: The type of the returned array.
+    :return: A flat array of len(data) * 2 values, reshape it to get (16, 16, 16) light levels.
+    :rtype: numpy.ndarray
+    """
+
+    packed = numpy.frombuffer(data, numpy.uint8)
+    values = numpy.empty(len(packed) * 2, dtype)
+
+    values[0::2] = packed & 0x0F
+    values[1::2] = packed >> 4
+
+    return values
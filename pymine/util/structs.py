@@ -0,0 +1,54 @@
+# A flexible and fast Minecraft server software written completely in Python.
+# Copyright (C) 2021 PyMine
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import struct
+
+__all__ = (
+    "get_struct",
+    "BOOL",
+    "SHORT",
+    "USHORT",
+    "INT",
+    "LONG",
+    "FLOAT",
+    "DOUBLE",
+)
+
+_STRUCTS = {}  # {format: struct.Struct}, keyed by the format without the byte order prefix
+
+
+def get_struct(f: str) -> struct.Struct:
+    """Returns the precompiled big-endian struct.Struct for a format like "i" or "ddd?".
+
+    Formats are compiled once and cached forever, so this is meant for the formats hardcoded
+    in the packets and NBT code, not for ones built at runtime (like array lengths).
+    """
+
+    s = _STRUCTS.get(f)
+
+    if s is None:
+        s = _STRUCTS[f] = struct.Struct(">" + f)
+
+    return s
+
+
+BOOL = get_struct("?")
+SHORT = get_struct("h")
+USHORT = get_struct("H")
+INT = get_struct("i")
+LONG = get_struct("q")
+FLOAT = get_struct("f")
+DOUBLE = get_struct("d")
@@ -0,0 +1,173 @@
+# A flexible and fast Minecraft server software written completely in Python.
+# Copyright (C) 2021 PyMine
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__all__ = (
+    "SMALL_VARINTS",
+    "pack_varint",
+    "pack_varlong",
+    "pack_varints",
+    "write_varint",
+    "unpack_varint",
+    "unpack_varlong",
+)
+
+SMALL_VARINTS = 1 << 14  # every varint up to 2 bytes long is encoded ahead of time
+_SMALL_BITS = 15  # the smallest max_bits every value in the table fits in
+
+_LIMITS = {}  # {max_bits: (min, max, two's complement width, max length in bytes)}
+
+
+def _limits(max_bits: int) -> tuple:
+    limits = _LIMITS.get(max_bits)
+
+    if limits is None:
+        limits = _LIMITS[max_bits] = (
+            -1 << (max_bits - 1),
+            (1 << (max_bits - 1)) - 1,
+            64 if max_bits > 32 else 32,
+            5 if max_bits <= 32 else 10,
+        )
+
+    return limits
+
+
+def _encode(num: int) -> bytes:  # num has to be positive already
+    out = bytearray()
+
+    while True:
+        b = num & 0x7F
+        num >>= 7
+
+        if num == 0:
+            out.append(b)
+            return bytes(out)
+
+        out.append(b | 0x80)
+
+
+_ENCODED = tuple([_encode(num) for num in range(SMALL_VARINTS)])
+
+
+def pack_varint(num: int, max_bits: int = 32) -> bytes:
+    """Packs a varint into bytes, small positive values are looked up instead of being encoded.
+
+    :param int num: The number to pack.
+    :param int max_bits: The size of the signed integer num has to fit in.
+    :raises ValueError: If num doesn't fit in max_bits.
+    :return: The packed varint.
+    :rtype: bytes
+    """
+
+    if 0 <= num < SMALL_VARINTS and max_bits >= _SMALL_BITS:
+        return _ENCODED[num]
+
+    num_min, num_max, width, _ = _limits(max_bits)
+
+    if not (num_min <= num <= num_max):
+        raise ValueError(f"num doesn't fit in given range: {num_min} <= {num} < {num_max}")
+
+    if num < 0:
+        num += 1 << width
+
+    return _encode(num)
+
+
+def pack_varlong(num: int) -> bytes:
+    """Packs a varlong (a varint of up to 64 bits) into bytes."""
+
+    return pack_varint(num, 64)
+
+
+def pack_varints(nums: list, max_bits: int = 32) -> bytes:
+    """Packs an array of varints at once (without a length prefix), like the biomes of a chunk.
+
+    :param list nums: The numbers to pack.
+    :param int max_bits: The size of the signed integer the numbers have to fit in.
+    :raises ValueError: If a number doesn't fit in max_bits.
+    :return: The packed varints, one after another.
+    :rtype: bytes
+    """
+
+    if not nums:
+        return b""
+
+    # usual case, every value is in the table
+    if max_bits >= _SMALL_BITS and min(nums) >= 0 and max(nums) < SMALL_VARINTS:
+        return b"".join(map(_ENCODED.__getitem__, nums))
+
+    return b"".join([pack_varint(num, max_bits) for num in nums])
+
+
+def write_varint(buf: bytearray, num: int, max_bits: int = 32) -> None:
+    """Packs a varint straight onto the end of a bytearray."""
+
+    if 0 <= num < SMALL_VARINTS and max_bits >= _SMALL_BITS:
+        buf += _ENCODED[num]
+    else:
+        buf += pack_varint(num, max_bits)
+
+
+def unpack_varint(data: memoryview, pos: int = 0, max_bits: int = 32) -> tuple:
+    """Unpacks a varint from data (a memoryview, bytes or bytearray) in a single pass.
+
+    :param memoryview data: The data to unpack from.
+    :param int pos: The position in data the varint starts at.
+    :param int max_bits: The size of the signed integer the varint has to fit in.
+    :raises ValueError: If the varint is too long or doesn't fit in max_bits.
+    :raises IndexError: If data ends before the varint does.
+    :return: The unpacked number and the position right after it.
+    :rtype: tuple
+    """
+
+    b = data[pos]
+
+    if b < 0x80:  # single byte, the most common case
+        return b, pos + 1
+
+    num_min, num_max, width, max_len = _limits(max_bits)
+
+    num = b & 0x7F
+    end = pos + max_len
+    shift = 7
+    pos += 1
+
+    while True:
+        if pos == end:
+            raise ValueError(f"varint is longer than {max_len} bytes")
+
+        b = data[pos]
+        pos += 1
+
+        num |= (b & 0x7F) << shift
+
+        if b < 0x80:
+            break
+
+        shift += 7
+
+    if num & (1 << (width - 1)):
+        num -= 1 << width
+
+    if not (num_min <= num <= num_max):
+        raise ValueError(f"num doesn't fit in given range: {num_min} <= {num} < {num_max}")
+
+    return num, pos
+
+
+def unpack_varlong(data: memoryview, pos: int = 0) -> tuple:
+    """Unpacks a varlong (a varint of up to 64 bits) from data, like unpack_varint()."""
+
+    return unpack_varint(data, pos, 64)
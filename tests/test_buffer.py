@@ -1,10 +1,24 @@
+import numpy
 import json
+import uuid
+import zlib
 import sys
 import os
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import pytest
+from pymine.types.block_palette import DirectPalette, IndirectPalette
+from pymine.net.packets.status.status import StatusStatusResponse
+from pymine.util.nibble_array import pack_nibbles, unpack_nibbles
+from pymine.net.packets.play.player import PlayPlayerMovement
+from pymine.util.long_array import unpack_long_array
+from pymine.types.chunk import Chunk, ChunkSection
+from pymine.api.errors import InvalidPacketData
+from pymine.util.compression import Inflater
+from pymine.net.packet_map import PACKET_MAP
+from pymine.types.registry import Registry
+from pymine.types.packet import LazyPacket
 from pymine.types.buffer import Buffer
 import pymine.types.nbt as nbt
 
@@ -121,3 +135,211 @@ def test_json():
     for key, value in buf.unpack_json().items():
         assert key in data
         assert data[key] == value
+
+
+def test_compressed_packet():
+    def packed(message, comp_thresh):  # serverbound packets don't have an encode() method
+        data = Buffer.pack_varint(0x03) + Buffer.pack_string(message)
+
+        if len(data) >= comp_thresh:
+            return Buffer(Buffer.pack_varint(len(data)) + zlib.compress(data))
+
+        return Buffer(Buffer.pack_varint(0) + data)
+
+    inflater = Inflater(256)
+
+    for message in ("hi", "a" * 300):
+        packet = packed(message, 256).unpack_packet(3, PACKET_MAP, 256, inflater)
+        assert packet.message == message
+
+    assert inflater.packets == 1
+
+    # uncompressed length doesn't match the actual length of the data
+    data = Buffer.pack_varint(0x03) + Buffer.pack_string("a" * 300)
+    bomb = Buffer(Buffer.pack_varint(len(data) - 1) + zlib.compress(data))
+
+    with pytest.raises(InvalidPacketData):
+        bomb.unpack_packet(3, PACKET_MAP, 256, inflater)
+
+    # uncompressed length is above the max packet size
+    bomb = Buffer(Buffer.pack_varint(1 << 30) + zlib.compress(data))
+
+    with pytest.raises(InvalidPacketData):
+        bomb.unpack_packet(3, PACKET_MAP, 256, inflater)
+
+
+def test_pack_frame():
+
+    packet = StatusStatusResponse({"description": {"text": "a" * 300}})
+    data = Buffer.pack_varint(packet.id) + packet.encode()
+
+    for comp_thresh in (-1, 256, 1024):
+        assert Buffer.pack_frame(data, comp_thresh) == Buffer.pack_packet(packet, comp_thresh)
+
+    fast, small = Buffer.pack_frame(data, 256, 1), Buffer.pack_frame(data, 256, 9)
+
+    assert len(small) < len(fast)
+
+    for frame in (fast, small):
+        buf = Buffer(frame)
+        assert buf.unpack_varint() == len(frame) - 1 and buf.unpack_varint() == len(data)
+        assert zlib.decompress(buf.read()) == data
+
+
+def test_writers():
+
+    uuid_ = uuid.uuid4()
+    buf = Buffer()
+
+    buf.write_byte(-2)
+    buf.write_pack("iq?", 123, 1234567890456, True)
+    buf.write_varint(-3749146)
+    buf.write_string("adkfj;\xc3\x85\xc3\x84")
+    buf.write_json({"a": [1, 2]})
+    buf.write_uuid(uuid_)
+
+    assert buf.buf == (
+        Buffer.pack_byte(-2)
+        + Buffer.pack("iq?", 123, 1234567890456, True)
+        + Buffer.pack_varint(-3749146)
+        + Buffer.pack_string("adkfj;\xc3\x85\xc3\x84")
+        + Buffer.pack_json({"a": [1, 2]})
+        + Buffer.pack_uuid(uuid_)
+    )
+
+    assert buf.unpack("b") == -2
+    assert buf.unpack("iq?") == (123, 1234567890456, True)
+    assert buf.unpack_varint() == -3749146
+    assert buf.unpack_string() == "adkfj;\xc3\x85\xc3\x84"
+    assert buf.unpack_json() == {"a": [1, 2]}
+    assert buf.unpack_uuid() == uuid_
+
+    with pytest.raises(ValueError):
+        buf.write_varint(VAR_INT_MAX + 1)
+
+
+def test_read_view():
+    buf = Buffer(b"\x00\x01\x02\x03")
+
+    view = buf.read_view(2)
+    assert view == b"\x00\x01" and buf.pos == 2
+
+    # the buffer can't be resized in place while the view is alive, so it's copied
+    buf.write(b"\x04")
+    buf.write_varint(5)
+    buf.write_pack("b", 6)
+
+    assert view == b"\x00\x01"
+    assert buf.read() == b"\x02\x03\x04\x05\x06"
+
+
+def test_fixed_width_readers():
+    buf = Buffer(Buffer.pack("?hHiqfd", True, -2, 65535, -3, 1234567890456, 1.5, -2.25))
+
+    assert buf.unpack_bool() is True
+    assert buf.unpack_short() == -2
+    assert buf.unpack_ushort() == 65535
+    assert buf.unpack_int() == -3
+    assert buf.unpack_long() == 1234567890456
+    assert buf.unpack_float() == 1.5
+    assert buf.unpack_double() == -2.25
+    assert buf.pos == len(buf)
+
+    buf = Buffer(Buffer.pack("iii", 1, -2, 3) + Buffer.pack("b", 4))
+
+    assert buf.unpack_array("i", 3) == (1, -2, 3)
+    assert buf.unpack("b") == 4
+    assert buf.unpack_array("q", 0) == ()
+
+
+def test_unpack_packet_class():
+
+    data = Buffer.pack_varint(PlayPlayerMovement.id) + Buffer.pack("?", True)
+
+    buf = Buffer(data)
+    assert buf.unpack_packet_class(3, PACKET_MAP) is PlayPlayerMovement
+    assert buf.pos == 1  # only the header was read
+
+    packet = LazyPacket(PlayPlayerMovement, buf)
+    assert packet.id == PlayPlayerMovement.id and buf.pos == 1
+
+    assert packet.on_ground is True  # decoded on first access
+    assert isinstance(packet.decode(), PlayPlayerMovement) and buf.pos == 2
+
+    assert Buffer(data).unpack_packet(3, PACKET_MAP).on_ground is True
+
+
+def test_pack_chunk_section_blocks():
+    section = ChunkSection.new(0, DirectPalette)
+    stone = DirectPalette.encode("minecraft:stone")
+
+    section.block_states[0] = stone  # the bottom layer
+    section.block_states[5, 3, 7] = DirectPalette.encode("minecraft:cave_air")
+    section.block_states[15, 15, 15] = stone
+
+    buf = Buffer(Buffer.pack_chunk_section_blocks(section))
+
+    assert buf.unpack("h") == 257  # non-air blocks
+    assert buf.unpack("B") == 15  # the direct palette isn't sent
+
+    longs = buf.unpack_array("q", buf.unpack_varint())
+    assert len(longs) == 1024  # 4 values per long
+    assert (unpack_long_array(longs, 15).reshape(16, 16, 16) == section.block_states).all()
+    assert buf.read() == b""
+
+    # indirect palettes are sent mapped to the global palette
+    names = ["minecraft:air", "minecraft:stone"]
+    section.palette = IndirectPalette(
+        Registry(
+            {name: {"states": [{"id": i}]} for i, name in enumerate(names)},
+            {i: {"name": name} for i, name in enumerate(names)},
+        ),
+        4,
+    )
+    section.block_states[section.block_states == stone] = 1
+    section.block_states[5, 3, 7] = 0
+
+    buf = Buffer(Buffer.pack_chunk_section_blocks(section))
+
+    assert buf.unpack("h") == 257 and buf.unpack("B") == 4
+    assert [buf.unpack_varint() for _ in range(buf.unpack_varint())] == [0, stone]
+    assert len(buf.unpack_array("q", buf.unpack_varint())) == 256
+
+
+def test_pack_nibbles():
+    values = numpy.random.default_rng(0).integers(0, 16, (16, 16, 16), numpy.int16)
+    packed = pack_nibbles(values)
+
+    assert len(packed) == 2048
+    assert packed[0] == values[0, 0, 0] | values[0, 0, 1] << 4  # the first value is the low nibble
+    assert (unpack_nibbles(packed).reshape(16, 16, 16) == values).all()
+
+
+def test_pack_chunk_light():
+    chunk = Chunk.new(3, -7, 0)
+
+    for y in (-1, 0, 1, 16):
+        chunk[y] = ChunkSection.new(y, DirectPalette)
+
+    chunk[-1].sky_light[:] = 15
+    chunk[0].sky_light[15, 2, 3] = 7
+    chunk[1].block_light[0, 0, 0] = 14
+    chunk[16].sky_light = None  # no light at all, so in none of the masks
+    chunk[16].block_light = None
+
+    buf = Buffer(Buffer.pack_chunk_light(chunk))
+
+    assert (buf.unpack_varint(), buf.unpack_varint(), buf.unpack("?")) == (3, -7, True)
+
+    # bit 0 is section -1
+    assert buf.unpack_varint() == 0b011  # sky light
+    assert buf.unpack_varint() == 0b100  # block light
+    assert buf.unpack_varint() == 0b100  # empty sky light
+    assert buf.unpack_varint() == 0b011  # empty block light
+
+    for section, light in ((-1, "sky_light"), (0, "sky_light"), (1, "block_light")):
+        assert buf.unpack_varint() == 2048
+        array = unpack_nibbles(buf.read(2048)).reshape(16, 16, 16)
+        assert (array == getattr(chunk[section], light)).all()
+
+    assert buf.read() == b""
@@ -0,0 +1,156 @@
+import random
+import struct
+import zlib
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pymine.types.block_palette import DirectPalette, IndirectPalette
+from pymine.data.block_states import BLOCK_STATES
+from pymine.logic.worldio import ChunkIO
+from pymine.types.buffer import Buffer
+import pymine.types.nbt as nbt
+
+
+def reference_block_states(indexes: list, bits: int) -> list:
+    """Packs palette indexes into longs one at a time, the way vanilla 1.16+ stores them."""
+
+    per_long = 64 // bits
+    longs = [0] * -(-len(indexes) // per_long)
+
+    for i, index in enumerate(indexes):
+        longs[i // per_long] |= index << (i % per_long * bits)
+
+    return [l - (1 << 64) if l >= 1 << 63 else l for l in longs]
+
+
+def reference_nibbles(values: list) -> bytearray:
+    return bytearray(values[i] | values[i + 1] << 4 for i in range(0, len(values), 2))
+
+
+def palette_tag(states: list) -> nbt.TAG_List:
+    entries = []
+
+    for state in states:
+        block = BLOCK_STATES.decode(state)
+        entry = [nbt.TAG_String("Name", block["name"])]
+
+        if block["properties"]:
+            entry.append(
+                nbt.TAG_Compound(
+                    "Properties", [nbt.TAG_String(k, v) for k, v in block["properties"].items()]
+                )
+            )
+
+        entries.append(nbt.TAG_Compound(None, entry))
+
+    return nbt.TAG_List("Palette", entries)
+
+
+def write_region(path: str, chunks: dict) -> None:
+    """Writes an Anvil region file, chunks is like {(chunk x, chunk z): chunk tag}."""
+
+    header = bytearray(8192)
+    sectors = bytearray()
+
+    for (chunk_x, chunk_z), tag in chunks.items():
+        data = zlib.compress(tag.pack())
+        data = struct.pack(">iB", len(data) + 1, 2) + data  # 2 is zlib
+        data += bytes(-len(data) % 4096)
+
+        location = ChunkIO.calc_offset(chunk_x, chunk_z)
+        offset = 2 + len(sectors) // 4096
+        header[location : location + 4] = struct.pack(">i", offset << 8 | len(data) // 4096)
+
+        sectors += data
+
+    with open(path, "wb") as region_file:
+        region_file.write(header + sectors)
+
+
+def test_chunk_from_region(tmp_path):
+    rng = random.Random(0)
+    sections = []
+    expected = {}
+
+    # palettes of 4 bits, 5 bits (the values don't fill the longs) and 9 bits (mapped to global ids)
+    for y, palette_size in enumerate((3, 20, 300)):
+        palette = rng.sample(range(1, len(BLOCK_STATES.data_reversed)), palette_size - 1) + [0]
+        indexes = [rng.randrange(palette_size) for _ in range(4096)]
+        bits = max(4, (palette_size - 1).bit_length())
+        block_light = [rng.randrange(16) for _ in range(4096)]
+        sky_light = [rng.randrange(16) for _ in range(4096)]
+
+        sections.append(
+            nbt.TAG_Compound(
+                None,
+                [
+                    nbt.TAG_Byte("Y", y),
+                    palette_tag(palette),
+                    nbt.TAG_Long_Array("BlockStates", reference_block_states(indexes, bits)),
+                    nbt.TAG_Byte_Array("BlockLight", reference_nibbles(block_light)),
+                    nbt.TAG_Byte_Array("SkyLight", reference_nibbles(sky_light)),
+                ],
+            )
+        )
+
+        expected[y] = (palette, indexes, block_light, sky_light)
+
+    # the section below the world only has light
+    sections.append(
+        nbt.TAG_Compound(
+            None,
+            [nbt.TAG_Byte("Y", -1), nbt.TAG_Byte_Array("SkyLight", reference_nibbles([15] * 4096))],
+        )
+    )
+
+    tag = nbt.TAG_Compound(
+        "",
+        [
+            nbt.TAG_Int("DataVersion", 2586),
+            nbt.TAG_Compound(
+                "Level",
+                [
+                    nbt.TAG_Int("xPos", 33),
+                    nbt.TAG_Int("zPos", -2),
+                    nbt.TAG_List("Sections", sections),
+                ],
+            ),
+        ],
+    )
+
+    os.mkdir(tmp_path / "region")
+    write_region(str(tmp_path / "region" / "r.1.-1.mca"), {(33, -2): tag})
+
+    chunk = ChunkIO.fetch_chunk(str(tmp_path), 33, -2)
+
+    assert (chunk.x, chunk.z) == (33, -2)
+    assert sorted(chunk.sections) == [-1, 0, 1, 2]
+
+    for y, (palette, indexes, block_light, sky_light) in expected.items():
+        section = chunk[y]
+
+        if len(palette) <= 256:
+            assert isinstance(section.palette, IndirectPalette)
+            assert section.palette.get_bits_per_block() == (4 if y == 0 else 5)
+            assert section.block_states.ravel().tolist() == indexes
+
+            decoded = [section.palette.decode(i) for i in range(len(palette))]
+            assert [
+                DirectPalette.encode(s["name"], s.get("properties")) for s in decoded
+            ] == palette
+        else:
+            assert section.palette is DirectPalette
+            assert section.block_states.ravel().tolist() == [palette[i] for i in indexes]
+
+        assert section.block_states.shape == section.block_light.shape == (16, 16, 16)
+        assert section.block_light.ravel().tolist() == block_light
+        assert section.sky_light.ravel().tolist() == sky_light
+
+        # and the section can be sent as is
+        buf = Buffer(Buffer.pack_chunk_section_blocks(section))
+        assert buf.unpack("h") == 4096 - [palette[i] for i in indexes].count(0)
+
+    assert chunk[-1].block_states is None and chunk[-1].block_light is None
+    assert (chunk[-1].sky_light == 15).all()
@@ -0,0 +1,140 @@
+import asyncio
+import types
+import numpy
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pymine.net.packets.play.chunk import PlayChunkData, PlayUpdateLight
+from pymine.types.chunk import Chunk, ChunkSection
+from pymine.types.block_palette import DirectPalette
+from pymine.logic.chunk_frames import ChunkFrames
+from pymine.types.send_queue import PendingFrame
+from pymine.types.buffer import Buffer
+
+
+class StubQueue:
+    """Records the frames reserved and filled in it, in order."""
+
+    pressured = False
+
+    def __init__(self):
+        self.frames = []
+
+    def reserve(self, lane):
+        pending = PendingFrame(lane)
+        self.frames.append(pending)
+        return pending
+
+    def fill(self, pending, frame):
+        pending.frame = frame
+
+
+def stub_server() -> types.SimpleNamespace:
+    server = types.SimpleNamespace(packed=0)
+
+    async def pack_frame(data, comp_thresh, comp_level=-1):
+        server.packed += 1
+        await asyncio.sleep(0)  # like compressing in the thread executor, let others run meanwhile
+        return Buffer.pack_frame(data, comp_thresh, comp_level)
+
+    server.pack_frame = pack_frame
+
+    return server
+
+
+def new_chunk() -> Chunk:
+    chunk = Chunk.new(2, -5, 0)
+    rng = numpy.random.default_rng(0)
+
+    for y in range(-1, 4):
+        chunk[y] = ChunkSection.new(y, DirectPalette)
+        chunk[y].block_states[:] = rng.integers(0, 20, (16, 16, 16))
+        chunk[y].sky_light[:] = rng.integers(0, 16, (16, 16, 16))
+
+    return chunk
+
+
+def uncached_frames(chunk: Chunk, comp_thresh: int) -> tuple:
+    fresh = Chunk.new(chunk.x, chunk.z, 0)
+    fresh.sections = chunk.sections
+
+    return tuple(
+        Buffer.pack_frame(Buffer.pack_varint(p.id) + p.encode(), comp_thresh, p.comp_level)
+        for p in (PlayUpdateLight(fresh), PlayChunkData(fresh, True))
+    )
+
+
+def test_chunk_frames_shared():
+    server = stub_server()
+    chunk_frames = ChunkFrames(server)
+    chunk = new_chunk()
+    conns = [types.SimpleNamespace(comp_thresh=256, send_queue=StubQueue()) for _ in range(20)]
+
+    async def run():
+        await asyncio.gather(*[chunk_frames.send(conn, chunk) for conn in conns])
+
+    asyncio.run(run())
+
+    assert server.packed == 2  # the light and the data, once for all 20 players
+    assert chunk_frames.stats() == {"hits": 38, "misses": 2, "hit_ratio": 0.95}
+
+    for conn in conns:
+        assert [p.frame for p in conn.send_queue.frames] == list(uncached_frames(chunk, 256))
+
+
+def test_chunk_frames_invalidate():
+    server = stub_server()
+    chunk_frames = ChunkFrames(server)
+    chunk = new_chunk()
+
+    asyncio.run(chunk_frames.frames(chunk, -1))
+
+    packed_sections = dict(chunk.packed_sections)
+    packed_light = dict(chunk.packed_light)
+
+    chunk[2].block_states[3, 4, 5] = 1
+    chunk.invalidate(2, light=False)
+
+    assert 2 not in chunk.packed_sections and ("data", -1) not in chunk.frames
+    assert chunk.packed_light == packed_light and ("light", -1) in chunk.frames
+
+    light, data = asyncio.run(chunk_frames.frames(chunk, -1))
+
+    # only the changed section was packed again
+    for y, packed in chunk.packed_sections.items():
+        assert (packed is packed_sections[y]) == (y != 2)
+
+    assert (light, data) == uncached_frames(chunk, -1)
+    assert chunk_frames.stats()["misses"] == 3
+
+    chunk[0].sky_light[:] = 0
+    chunk.invalidate(0, blocks=False)
+
+    assert chunk.packed_light.get(0) is None and ("light", -1) not in chunk.frames
+    assert asyncio.run(chunk_frames.frames(chunk, -1)) == uncached_frames(chunk, -1)
+    assert chunk.packed_light[0] == (b"", b"")  # all 0, so in the empty masks
+
+
+def test_chunk_frames_invalidate_while_packing():
+    server = stub_server()
+    chunk_frames = ChunkFrames(server)
+    chunk = new_chunk()
+
+    async def run():
+        first = asyncio.ensure_future(chunk_frames.frames(chunk, -1))
+        waiting = asyncio.ensure_future(chunk_frames.frames(chunk, -1))
+        await asyncio.sleep(0)  # the light frame is being packed now, the second one waits for it
+
+        chunk[0].sky_light[:] = 0
+        chunk.invalidate(0, blocks=False)
+
+        return await first, await waiting
+
+    first, waiting = asyncio.run(run())
+
+    # the outdated light frame was packed again, for everyone who was waiting for it too
+    assert first == waiting == uncached_frames(chunk, -1)
+    assert chunk.frames[("light", -1)] == first[0]
+    assert server.packed == 3
@@ -0,0 +1,116 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import types
+import numpy
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pymine.types.stream import EncryptedStream, Stream
+from pymine.util.encryption import gen_aes_cipher
+from pymine.types.connection import Connection
+from pymine.types.send_queue import SendQueue
+from pymine.net.packets.play.chunk import PlayChunkData
+from pymine.net.packets.play.block import PlayBlockChange
+from pymine.types.block_palette import DirectPalette
+from pymine.types.chunk import Chunk, ChunkSection
+from pymine.types.buffer import Buffer
+from pymine.server import Server
+
+
+async def connected_conn():
+    """Returns a server side Connection and the client side StreamWriter, over loopback."""
+
+    accepted = asyncio.get_event_loop().create_future()
+
+    server = await asyncio.start_server(
+        lambda r, w: accepted.set_result(Connection(Stream(r, w))), host="127.0.0.1", port=0
+    )
+
+    _, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+
+    return server, await accepted, writer
+
+
+def test_connection():
+    async def run():
+        server, conn, writer = await connected_conn()
+
+        assert conn.remote == conn.stream.remote
+        assert conn.state == 0 and conn.comp_thresh == -1 and conn.inflater is None
+        assert conn.player is None
+
+        conn.enable_compression(256)
+        assert conn.comp_thresh == 256 and conn.inflater.comp_thresh == 256
+
+        conn.username, conn.verify_token = "Iapetus11", b"1234"
+        conn.login_done()
+        assert conn.username is None and conn.verify_token is None
+
+        writer.close()
+        server.close()
+
+    asyncio.run(run())
+
+
+def test_connection_encryption():
+    async def run():
+        server, conn, writer = await connected_conn()
+        reader = writer._reader  # client side reader
+
+        key = os.urandom(16)
+        decryptor = gen_aes_cipher(key).decryptor()
+
+        conn.send_queue = SendQueue(conn.stream, 0.05, 1024, 256, 4096)
+        conn.send_queue.push(b"plain")
+
+        conn.enable_encryption(gen_aes_cipher(key))
+
+        assert isinstance(conn.stream, EncryptedStream)
+        assert conn.send_queue.stream is conn.stream
+
+        # queued before encryption was enabled, so it's sent as is
+        assert await reader.readexactly(5) == b"plain"
+
+        conn.send_queue.push(b"secret")
+        assert decryptor.update(await reader.readexactly(6)) == b"secret"
+
+        writer.close()
+        server.close()
+
+    asyncio.run(run())
+
+
+def test_send_packet_order():
+    async def run():
+        server, conn, writer = await connected_conn()
+        reader = writer._reader
+
+        pymine = Server.__new__(Server)
+        pymine.console = types.SimpleNamespace(debug_=False)
+        pymine.conf = {"comp_offload_size": 1024}
+        pymine.thread_executor = ThreadPoolExecutor(1)
+
+        conn.comp_thresh = 256
+        conn.send_queue = SendQueue(conn.stream, 0.01, 65536, 16384, 1048576)
+
+        chunk = Chunk.new(0, 0, 0)
+        chunk[0] = ChunkSection.new(0, DirectPalette)
+        chunk[0].block_states[:] = numpy.random.default_rng(0).integers(0, 20, (16, 16, 16))
+
+        # the chunk is compressed in the thread executor, the block change can be sent meanwhile
+        packets = (PlayChunkData(chunk, True), PlayBlockChange(1, 2, 3, 1))
+        await asyncio.gather(*[pymine.send_packet(conn, packet) for packet in packets])
+
+        frames = [
+            Buffer.pack_frame(Buffer.pack_varint(p.id) + p.encode(), 256, p.comp_level)
+            for p in packets
+        ]
+        assert await reader.readexactly(sum(map(len, frames))) == b"".join(frames)
+
+        pymine.thread_executor.shutdown()
+        writer.close()
+        server.close()
+
+    asyncio.run(run())
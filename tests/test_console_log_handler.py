@@ -0,0 +1,72 @@
+import logging
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pymine.api.console_log_handler import LogQueueHandler, LogQueueListener
+
+
+def record(name: str, msg: str, level: int = logging.INFO, args: tuple = ()) -> logging.LogRecord:
+    return logging.makeLogRecord({"name": name, "msg": msg, "levelno": level, "args": args})
+
+
+def queued(handler: LogQueueHandler) -> list:
+    records = []
+
+    while not handler.queue.empty():
+        records.append(handler.queue.get_nowait().getMessage())
+
+    return records
+
+
+def test_drop_when_full():
+    handler = LogQueueHandler(max_size=3)
+
+    for i in range(5):
+        handler.handle(record("a", str(i)))
+
+    assert handler.dropped == 2
+    assert queued(handler) == ["0", "1", "2"]
+
+    handler.handle(record("a", "3"))
+    assert handler.dropped == 0
+    assert queued(handler) == ["2 log messages were dropped (log queue was full).", "3"]
+
+
+def test_rate_limit():
+    handler = LogQueueHandler(max_size=100, rate_limit=2)
+
+    for i in range(4):
+        handler.handle(record("a", f"a{i}"))
+
+    handler.handle(record("b", "b0"))  # rate limited per logger
+
+    assert handler.rate_limited == {"a": 2}
+    assert queued(handler) == ["a0", "a1", "b0"]
+
+    handler.handle(record("a", "error", logging.ERROR))  # errors are never rate limited
+    assert handler.rate_limited == {}
+    assert queued(handler) == ["2 log messages were dropped (rate limited).", "error"]
+
+    handler._buckets["a"][0] = 1  # refilled
+
+    handler.handle(record("a", "a4"))
+    assert queued(handler) == ["a4"]
+
+
+def test_listener(tmp_path):
+    handler = LogQueueHandler()
+    listener = LogQueueListener(handler)
+
+    file_handler = logging.FileHandler(tmp_path / "log.txt")
+    file_handler.setFormatter(logging.Formatter("{name}: {message}", style="{"))
+    listener.add_handler(file_handler)
+
+    listener.start()
+    handler.handle(record("a", "hello"))
+    handler.handle(record("b", "hello %s", args=("world",)))  # args are merged before queueing
+    listener.stop()
+    file_handler.close()
+
+    assert (tmp_path / "log.txt").read_text() == "a: hello\nb: hello world\n"
@@ -0,0 +1,262 @@
+import asyncio
+import socket
+import types
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cryptography.hazmat.primitives.asymmetric.padding import PKCS1v15
+from cryptography.hazmat.primitives.serialization import load_der_public_key
+from aiohttp import web
+
+from pymine.net.packets.handshaking.handshake import HandshakeHandshake
+from pymine.net.packets.status.status import StatusStatusPingPong, StatusStatusResponse
+from pymine.logic.front_end import FrontEndHub, FrontEndWorker
+import pymine.logic.front_end as front_end
+from pymine.types.stream import EncryptedStream, Stream
+from pymine.util.encryption import gen_aes_cipher
+from pymine.types.buffer import Buffer
+
+
+async def stub_session_server() -> tuple:
+    async def has_joined(request):
+        return web.json_response(
+            {"id": "1" * 32, "name": request.query["username"], "properties": []}
+        )
+
+    app = web.Application()
+    app.router.add_get("/session/minecraft/hasJoined", has_joined)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+
+def conf(online_mode: bool, session_server: str = "") -> dict:
+    return {
+        "debug": False,
+        "server_ip": "127.0.0.1",
+        "server_port": 0,
+        "online_mode": online_mode,
+        "comp_thresh": 256,
+        "session_server": session_server,
+        "session_max_concurrent": 4,
+        "session_timeout": 5,
+        "session_retries": 0,
+        "session_cache_ttl": 30,
+        "connection_timeout": 30,
+        "keep_alive_interval": 15,
+        "latency_update_interval": 5,
+    }
+
+
+STATUS = {
+    "version": {"name": "1.16.5", "protocol": 754},
+    "players": {"max": 20, "online": 3, "sample": []},
+    "description": {"text": "A §lMinecraft§r Server"},
+}
+
+
+def stub_server(conf: dict, handoffs: asyncio.Queue = None) -> types.SimpleNamespace:
+    async def adopt_connection(handoff, fd):
+        await handoffs.put((handoff, fd))
+
+    frame = Buffer.pack_packet(StatusStatusResponse(STATUS))
+    errors = []
+
+    return types.SimpleNamespace(
+        conf=conf,
+        errors=errors,
+        console=types.SimpleNamespace(error=errors.append),
+        adopt_connection=adopt_connection,
+        status_cache=types.SimpleNamespace(frame=lambda: frame),
+    )
+
+
+async def start_front_end(conf: dict) -> tuple:
+    handoffs = asyncio.Queue()
+
+    hub = FrontEndHub(stub_server(conf, handoffs), 0)  # the worker runs in this process instead
+    await hub.start()
+
+    hub_sock, worker_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    hub.add_worker(hub_sock)
+
+    worker = FrontEndWorker(0, conf, worker_sock)
+    task = asyncio.create_task(worker.start())
+
+    while worker.server is None or worker._status is None:
+        await asyncio.sleep(0.01)
+
+    return hub, worker, task, handoffs, worker.server.sockets[0].getsockname()[1]
+
+
+async def stop_front_end(hub, task) -> None:
+    hub.stop()
+    await task
+
+
+async def connect(port: int, next_state: int) -> Stream:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    stream = Stream(reader, writer)
+    stream.write(Buffer.pack_packet(HandshakeHandshake(754, "localhost", port, next_state)))
+
+    return stream
+
+
+def test_status():
+    async def run():
+        hub, worker, task, _, port = await start_front_end(conf(False))
+
+        stream = await connect(port, 1)
+        stream.write(Buffer.pack_frame(b"\x00"))
+        # from the main process
+        status = Buffer.pack_frame(await stream.read_frame())
+        assert status == Buffer.pack_packet(StatusStatusResponse(STATUS))
+
+        stream.write(Buffer.pack_packet(StatusStatusPingPong(1234)))
+        assert (
+            Buffer(await stream.read_frame())
+            .unpack_packet(1, {1: {0x01: StatusStatusPingPong}})
+            .payload
+            == 1234
+        )
+
+        stream.close()
+        await stop_front_end(hub, task)
+
+        assert worker.pings == 1
+
+    asyncio.run(run())
+
+
+def test_login_handoff():
+    async def run():
+        runner, session_server = await stub_session_server()
+        hub, worker, task, handoffs, port = await start_front_end(conf(True, session_server))
+
+        client = await connect(port, 2)
+        client.write(Buffer.pack_frame(b"\x00" + Buffer.pack_string("Iapetus11")))  # LoginStart
+
+        request = Buffer(await client.read_frame())
+        assert request.unpack_varint() == 0x01  # LoginEncryptionRequest
+        request.unpack_string()
+        public_key = load_der_public_key(request.read(request.unpack_varint()))
+        verify_token = request.read(request.unpack_varint())
+
+        shared_key = os.urandom(16)
+        encrypted = [public_key.encrypt(data, PKCS1v15()) for data in (shared_key, verify_token)]
+        client.write(
+            Buffer.pack_frame(b"\x01" + b"".join(Buffer.pack_varint(len(e)) + e for e in encrypted))
+        )
+
+        client = EncryptedStream(client, gen_aes_cipher(shared_key))
+
+        assert await client.read_frame() == b"\x03" + Buffer.pack_varint(256)  # LoginSetCompression
+        success = Buffer(await client.read_frame())
+        assert success.unpack_varint() == 0 and success.unpack_varint() == 0x02  # LoginSuccess
+        assert success.unpack_uuid().hex == "1" * 32 and success.unpack_string() == "Iapetus11"
+
+        client.write(
+            Buffer.pack_frame(b"\x00\x0bhello")
+        )  # sent right away, may be read by the worker
+
+        handoff, fd = await handoffs.get()
+        assert handoff["username"] == "Iapetus11" and handoff["comp_thresh"] == 256
+
+        # continue the connection like Server.adopt_connection()
+        reader, writer = await asyncio.open_connection(sock=socket.socket(fileno=fd))
+        key = bytes.fromhex(handoff["shared_key"])
+        stream = EncryptedStream(
+            Stream(reader, writer),
+            gen_aes_cipher(key, bytes.fromhex(handoff["encrypt_iv"])),
+            gen_aes_cipher(key, bytes.fromhex(handoff["decrypt_iv"])),
+        )
+        stream.read_buf += bytes.fromhex(handoff["read_buf"])
+
+        assert await stream.read_frame() == b"\x00\x0bhello"
+
+        client.write(Buffer.pack_frame(b"\x00\x0bworld"))
+        assert await stream.read_frame() == b"\x00\x0bworld"
+
+        stream.write(Buffer.pack_frame(b"\x00\x26play"))
+        assert await client.read_frame() == b"\x00\x26play"
+
+        stream.close()
+        client.close()
+        await stop_front_end(hub, task)
+        await runner.cleanup()
+
+        assert worker.logins == 1 and hub.handoffs == 1
+
+    asyncio.run(run())
+
+
+def test_legacy_status():
+    async def run():
+        hub, worker, task, _, port = await start_front_end(conf(False))
+
+        # sent by 1.6 clients, 1.4 and 1.5 ones only send the first two bytes
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"\xFE\x01\xFA" + Buffer.pack("H", 11) + "MC|PingHost".encode("utf-16-be"))
+
+        reply = await reader.read()
+        assert reply[0] == 0xFF and Buffer.pack("H", len(reply[3:]) // 2) == reply[1:3]
+        assert reply[3:].decode("utf-16-be").split("\x00") == [
+            "§1",
+            "754",
+            "1.16.5",
+            "A Minecraft Server",
+            "3",
+            "20",
+        ]
+
+        # sent by clients before 1.4
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"\xFE")
+        assert (await reader.read())[3:].decode("utf-16-be") == "A Minecraft Server§3§20"
+
+        await stop_front_end(hub, task)
+
+        assert worker.pings == 2
+
+    asyncio.run(run())
+
+
+def test_hub_server_ip():
+    hub = FrontEndHub(stub_server(dict(conf(False), server_ip=None)), 1)
+    assert hub.conf["server_ip"] == socket.gethostbyname(socket.gethostname())
+
+    hub = FrontEndHub(stub_server(conf(False)), 1)
+    assert hub.conf["server_ip"] == "127.0.0.1"
+
+
+def test_worker_restart(monkeypatch):
+    async def run():
+        server = stub_server(conf(False))
+
+        hub = FrontEndHub(server, 1)
+        await hub.start()
+
+        process = hub.processes[0]
+        process.kill()
+
+        while hub.restarts < 1:
+            await asyncio.sleep(0.05)
+
+        assert hub.processes[0] is not process and hub.processes[0].is_alive()
+        assert len(hub.workers) == 1 and "exited" in server.errors[0]
+
+        # it exited right after being started, so now it's given up on
+        monkeypatch.setattr(front_end, "MAX_FAILED_STARTS", 0)
+        hub.processes[0].kill()
+
+        await asyncio.wait_for(hub.serve_forever(), 10)
+
+        assert "keeps exiting" in server.errors[1] and not hub.processes
+
+    asyncio.run(run())
@@ -0,0 +1,40 @@
+import types
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pymine.data.default_nbt.dimension_codec import new_dim_codec_nbt, get_dimension_data
+from pymine.net.packets.play.tags import PlayTags
+from pymine.logic.join_frames import JoinFrames
+from pymine.types.buffer import Buffer
+from pymine.data.tags import TAGS
+
+
+def test_join_frames(monkeypatch):
+    server = types.SimpleNamespace(comp_thresh=256, meta=types.SimpleNamespace(pymine="PyMine"))
+    join_frames = JoinFrames(server)
+
+    assert join_frames.dim_codec == Buffer.pack_nbt(new_dim_codec_nbt())
+    assert join_frames.dimension("minecraft:overworld") == Buffer.pack_nbt(
+        get_dimension_data("minecraft:overworld")
+    )
+
+    for comp_thresh in (256, -1):
+        frames = join_frames.frames(comp_thresh)
+
+        assert frames["tags"] == Buffer.pack_packet(PlayTags(TAGS), comp_thresh)
+        assert join_frames.frames(comp_thresh) is frames  # only packed once
+
+    server.meta.pymine = "Something else"  # picked up without having to rebuild
+    assert b"Something else" in join_frames.frames(256)["brand"]
+
+    tags = join_frames.frames(256)["tags"]
+    new_tags = TAGS.set("items", TAGS["items"].set("test_tag", ("minecraft:stone",)))
+
+    monkeypatch.setattr("pymine.data.tags.TAGS", new_tags)
+    assert join_frames.frames(256)["tags"] is tags  # not rebuilt until invalidated
+
+    join_frames.invalidate()
+    assert join_frames.frames(256)["tags"] == Buffer.pack_packet(PlayTags(new_tags), 256)
+    assert join_frames.frames(256)["tags"] != tags
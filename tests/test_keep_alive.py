@@ -0,0 +1,157 @@
+import asyncio
+import types
+import uuid
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pymine.net.packets.play.keep_alive import PlayKeepAliveClientBound
+from pymine.types.timer_wheel import TimerWheel
+from pymine.types.send_queue import SendQueue
+from pymine.types.connection import Connection
+from pymine.logic.keep_alive import KeepAlive
+from pymine.types.stream import Stream
+from pymine.types.buffer import Buffer
+
+
+async def connected_conn():
+    """Returns a server side Connection and the client side StreamReader, over loopback."""
+
+    accepted = asyncio.get_event_loop().create_future()
+
+    server = await asyncio.start_server(
+        lambda r, w: accepted.set_result(Connection(Stream(r, w))), host="127.0.0.1", port=0
+    )
+
+    reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+
+    conn = await accepted
+    conn.send_queue = SendQueue(conn.stream, 0.01, 65536, 16384, 1048576)
+
+    return server, conn, reader, writer
+
+
+def stub_server(timeout: float, interval: float) -> types.SimpleNamespace:
+    server = types.SimpleNamespace(
+        conf={
+            "connection_timeout": timeout,
+            "keep_alive_interval": interval,
+            "latency_update_interval": interval,
+        },
+        broadcasts=[],
+    )
+
+    async def broadcast_packet(packet):
+        server.broadcasts.append(packet)
+
+    server.broadcast_packet = broadcast_packet
+
+    return server
+
+
+def test_timer_wheel():
+    calls = []
+    delays = {"a": [2.5, None], "b": [None], "c": [100, None]}
+
+    def expire(obj):
+        calls.append((obj, now))
+        return delays[obj].pop(0)
+
+    wheel = TimerWheel(expire, 1, 8)
+
+    now = 0
+    wheel.advance(now)
+
+    wheel.schedule("a", 1)
+    wheel.schedule("b", 3)
+    wheel.schedule("c", 0.1)  # rounded up to the next tick
+    assert wheel.tracked == 3
+
+    for now in range(1, 14):
+        wheel.advance(now)
+
+    # a is rescheduled 2.5 -> 3 ticks later, c's delay is longer than the wheel so it's called
+    # again after a turn
+    assert calls == [("a", 1), ("c", 1), ("b", 3), ("a", 4), ("c", 8)]
+    assert wheel.tracked == 0
+
+    calls.clear()
+    wheel.schedule("b", 1)
+    delays["b"].append(None)
+    now += 3.5
+    wheel.advance(now)  # catches up on every tick which was missed
+
+    assert calls == [("b", now)] and wheel.tracked == 0
+
+
+def test_idle_timeout():
+    async def run():
+        server, conn, reader, writer = await connected_conn()
+
+        keep_alive = KeepAlive(stub_server(0.3, 10))
+        keep_alive.wheel.tick = 0.05
+        keep_alive.track(conn)
+        keep_alive.start()
+
+        assert await reader.read() == b""  # aborted by the server, nothing was sent at all
+        assert conn.stream.timed_out and keep_alive.timeouts == 1
+        assert keep_alive.wheel.tracked == 0 and keep_alive.sent == 0
+
+        keep_alive.stop()
+        writer.close()
+        server.close()
+
+    asyncio.run(run())
+
+
+def test_keep_alive():
+    async def run():
+        server, conn, reader, writer = await connected_conn()
+
+        conn.state = 3
+        conn.player = types.SimpleNamespace(uuid=uuid.uuid4())
+
+        stub = stub_server(0.5, 0.2)
+        keep_alive = KeepAlive(stub)
+        keep_alive.wheel.tick = 0.05
+        keep_alive.track(conn)
+        keep_alive.start()
+
+        # the client answers the first keep alive after 100ms
+        buf = Buffer(await asyncio.wait_for(reader.read(64), 1))
+        buf.unpack_varint()
+        assert buf.unpack_varint() == PlayKeepAliveClientBound.id
+        keep_alive_id = buf.unpack("q")
+
+        await asyncio.sleep(0.1)
+        conn.stream.last_read = asyncio.get_event_loop().time()
+
+        keep_alive.received(conn, keep_alive_id + 1)  # wrong id, ignored
+        assert conn.keep_alive_id == keep_alive_id and conn.latency == 0
+
+        keep_alive.received(conn, keep_alive_id)
+        assert conn.keep_alive_id is None and 100 <= conn.latency < 200
+
+        # the measured latency is sent to the tab list in one batch
+        await asyncio.sleep(0.25)
+        assert len(stub.broadcasts) == 1
+        assert stub.broadcasts[0].action == 2
+        assert stub.broadcasts[0].players == [{"uuid": conn.player.uuid, "ping": conn.latency}]
+
+        # the next keep alive isn't answered, so the connection times out though data is received
+        for _ in range(20):
+            conn.stream.last_read = asyncio.get_event_loop().time()
+            await asyncio.sleep(0.05)
+
+            if conn.stream.transport.is_closing():
+                break
+
+        assert conn.stream.timed_out and keep_alive.timeouts == 1
+        assert keep_alive.sent == 2 and keep_alive.wheel.tracked == 0
+
+        keep_alive.stop()
+        writer.close()
+        server.close()
+
+    asyncio.run(run())
@@ -0,0 +1,51 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy
+from pymine.util.long_array import long_array_len, pack_long_array, unpack_long_array
+
+
+def reference_pack(values: list, bits: int) -> list:
+    """Packs values one at a time with Python ints, how the 1.16 format is usually described."""
+
+    per_long = 64 // bits
+    longs = [0] * long_array_len(len(values), bits)
+
+    for i, value in enumerate(values):
+        longs[i // per_long] |= value << (i % per_long * bits)
+
+    return [
+        l - (1 << 64) if l >= 1 << 63 else l for l in longs
+    ]  # as signed longs, like nbt has them
+
+
+def test_long_array():
+    rng = numpy.random.default_rng(0)
+
+    for bits in (1, 4, 5, 6, 9, 14, 15):
+        states = rng.integers(0, 1 << bits, (16, 16, 16), numpy.int32)
+        longs = pack_long_array(states, bits)
+
+        assert len(longs) == long_array_len(4096, bits)
+        assert longs.tolist() == reference_pack(states.ravel().tolist(), bits)
+        assert longs.tobytes() == b"".join(
+            l.to_bytes(8, "big", signed=True) for l in longs.tolist()
+        )
+
+        assert (unpack_long_array(longs, bits).reshape(16, 16, 16) == states).all()
+        assert (unpack_long_array(longs.tolist(), bits).reshape(16, 16, 16) == states).all()
+
+
+def test_long_array_padding():
+    # 9 bits is 7 values per long, so the last long of a heightmap (256 values) only holds 4
+    heightmap = numpy.full(256, 511, numpy.int32)
+    longs = pack_long_array(heightmap, 9)
+
+    assert len(longs) == 37
+    assert longs[-1] == (1 << 36) - 1  # the unused top bits are 0
+    assert (unpack_long_array(longs, 9, 256) == heightmap).all()
+
+    # values which don't fit are masked instead of spilling into the next value
+    assert pack_long_array(numpy.array([0b10011, 0b01]), 4).tolist() == [0b0001_0011]
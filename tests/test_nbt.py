@@ -42,3 +42,23 @@ def test_values_nantest():  # tests that the values for loading the nantest are
         assert len(tag["Rotation"]) == 2
         assert tag["Rotation"][0].data == 164.3999481201172
         assert tag["Rotation"][1].data == -63.150203704833984
+
+
+def test_arrays():
+    tag = nbt.TAG_Compound(
+        "",
+        [
+            nbt.TAG_Int_Array("ints", [0, 1, -1, (1 << 31) - 1, -(1 << 31)]),
+            nbt.TAG_Long_Array("longs", [0, 1, -1, (1 << 63) - 1, -(1 << 63)]),
+            nbt.TAG_Int_Array("empty", []),
+            nbt.TAG_Byte_Array("bytes", b"\x00\x01\xff"),
+        ],
+    )
+
+    unpacked = nbt.unpack(Buffer(tag.pack()))
+
+    assert unpacked["ints"] == tag["ints"]
+    assert unpacked["longs"] == tag["longs"]
+    assert unpacked["empty"] == []
+    assert unpacked["bytes"] == tag["bytes"]
+    assert unpacked.pack() == tag.pack()
@@ -0,0 +1,80 @@
+import asyncio
+import types
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pymine.logic.query import QueryServer, QueryBuffer
+
+
+class Client(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.responses = asyncio.Queue()
+
+    def datagram_received(self, data, addr):
+        self.responses.put_nowait(QueryBuffer(data))
+
+
+def test_query():
+    async def run():
+        console = types.SimpleNamespace(info=print, debug=print, error=print)
+        server = types.SimpleNamespace(
+            console=console,
+            addr="127.0.0.1",
+            port=25565,
+            conf={
+                "query_port": 0,
+                "motd": "A Minecraft Server",
+                "level_name": "world",
+                "max_players": 20,
+            },
+            meta=types.SimpleNamespace(version="1.16.5"),
+            playerio=types.SimpleNamespace(cache={1: types.SimpleNamespace(username="Iapetus11")}),
+        )
+
+        query = QueryServer(server)
+        await query.start()
+
+        transport, client = await asyncio.get_event_loop().create_datagram_endpoint(
+            Client, remote_addr=query.transport.get_extra_info("sockname")
+        )
+
+        async def request(data):
+            transport.sendto(QueryBuffer.pack_magic() + data)
+            return await asyncio.wait_for(client.responses.get(), 1)
+
+        buf = await request(QueryBuffer.pack_byte(9) + QueryBuffer.pack_int32(1))
+        assert buf.unpack_byte() == 9 and buf.unpack_int32() == 1
+        token = int(buf.unpack_string())
+
+        stat = QueryBuffer.pack_byte(0) + QueryBuffer.pack_int32(2) + QueryBuffer.pack_int32(token)
+
+        buf = await request(stat)  # basic stat
+        assert buf.unpack_byte() == 0 and buf.unpack_int32() == 2
+        assert [buf.unpack_string() for _ in range(5)] == [
+            "A Minecraft Server",
+            "SMP",
+            "world",
+            "1",
+            "20",
+        ]
+        assert buf.unpack_short() == 25565 and buf.unpack_string() == "127.0.0.1"
+
+        buf = await request(stat + b"\x00" * 4)  # full stat
+        assert b"numplayers\x001\x00" in buf.buf
+        assert buf.buf.endswith(b"\x01player_\x00\x00Iapetus11\x00\x00")
+
+        transport.sendto(QueryBuffer.pack_magic() + stat[:5] + QueryBuffer.pack_int32(token + 1))
+        transport.sendto(b"\xFE")  # too short, ignored
+
+        server.conf["motd"] = "Something else"  # payloads are rebuilt when the motd changes
+        buf = await request(stat)
+        assert client.responses.empty()  # the invalid requests weren't answered
+        buf.read(5)
+        assert buf.unpack_string() == "Something else"
+
+        transport.close()
+        query.stop()
+
+    asyncio.run(run())
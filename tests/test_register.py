@@ -0,0 +1,30 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+from pymine.api.register import Register
+
+
+def test_dispatch_table():
+    register = Register()
+
+    assert register.get_packet_handlers(3, 0x12) is None
+
+    @register.on_packet("play", 0x12)
+    async def first(conn, packet):
+        pass
+
+    @register.on_packet("play", 0x12)
+    async def second(conn, packet):
+        pass
+
+    assert register.get_packet_handlers(3, 0x12) == (first, second)
+    assert register.get_packet_handlers(2, 0x12) is None
+
+    register.add_packet_handler(3, 0x12, "plugin.Plugin", first)  # added by a plugin
+    assert register.get_packet_handlers(3, 0x12) == (first, second, first)
+
+    with pytest.raises(ValueError):
+        register.add_packet_handler(3, 0x100, "plugin.Plugin", first)
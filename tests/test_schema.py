@@ -0,0 +1,97 @@
+import uuid
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+from pymine.types.packet import Packet
+from pymine.types.buffer import Buffer
+
+
+class SchemaPacket(Packet):
+    id = 0x7F
+    to = 2
+    schema = (
+        ("entity_id", "varint"),
+        ("uuid", "uuid"),
+        (("x", "y", "z"), "position"),
+        ("dx", "h"),
+        ("yaw", "f"),
+        ("on_ground", "?"),
+        ("name", "string"),
+        ("age", "q"),
+    )
+
+    def __init__(self, entity_id, uuid_, x, y, z, dx, yaw, on_ground, name, age) -> None:
+        super().__init__()
+
+        self.entity_id = entity_id
+        self.uuid = uuid_
+        self.x, self.y, self.z = x, y, z
+        self.dx = dx
+        self.yaw = yaw
+        self.on_ground = on_ground
+        self.name = name
+        self.age = age
+
+
+def test_encode_decode():
+    uuid_ = uuid.uuid4()
+    packet = SchemaPacket(300, uuid_, 1, -2, 3, -5, 1.5, True, "hi", 1 << 40)
+
+    data = packet.encode()
+
+    assert data == (
+        Buffer.pack_varint(300)
+        + Buffer.pack_uuid(uuid_)
+        + Buffer.pack_position(1, -2, 3)
+        + Buffer.pack("hf?", -5, 1.5, True)
+        + Buffer.pack_string("hi")
+        + Buffer.pack("q", 1 << 40)
+    )
+
+    buf = Buffer(data + b"\x00")
+    decoded = SchemaPacket.decode(buf)
+
+    assert vars(decoded) == vars(packet)
+    assert buf.pos == len(data)
+
+
+def test_handwritten_methods_are_kept():
+    class HandwrittenPacket(Packet):
+        schema = (("a", "i"),)
+
+        def __init__(self, a: int) -> None:
+            self.a = a
+
+        def encode(self) -> bytes:
+            return b"handwritten"
+
+    assert HandwrittenPacket(1).encode() == b"handwritten"
+    assert HandwrittenPacket.decode(Buffer(Buffer.pack("i", 7))).a == 7
+
+
+def test_invalid_schema():
+    with pytest.raises(ValueError):
+
+        class InvalidPacket(Packet):
+            schema = (("a", "not a type"),)
+
+
+def test_migrated_packets():
+    from pymine.net.packets.play.entity import PlayEntityPositionAndRotation
+    from pymine.net.packets.play.player import PlayPlayerPositionAndRotationServerBound
+
+    packet = PlayEntityPositionAndRotation(12, 1, -2, 3, 90.0, 45.0, False)
+
+    assert packet.encode() == Buffer.pack_varint(12) + Buffer.pack(
+        "hhhff?", 1, -2, 3, 90, 45, False
+    )
+
+    packet = PlayPlayerPositionAndRotationServerBound.decode(
+        Buffer(Buffer.pack("dddff?", 1.5, 64, -2.5, 90, 45, True))
+    )
+
+    assert (packet.x, packet.feet_y, packet.z) == (1.5, 64, -2.5)
+    assert (packet.yaw, packet.pitch, packet.on_ground) == (90, 45, True)
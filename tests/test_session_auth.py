@@ -0,0 +1,95 @@
+import concurrent.futures
+import asyncio
+import types
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cryptography.hazmat.primitives.asymmetric.padding import PKCS1v15
+from aiohttp import web
+import aiohttp
+
+from pymine.logic.session_auth import SessionAuth
+from pymine.util.encryption import gen_rsa_keys
+
+
+async def stub_session_server(statuses: list) -> tuple:
+    """Starts a local session server which responds with the given statuses in order."""
+
+    requests = []
+
+    async def has_joined(request):
+        requests.append(dict(request.query))
+        status = statuses.pop(0) if statuses else 200
+
+        if status == 200:
+            return web.json_response(
+                {"id": "0" * 32, "name": request.query["username"], "properties": []}
+            )
+
+        return web.Response(status=status)
+
+    app = web.Application()
+    app.router.add_get("/session/minecraft/hasJoined", has_joined)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+
+    port = site._server.sockets[0].getsockname()[1]
+
+    return runner, f"http://127.0.0.1:{port}/", requests
+
+
+def fake_server(base_url: str) -> types.SimpleNamespace:
+    return types.SimpleNamespace(
+        conf={
+            "session_server": base_url,
+            "session_max_concurrent": 2,
+            "session_timeout": 5,
+            "session_retries": 2,
+            "session_cache_ttl": 30,
+        },
+        console=types.SimpleNamespace(debug=lambda *a: None, warn=lambda *a: None),
+        secrets=types.SimpleNamespace(rsa_private=gen_rsa_keys()[0]),
+        thread_executor=concurrent.futures.ThreadPoolExecutor(1),
+        aiohttp=None,
+    )
+
+
+def test_has_joined():
+    async def run():
+        runner, base_url, requests = await stub_session_server([503, 204])
+        server = fake_server(base_url)
+        server.aiohttp = aiohttp.ClientSession()
+        auth = SessionAuth(server)
+
+        assert await auth.has_joined("Iapetus11", "abc") is None  # 503 is retried, 204 isn't
+        assert len(requests) == 2
+
+        profile = await auth.has_joined("Iapetus11", "def")
+        assert profile["name"] == "Iapetus11"
+        assert requests[-1] == {"username": "Iapetus11", "serverId": "def"}
+
+        assert await auth.has_joined("Iapetus11", "def") == profile  # cached
+        assert len(requests) == 3 and auth.requests == 3
+
+        await server.aiohttp.close()
+        await runner.cleanup()
+
+    asyncio.run(run())
+
+
+def test_decrypt():
+    async def run():
+        server = fake_server("http://127.0.0.1/")
+        auth = SessionAuth(server)
+        public_key = server.secrets.rsa_private.public_key()
+
+        assert await auth.decrypt(
+            public_key.encrypt(b"token", PKCS1v15()), public_key.encrypt(b"secret", PKCS1v15())
+        ) == (b"token", b"secret")
+
+    asyncio.run(run())
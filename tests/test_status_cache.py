@@ -0,0 +1,57 @@
+import types
+import json
+import uuid
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pymine.logic.status_cache import StatusCache, SAMPLE_SIZE
+from pymine.types.buffer import Buffer
+
+
+def status(frame: bytes) -> dict:
+    buf = Buffer(frame)
+    buf.unpack_varint()  # frame length
+    assert buf.unpack_varint() == 0x00
+
+    return json.loads(buf.unpack_string())
+
+
+def test_status_cache():
+    server = types.SimpleNamespace(
+        meta=types.SimpleNamespace(version="1.16.5", protocol=754),
+        conf={"max_players": 20, "motd": "A Minecraft Server"},
+        favicon=None,
+        playerio=types.SimpleNamespace(cache={}),
+    )
+    cache = StatusCache(server)
+
+    frame = cache.frame()
+    assert cache.frame() is frame and cache.builds == 1
+    assert status(frame)["players"] == {"max": 20, "online": 0, "sample": []}
+
+    def join(i):
+        uuid_ = uuid.uuid4()
+        server.playerio.cache[int(uuid_)] = types.SimpleNamespace(username=f"p{i}", uuid=uuid_)
+
+    join(0)
+    assert cache.frame() is frame  # stale until invalidated
+    cache.invalidate()
+    assert status(cache.frame())["players"]["sample"][0]["name"] == "p0"
+
+    for i in range(1, 30):
+        join(i)
+
+    cache.invalidate()
+
+    players = status(cache.frame())["players"]
+    assert players["online"] == 30 and len(players["sample"]) == SAMPLE_SIZE
+    assert cache.builds == 3
+
+    server.conf["motd"] = "Something else"
+    assert status(cache.frame())["description"] == {"text": "Something else"}
+
+    server.favicon = "data:image/png;base64,abc"
+    assert status(cache.frame())["favicon"] == server.favicon
+    assert cache.builds == 5
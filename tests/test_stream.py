@@ -0,0 +1,291 @@
+import asyncio
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+from pymine.types.stream import EncryptedStream, Stream
+from pymine.util.encryption import gen_aes_cipher
+from pymine.api.errors import InvalidPacketData
+from pymine.types.send_queue import SendQueue, EgressLimiter, LANE_BULK, LANE_CHAT
+from pymine.net.packets.play.keep_alive import PlayKeepAliveClientBound
+from pymine.net.packets.play.chunk import PlayChunkData
+from pymine.net.packets.play.block import PlayBlockChange
+from pymine.types.block_palette import DirectPalette
+from pymine.types.chunk import Chunk, ChunkSection
+from pymine.types.buffer import Buffer
+
+
+async def connected_streams():
+    """Returns a server side Stream and the client side StreamWriter, connected over loopback."""
+
+    accepted = asyncio.get_event_loop().create_future()
+
+    server = await asyncio.start_server(
+        lambda r, w: accepted.set_result(Stream(r, w)), host="127.0.0.1", port=0
+    )
+
+    _, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+
+    return server, await accepted, writer
+
+
+def frame(data: bytes) -> bytes:
+    return Buffer.pack_varint(len(data)) + data
+
+
+def test_read_frame():
+    async def run():
+        server, stream, writer = await connected_streams()
+
+        big = os.urandom(300000)  # bigger than a single read, has to wait for the rest of the body
+        writer.write(frame(b"\x00abc") + frame(big) + frame(b"\x01")[:1])
+        await writer.drain()
+
+        assert await stream.read_frame() == b"\x00abc"
+        assert await stream.read_frame() == big
+
+        writer.write(b"\x01")  # rest of the last frame
+        await writer.drain()
+
+        assert await stream.read_frame() == b"\x01"
+
+        writer.close()
+
+        with pytest.raises(asyncio.IncompleteReadError):
+            await stream.read_frame()
+
+        server.close()
+
+    asyncio.run(run())
+
+
+def test_read_frame_invalid():
+    async def run():
+        server, stream, writer = await connected_streams()
+
+        writer.write(b"\xFF\xFF\xFF\xFF")
+        await writer.drain()
+
+        with pytest.raises(InvalidPacketData):
+            await stream.read_frame()
+
+        writer.close()
+        server.close()
+
+    asyncio.run(run())
+
+
+def test_read_frame_encrypted():
+    async def run():
+        server, stream, writer = await connected_streams()
+
+        key = os.urandom(16)
+        encryptor = gen_aes_cipher(key).encryptor()
+
+        stream = EncryptedStream(stream, gen_aes_cipher(key))
+
+        writer.write(encryptor.update(frame(b"\x02hello") + frame(b"\x03world")))
+        await writer.drain()
+
+        assert await stream.read_frame() == b"\x02hello"
+        assert await stream.read_frame() == b"\x03world"
+
+        writer.close()
+        server.close()
+
+    asyncio.run(run())
+
+
+def test_encrypted_stream():
+    async def run():
+        server, stream, writer = await connected_streams()
+        reader = writer._reader  # client side reader
+
+        key = os.urandom(16)
+        encryptor = gen_aes_cipher(key).encryptor()
+        decryptor = gen_aes_cipher(key).decryptor()
+
+        writer.write(encryptor.update(frame(b"\x00abc")))  # received before encryption was enabled
+        await writer.drain()
+        await stream.fill()
+
+        stream = EncryptedStream(stream, gen_aes_cipher(key))
+
+        big = os.urandom(300000)  # bigger than READ_SIZE, decrypted in chunks
+        writer.write(encryptor.update(frame(big) + frame(b"\x01")))
+        await writer.drain()
+
+        assert await stream.read_frame() == b"\x00abc"
+        assert await stream.read_frame() == big
+        assert await stream.read_frame() == b"\x01"
+
+        stream.writelines([b"hello", b" ", b"world"])
+        stream.write(b"!")
+        assert decryptor.update(await reader.readexactly(12)) == b"hello world!"
+
+        stats = stream.cipher_stats()
+        assert stats["bytes_decrypted"] == len(frame(b"\x00abc") + frame(big) + frame(b"\x01"))
+        assert stats["bytes_encrypted"] == 12
+        assert stats["throughput"] > 0
+
+        writer.close()
+        server.close()
+
+    asyncio.run(run())
+
+
+def test_idle_timeout():
+    async def run():
+        server, stream, writer = await connected_streams()
+
+        assert 0.05 < stream.check_idle(0.1) <= 0.1
+        assert not stream.timed_out
+
+        await asyncio.sleep(0.1)
+        assert stream.check_idle(0.1) is None
+
+        with pytest.raises(asyncio.IncompleteReadError):
+            await stream.read_frame()
+
+        assert stream.timed_out
+        assert stream.check_idle(0.1) is None  # closed connections are dropped
+
+        writer.close()
+        server.close()
+
+    asyncio.run(run())
+
+
+def test_send_queue():
+    async def run():
+        server, stream, writer = await connected_streams()
+        reader = writer._reader  # client side reader
+
+        queue = SendQueue(stream, 0.05, 1024, 256, 4096)
+
+        queue.push(b"abc")
+        queue.push(b"def")
+        assert queue.queued == 6
+
+        await asyncio.sleep(0)
+        assert stream.transport.get_write_buffer_size() == 0 and queue.queued == 6
+
+        assert await reader.readexactly(6) == b"abcdef"  # written once the flush window is over
+        assert queue.queued == 0
+
+        queue.push(b"x" * 5000)  # more than max_buffered, so the client is dropped
+        assert queue.overflowed and stream.transport.is_closing()
+
+        writer.close()
+        server.close()
+
+    asyncio.run(run())
+
+
+def test_send_queue_lanes():
+    async def run():
+        server, stream, writer = await connected_streams()
+        reader = writer._reader
+
+        queue = SendQueue(stream, 0.01, 65536, 16384, 1048576, budget=8)
+
+        queue.push(b"chunk1", LANE_BULK)
+        queue.push(b"chunk2", LANE_BULK)
+        queue.push(b"chat", LANE_CHAT)
+        queue.push(b"keepalive")
+        assert queue.stats() == {"control": 9, "movement": 0, "chat": 4, "bulk": 12}
+
+        # control is always written, the rest in lane order until the budget is used up
+        queue.flush()
+        assert queue.stats()["bulk"] == 12
+        queue.flush()
+        assert queue.stats()["bulk"] == 6
+
+        assert await reader.readexactly(25) == b"keepalivechatchunk1chunk2"
+        assert queue.queued == 0
+
+        queue.budget = 0
+        queue.limiter = EgressLimiter(100, 10)
+
+        queue.push(b"x" * 20, LANE_BULK)
+        queue.push(b"y" * 20, LANE_BULK)
+        queue.flush()
+        # has to wait for the bucket to refill
+        assert queue.limiter.tokens < 0 and queue.queued == 20
+
+        assert await reader.readexactly(20) == b"x" * 20
+
+        assert await reader.readexactly(20) == b"y" * 20
+
+        writer.close()
+        server.close()
+
+    asyncio.run(run())
+
+
+def test_send_queue_chunk_order():
+    async def run():
+        server, stream, writer = await connected_streams()
+        reader = writer._reader
+
+        queue = SendQueue(stream, 0.01, 65536, 16384, 1048576, budget=1)
+
+        chunk = Chunk.new(0, 0, 0)
+        chunk[0] = ChunkSection.new(0, DirectPalette)
+
+        packets = (
+            PlayChunkData(chunk, True),
+            PlayBlockChange(1, 2, 3, 1),  # dropped by the client if it came before the chunk
+            PlayKeepAliveClientBound(123),
+        )
+        frames = [Buffer.pack_packet(packet) for packet in packets]
+
+        for packet, packed in zip(packets, frames):
+            queue.push(packed, packet.lane)
+
+        # the budget only allows for one frame per flush, control frames still go first
+        for _ in packets:
+            queue.flush()
+
+        assert queue.queued == 0
+        assert await reader.readexactly(sum(map(len, frames))) == frames[2] + frames[0] + frames[1]
+
+        writer.close()
+        server.close()
+
+    asyncio.run(run())
+
+
+def test_send_queue_reserve():
+    async def run():
+        server, stream, writer = await connected_streams()
+        reader = writer._reader
+
+        queue = SendQueue(stream, 0.01, 65536, 16384, 1048576)
+
+        pending = queue.reserve(LANE_BULK)
+        queue.push(b"block", LANE_BULK)
+        queue.push(b"chat", LANE_CHAT)
+
+        # the block change waits for the reserved frame, the other lanes don't
+        queue.flush()
+        assert queue.stats() == {"control": 0, "movement": 0, "chat": 0, "bulk": 5}
+        assert await reader.readexactly(4) == b"chat"
+
+        queue.fill(pending, b"chunk")
+        assert queue.stats()["bulk"] == 10
+
+        assert await reader.readexactly(10) == b"chunkblock"
+        assert queue.queued == 0
+
+        dropped = queue.reserve(LANE_BULK)
+        queue.clear()
+        queue.fill(dropped, b"chunk")
+        assert dropped.dropped and queue.queued == 0
+
+        writer.close()
+        server.close()
+
+    asyncio.run(run())
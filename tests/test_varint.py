@@ -0,0 +1,88 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+import pymine.util.varint as varint
+
+
+def reference(num: int, width: int) -> bytes:  # the straightforward encoding, for comparison
+    if num < 0:
+        num += 1 << width
+
+    out = bytearray()
+
+    while True:
+        b = num & 0x7F
+        num >>= 7
+
+        out.append(b | (0x80 if num > 0 else 0))
+
+        if num == 0:
+            return bytes(out)
+
+
+VALUES = (0, 1, 127, 128, 255, 300, 16383, 16384, 2097151, 2097152, (1 << 31) - 1, -1, -(1 << 31))
+
+
+@pytest.mark.parametrize("num", VALUES)
+def test_varint(num):
+    data = varint.pack_varint(num)
+
+    assert data == reference(num, 32)
+    assert varint.unpack_varint(memoryview(b"\x00" + data + b"\x00"), 1) == (num, len(data) + 1)
+
+
+@pytest.mark.parametrize("num", VALUES + ((1 << 63) - 1, -(1 << 63), 1 << 40, -(1 << 40)))
+def test_varlong(num):
+    data = varint.pack_varlong(num)
+
+    assert data == reference(num, 64)
+    assert varint.unpack_varlong(data) == (num, len(data))
+
+
+def test_pack_varints():
+    assert varint.pack_varints([]) == b""
+
+    for nums in ([1, 2, 127, 128, 16383], [1, -1, 16384, 300]):
+        data = varint.pack_varints(nums)
+        assert data == b"".join([reference(num, 32) for num in nums])
+
+        pos = 0
+
+        for num in nums:
+            unpacked, pos = varint.unpack_varint(data, pos)
+            assert unpacked == num
+
+    buf = bytearray(b"\x01")
+    varint.write_varint(buf, 300)
+    varint.write_varint(buf, -1)
+
+    assert buf == b"\x01" + reference(300, 32) + reference(-1, 32)
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        varint.pack_varint(1 << 31)
+
+    with pytest.raises(ValueError):
+        varint.pack_varint(1 << 15, max_bits=16)
+
+    with pytest.raises(ValueError):  # in the table of small varints, but not in 8 bits
+        varint.pack_varint(300, max_bits=8)
+
+    with pytest.raises(ValueError):
+        varint.pack_varints([1, 300], max_bits=8)
+
+    with pytest.raises(ValueError):
+        varint.write_varint(bytearray(), 300, max_bits=8)
+
+    with pytest.raises(ValueError):  # longer than 5 bytes
+        varint.unpack_varint(b"\xff\xff\xff\xff\xff\x01")
+
+    with pytest.raises(ValueError):  # doesn't fit in 16 bits
+        varint.unpack_varint(reference(1 << 15, 32), max_bits=16)
+
+    with pytest.raises(IndexError):  # data ends in the middle of the varint
+        varint.unpack_varint(b"\xff\xff")